@@ -0,0 +1,35 @@
+"""geofence circle columns
+
+Revision ID: 06b0d28de061
+Revises: f5afc17cd950
+Create Date: 2026-10-15 08:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '06b0d28de061'
+down_revision = 'f5afc17cd950'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE geofences
+            ADD COLUMN is_circle boolean NOT NULL GENERATED ALWAYS AS (shape = 'circle') STORED,
+            ADD COLUMN cos_center_latitude double precision NOT NULL
+                GENERATED ALWAYS AS (cos(radians(center_latitude))) STORED
+    """)
+    op.drop_index('idx_geofence_center_geog', table_name='geofences')
+    op.create_index(
+        'idx_geofence_center_geog', 'geofences', ['center_geog'],
+        postgresql_using='gist', postgresql_where=sa.text("is_circle")
+    )
+
+def downgrade() -> None:
+    op.drop_index('idx_geofence_center_geog', table_name='geofences')
+    op.create_index('idx_geofence_center_geog', 'geofences', ['center_geog'], postgresql_using='gist')
+    op.drop_column('geofences', 'cos_center_latitude')
+    op.drop_column('geofences', 'is_circle')
@@ -0,0 +1,60 @@
+"""split media file meta
+
+Revision ID: 0a9e2c7b4d16
+Revises: f17c3b5d8e62
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0a9e2c7b4d16'
+down_revision = 'f17c3b5d8e62'
+branch_labels = None
+depends_on = None
+
+# (column, type) moved from media_files to media_file_meta
+META_COLUMNS = [
+    ('processing_error', sa.Text()),
+    ('encryption_key_id', sa.String(255)),
+    ('virus_scan_status', postgresql.ENUM(name='virusscanstatus', create_type=False)),
+    ('virus_scan_result', postgresql.JSONB()),
+    ('backup_path', sa.String(500)),
+    ('backup_timestamp', sa.DateTime(timezone=True)),
+    ('moderation_status', postgresql.ENUM(name='moderationstatus', create_type=False)),
+    ('moderation_score', sa.Float()),
+    ('moderation_labels', postgresql.JSONB()),
+]
+
+def _column_list():
+    return ", ".join(name for name, _ in META_COLUMNS)
+
+def upgrade() -> None:
+    op.create_table(
+        'media_file_meta',
+        sa.Column('media_file_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('media_files.id', ondelete='CASCADE'), primary_key=True),
+        *[sa.Column(name, type_) for name, type_ in META_COLUMNS]
+    )
+    columns = _column_list()
+    op.execute(f"INSERT INTO media_file_meta (media_file_id, {columns}) SELECT id, {columns} FROM media_files")
+
+    op.drop_index('idx_media_backup', table_name='media_files')
+    op.drop_index('idx_media_moderation_labels_gin', table_name='media_files')
+    for name, _ in META_COLUMNS:
+        op.drop_column('media_files', name)
+
+    op.create_index('idx_media_meta_backup', 'media_file_meta', ['backup_timestamp'])
+    op.create_index('idx_media_meta_moderation_labels_gin', 'media_file_meta', ['moderation_labels'], postgresql_using='gin')
+
+def downgrade() -> None:
+    for name, type_ in META_COLUMNS:
+        op.add_column('media_files', sa.Column(name, type_))
+    assignments = ", ".join(f"{name} = m.{name}" for name, _ in META_COLUMNS)
+    op.execute(f"UPDATE media_files f SET {assignments} FROM media_file_meta m WHERE m.media_file_id = f.id")
+    op.drop_table('media_file_meta')
+
+    op.create_index('idx_media_backup', 'media_files', ['backup_timestamp'], postgresql_where=sa.text('flags & 4 <> 0'))
+    op.create_index('idx_media_moderation_labels_gin', 'media_files', ['moderation_labels'], postgresql_using='gin')
@@ -0,0 +1,61 @@
+"""geofence analytics natural key
+
+Revision ID: 17c1e39ef172
+Revises: 06b0d28de061
+Create Date: 2026-10-15 08:16:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '17c1e39ef172'
+down_revision = '06b0d28de061'
+branch_labels = None
+depends_on = None
+
+# ANALYTICS_ALL_SCOPE: stands in for NULL scope columns so they can join the key
+ALL_SCOPE = '00000000-0000-0000-0000-000000000000'
+
+def upgrade() -> None:
+    for column in ('user_id', 'geofence_id'):
+        op.execute(f"UPDATE geofence_analytics SET {column} = '{ALL_SCOPE}' WHERE {column} IS NULL")
+        op.alter_column('geofence_analytics', column, nullable=False)
+
+    # Keep the most recently updated row of any natural-key duplicates
+    op.execute("""
+        DELETE FROM geofence_analytics a
+        USING geofence_analytics b
+        WHERE a.analytics_type = b.analytics_type
+          AND a.analytics_date = b.analytics_date
+          AND a.user_id = b.user_id
+          AND a.geofence_id = b.geofence_id
+          AND (a.updated_at, a.id) < (b.updated_at, b.id)
+    """)
+
+    op.drop_constraint('geofence_analytics_pkey', 'geofence_analytics', type_='primary')
+    op.drop_column('geofence_analytics', 'id')
+    op.create_primary_key(
+        'pk_geofence_analytics', 'geofence_analytics',
+        ['analytics_type', 'analytics_date', 'user_id', 'geofence_id']
+    )
+    op.drop_index('idx_analytics_date_type', table_name='geofence_analytics')
+    op.drop_index('idx_analytics_user_date', table_name='geofence_analytics')
+    op.drop_index('idx_analytics_geofence_date', table_name='geofence_analytics')
+
+def downgrade() -> None:
+    op.create_index('idx_analytics_geofence_date', 'geofence_analytics', ['geofence_id', 'analytics_date'])
+    op.create_index('idx_analytics_user_date', 'geofence_analytics', ['user_id', 'analytics_date'])
+    op.create_index('idx_analytics_date_type', 'geofence_analytics', ['analytics_date', 'analytics_type'])
+    op.drop_constraint('pk_geofence_analytics', 'geofence_analytics', type_='primary')
+    op.add_column(
+        'geofence_analytics',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False)
+    )
+    op.create_primary_key('geofence_analytics_pkey', 'geofence_analytics', ['id'])
+
+    for column in ('user_id', 'geofence_id'):
+        op.alter_column('geofence_analytics', column, nullable=True)
+        op.execute(f"UPDATE geofence_analytics SET {column} = NULL WHERE {column} = '{ALL_SCOPE}'")
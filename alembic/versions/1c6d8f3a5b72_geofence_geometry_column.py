@@ -0,0 +1,68 @@
+"""geofence geometry column
+
+Revision ID: 1c6d8f3a5b72
+Revises:
+Create Date: 2026-10-15 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c6d8f3a5b72'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    op.execute("ALTER TABLE geofences ADD COLUMN geom geometry(GEOMETRY,4326)")
+
+    # Circles: buffer the center on the geography type so the radius is in meters
+    op.execute("""
+        UPDATE geofences
+        SET geom = ST_Buffer(ST_SetSRID(ST_MakePoint(center_longitude, center_latitude), 4326)::geography, radius)::geometry
+        WHERE shape = 'CIRCLE'
+    """)
+
+    # Polygons and rectangles: (lat, lng) vertex list as a GeoJSON ring, closed if needed
+    op.execute("""
+        UPDATE geofences g
+        SET geom = ST_SetSRID(ST_GeomFromGeoJSON(json_build_object(
+            'type', 'Polygon',
+            'coordinates', json_build_array(ring.vertices)
+        )::text), 4326)
+        FROM (
+            SELECT
+                v.id,
+                CASE WHEN v.first_vertex::text = v.last_vertex::text
+                    THEN v.vertices
+                    ELSE (v.vertices::jsonb || jsonb_build_array(v.first_vertex::jsonb))::json
+                END AS vertices
+            FROM (
+                SELECT
+                    id,
+                    json_agg(json_build_array(vertex->1, vertex->0) ORDER BY n) AS vertices,
+                    (array_agg(json_build_array(vertex->1, vertex->0) ORDER BY n))[1] AS first_vertex,
+                    (array_agg(json_build_array(vertex->1, vertex->0) ORDER BY n DESC))[1] AS last_vertex
+                FROM geofences, json_array_elements(coordinates::json) WITH ORDINALITY AS c(vertex, n)
+                WHERE shape <> 'CIRCLE'
+                GROUP BY id
+            ) v
+        ) ring
+        WHERE g.id = ring.id
+    """)
+
+    op.alter_column('geofences', 'geom', nullable=False)
+
+    # Spatial lookups go through geom now, not the center coordinates
+    op.drop_index('idx_geofence_center', table_name='geofences')
+    op.drop_index('ix_geofences_center_latitude', table_name='geofences')
+    op.drop_index('ix_geofences_center_longitude', table_name='geofences')
+
+def downgrade() -> None:
+    op.create_index('ix_geofences_center_longitude', 'geofences', ['center_longitude'])
+    op.create_index('ix_geofences_center_latitude', 'geofences', ['center_latitude'])
+    op.create_index('idx_geofence_center', 'geofences', ['center_latitude', 'center_longitude'])
+    op.drop_column('geofences', 'geom')
@@ -0,0 +1,53 @@
+"""narrow geofencing columns
+
+Revision ID: 28d2f4a0f283
+Revises: 17c1e39ef172
+Create Date: 2026-10-15 08:17:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '28d2f4a0f283'
+down_revision = '17c1e39ef172'
+branch_labels = None
+depends_on = None
+
+SMALLINT_COLUMNS = [
+    ('geofences', 'dwell_time_minutes'),
+    ('geofence_events', 'battery_level'),
+    ('geofence_notifications', 'delivery_attempts'),
+    ('geofence_analytics', 'most_active_hour'),
+    ('geofence_analytics', 'most_active_day'),
+    ('geofence_import_jobs', 'progress_percentage'),
+]
+
+NETWORK_TYPES = ['wifi', 'cellular', 'offline']
+
+def upgrade() -> None:
+    for table, column in SMALLINT_COLUMNS:
+        op.alter_column(table, column, type_=sa.SmallInteger(), existing_type=sa.Integer())
+
+    postgresql.ENUM(*NETWORK_TYPES, name='network_type').create(op.get_bind(), checkfirst=True)
+    labels = ", ".join(f"'{label}'" for label in NETWORK_TYPES)
+    op.execute(f"""
+        ALTER TABLE geofence_events ALTER COLUMN network_type TYPE network_type
+        USING CASE WHEN lower(network_type) IN ({labels}) THEN lower(network_type)::network_type END
+    """)
+
+    op.alter_column('geofence_templates', 'color', type_=sa.CHAR(7), existing_type=sa.String(7))
+
+def downgrade() -> None:
+    op.alter_column('geofence_templates', 'color', type_=sa.String(7), existing_type=sa.CHAR(7))
+
+    op.execute(
+        "ALTER TABLE geofence_events ALTER COLUMN network_type TYPE varchar(20) "
+        "USING network_type::text"
+    )
+    postgresql.ENUM(name='network_type').drop(op.get_bind(), checkfirst=True)
+
+    for table, column in SMALLINT_COLUMNS:
+        op.alter_column(table, column, type_=sa.Integer(), existing_type=sa.SmallInteger())
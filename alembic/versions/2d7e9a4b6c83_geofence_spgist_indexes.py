@@ -0,0 +1,33 @@
+"""geofence spgist indexes
+
+Revision ID: 2d7e9a4b6c83
+Revises: 1c6d8f3a5b72
+Create Date: 2026-10-15 08:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7e9a4b6c83'
+down_revision = '1c6d8f3a5b72'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index('idx_geofence_geom_spgist', 'geofences', ['geom'], postgresql_using='spgist')
+
+    op.execute("""
+        ALTER TABLE geofence_events ADD COLUMN geom geometry(POINT,4326)
+            GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)) STORED
+    """)
+    op.drop_index('idx_event_location', table_name='geofence_events')
+    op.create_index('idx_event_geom_spgist', 'geofence_events', ['geom'], postgresql_using='spgist')
+
+def downgrade() -> None:
+    op.drop_index('idx_event_geom_spgist', table_name='geofence_events')
+    op.create_index('idx_event_location', 'geofence_events', ['latitude', 'longitude'])
+    op.drop_column('geofence_events', 'geom')
+
+    op.drop_index('idx_geofence_geom_spgist', table_name='geofences')
@@ -0,0 +1,53 @@
+"""media json columns to jsonb
+
+Revision ID: 2f8d6b0e41a3
+Revises: e5a1d3f7c924
+Create Date: 2026-10-15 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '2f8d6b0e41a3'
+down_revision = 'e5a1d3f7c924'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = [
+    ('media_files', 'tags'),
+    ('media_files', 'virus_scan_result'),
+    ('media_files', 'moderation_labels'),
+    ('media_processing_jobs', 'job_parameters'),
+    ('media_processing_jobs', 'output_files'),
+    ('media_processing_jobs', 'error_details'),
+    ('media_collections', 'tags'),
+]
+
+GIN_INDEXES = [
+    ('idx_media_tags_gin', 'media_files', 'tags'),
+    ('idx_media_moderation_labels_gin', 'media_files', 'moderation_labels'),
+    ('idx_collection_tags_gin', 'media_collections', 'tags'),
+]
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(), existing_type=sa.JSON(),
+            postgresql_using=f"{column}::jsonb"
+        )
+    for name, table, column in GIN_INDEXES:
+        op.create_index(name, table, [column], postgresql_using='gin')
+
+def downgrade() -> None:
+    for name, table, column in GIN_INDEXES:
+        op.drop_index(name, table_name=table)
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(), existing_type=postgresql.JSONB(),
+            postgresql_using=f"{column}::json"
+        )
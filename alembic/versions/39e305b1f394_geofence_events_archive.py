@@ -0,0 +1,62 @@
+"""geofence events archive
+
+Revision ID: 39e305b1f394
+Revises: 28d2f4a0f283
+Create Date: 2026-10-15 08:18:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '39e305b1f394'
+down_revision = '28d2f4a0f283'
+branch_labels = None
+depends_on = None
+
+STATS_COLUMNS = """
+    geofence_id,
+    count(*) FILTER (WHERE event_type = 'enter') AS total_entries,
+    count(*) FILTER (WHERE event_type = 'exit') AS total_exits,
+    count(*) FILTER (WHERE event_type = 'dwell') AS total_dwells,
+    max(event_timestamp) AS last_triggered
+"""
+
+def _create_stats_view(source: str) -> None:
+    op.execute(f"CREATE MATERIALIZED VIEW geofence_stats AS SELECT {STATS_COLUMNS} FROM {source} GROUP BY geofence_id")
+    op.execute("CREATE UNIQUE INDEX idx_geofence_stats_geofence ON geofence_stats (geofence_id)")
+
+def upgrade() -> None:
+    # Plain LIKE: geom becomes an ordinary column so archived rows move with SELECT *
+    op.execute("""
+        CREATE TABLE geofence_events_archive (LIKE geofence_events)
+            WITH (fillfactor = 100, toast_tuple_target = 128)
+    """)
+    op.create_index(
+        'idx_event_archive_ts_brin', 'geofence_events_archive', ['event_timestamp'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+    )
+    op.create_index('idx_event_archive_user_timestamp', 'geofence_events_archive', ['user_id', 'event_timestamp'])
+
+    # Lifetime counters have to include archived events
+    op.execute("DROP MATERIALIZED VIEW geofence_stats")
+    _create_stats_view("""(
+        SELECT geofence_id, event_type, event_timestamp FROM geofence_events
+        UNION ALL
+        SELECT geofence_id, event_type, event_timestamp FROM geofence_events_archive
+    ) AS all_events""")
+
+def downgrade() -> None:
+    # Move archived rows back so no events are lost with the table
+    columns = ", ".join(
+        row[0] for row in op.get_bind().execute(sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = 'geofence_events' AND is_generated = 'NEVER' ORDER BY ordinal_position"
+        ))
+    )
+    op.execute(f"INSERT INTO geofence_events ({columns}) SELECT {columns} FROM geofence_events_archive")
+
+    op.execute("DROP MATERIALIZED VIEW geofence_stats")
+    _create_stats_view("geofence_events")
+    op.drop_table('geofence_events_archive')
@@ -0,0 +1,47 @@
+"""touch updated_at triggers
+
+Revision ID: 4af416c2f4a5
+Revises: 39e305b1f394
+Create Date: 2026-10-15 08:19:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4af416c2f4a5'
+down_revision = '39e305b1f394'
+branch_labels = None
+depends_on = None
+
+# Ordinary and partitioned tables in the current schema that have updated_at
+UPDATED_AT_TABLES = """
+    SELECT c.relname
+    FROM pg_class c
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = 'updated_at' AND NOT a.attisdropped
+    WHERE c.relnamespace = current_schema()::regnamespace
+      AND c.relkind IN ('r', 'p')
+      AND NOT c.relispartition
+"""
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for (table,) in op.get_bind().execute(sa.text(UPDATED_AT_TABLES)):
+        op.execute(
+            f'CREATE OR REPLACE TRIGGER {table}_touch_updated_at '
+            f'BEFORE UPDATE ON "{table}" '
+            f'FOR EACH ROW EXECUTE FUNCTION touch_updated_at()'
+        )
+
+def downgrade() -> None:
+    for (table,) in op.get_bind().execute(sa.text(UPDATED_AT_TABLES)):
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_touch_updated_at ON "{table}"')
+    op.execute("DROP FUNCTION IF EXISTS touch_updated_at()")
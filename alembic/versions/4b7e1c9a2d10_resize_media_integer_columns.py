@@ -0,0 +1,51 @@
+"""resize media integer columns
+
+Revision ID: 4b7e1c9a2d10
+Revises: b1c6e3d9f2a4
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e1c9a2d10'
+down_revision = 'b1c6e3d9f2a4'
+branch_labels = None
+depends_on = None
+
+# Byte counters that overflow a 32-bit integer past 2 GiB
+BIGINT_COLUMNS = [
+    ('media_files', 'file_size'),
+    ('media_access_logs', 'bytes_transferred'),
+    ('media_collections', 'total_size_bytes'),
+    ('media_analytics', 'total_upload_size_bytes'),
+    ('media_analytics', 'total_storage_used_bytes'),
+    ('media_analytics', 'total_bandwidth_used_bytes'),
+    ('media_quotas', 'storage_quota_bytes'),
+    ('media_quotas', 'bandwidth_quota_bytes'),
+    ('media_quotas', 'storage_used_bytes'),
+    ('media_quotas', 'bandwidth_used_bytes'),
+]
+
+# Columns whose domain fits comfortably in two bytes
+SMALLINT_COLUMNS = [
+    ('media_files', 'processing_progress'),
+    ('media_processing_jobs', 'progress_percentage'),
+    ('media_processing_jobs', 'priority'),
+    ('media_processing_jobs', 'retry_count'),
+    ('media_processing_jobs', 'max_retries'),
+]
+
+def upgrade() -> None:
+    for table, column in BIGINT_COLUMNS:
+        op.alter_column(table, column, type_=sa.BigInteger(), existing_type=sa.Integer())
+    for table, column in SMALLINT_COLUMNS:
+        op.alter_column(table, column, type_=sa.SmallInteger(), existing_type=sa.Integer())
+
+def downgrade() -> None:
+    for table, column in SMALLINT_COLUMNS:
+        op.alter_column(table, column, type_=sa.Integer(), existing_type=sa.SmallInteger())
+    for table, column in BIGINT_COLUMNS:
+        op.alter_column(table, column, type_=sa.Integer(), existing_type=sa.BigInteger())
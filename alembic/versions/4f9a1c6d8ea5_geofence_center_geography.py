@@ -0,0 +1,27 @@
+"""geofence center geography
+
+Revision ID: 4f9a1c6d8ea5
+Revises: 3e8f0b5c7d94
+Create Date: 2026-10-15 08:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f9a1c6d8ea5'
+down_revision = '3e8f0b5c7d94'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE geofences ADD COLUMN center_geog geography(POINT,4326) NOT NULL
+            GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(center_longitude, center_latitude), 4326)::geography) STORED
+    """)
+    op.create_index('idx_geofence_center_geog', 'geofences', ['center_geog'], postgresql_using='gist')
+
+def downgrade() -> None:
+    op.drop_index('idx_geofence_center_geog', table_name='geofences')
+    op.drop_column('geofences', 'center_geog')
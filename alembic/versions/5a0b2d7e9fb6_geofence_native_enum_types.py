@@ -0,0 +1,61 @@
+"""geofence native enum types
+
+Revision ID: 5a0b2d7e9fb6
+Revises: 4f9a1c6d8ea5
+Create Date: 2026-10-15 08:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5a0b2d7e9fb6'
+down_revision = '4f9a1c6d8ea5'
+branch_labels = None
+depends_on = None
+
+# New enum type -> (type it replaces, labels). The old types carry the member
+# names ('SAFE_ZONE'); the new ones carry the values ('safe_zone').
+ENUMS = {
+    'geofence_type': ('geofencetype', ['safe_zone', 'restricted_zone', 'work_zone', 'home_zone', 'school_zone', 'emergency_zone', 'custom']),
+    'geofence_status': ('geofencestatus', ['active', 'inactive', 'paused', 'expired']),
+    'geofence_shape': ('geofenceshape', ['circle', 'polygon', 'rectangle']),
+    'geofence_event_type': ('geofenceeventtype', ['enter', 'exit', 'dwell', 'breach']),
+}
+
+# (table, column, new enum type)
+COLUMNS = [
+    ('geofences', 'geofence_type', 'geofence_type'),
+    ('geofences', 'status', 'geofence_status'),
+    ('geofences', 'shape', 'geofence_shape'),
+    ('geofence_events', 'event_type', 'geofence_event_type'),
+    ('geofence_templates', 'geofence_type', 'geofence_type'),
+    ('geofence_templates', 'default_shape', 'geofence_shape'),
+]
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for name, (_, labels) in ENUMS.items():
+        postgresql.ENUM(*labels, name=name).create(bind, checkfirst=True)
+    for table, column, enum_name in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} "
+            f"USING lower({column}::text)::{enum_name}"
+        )
+    for old_name, _ in ENUMS.values():
+        postgresql.ENUM(name=old_name).drop(bind, checkfirst=True)
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for old_name, labels in ENUMS.values():
+        postgresql.ENUM(*[label.upper() for label in labels], name=old_name).create(bind, checkfirst=True)
+    for table, column, enum_name in COLUMNS:
+        old_name = ENUMS[enum_name][0]
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {old_name} "
+            f"USING upper({column}::text)::{old_name}"
+        )
+    for name in ENUMS:
+        postgresql.ENUM(name=name).drop(bind, checkfirst=True)
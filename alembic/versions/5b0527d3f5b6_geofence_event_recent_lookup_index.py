@@ -0,0 +1,26 @@
+"""geofence event recent lookup index
+
+Revision ID: 5b0527d3f5b6
+Revises: 4af416c2f4a5
+Create Date: 2026-10-15 08:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b0527d3f5b6'
+down_revision = '4af416c2f4a5'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_event_user_geofence_created', 'geofence_events',
+        ['user_id', 'geofence_id', sa.text('created_at DESC')],
+        postgresql_include=['event_type']
+    )
+
+def downgrade() -> None:
+    op.drop_index('idx_event_user_geofence_created', table_name='geofence_events')
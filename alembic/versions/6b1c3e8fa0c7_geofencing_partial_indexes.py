@@ -0,0 +1,54 @@
+"""geofencing partial indexes
+
+Revision ID: 6b1c3e8fa0c7
+Revises: 5a0b2d7e9fb6
+Create Date: 2026-10-15 08:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b1c3e8fa0c7'
+down_revision = '5a0b2d7e9fb6'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.drop_index('idx_geofence_user_status', table_name='geofences')
+    op.drop_index('idx_geofence_monitoring', table_name='geofences')
+    op.create_index(
+        'idx_geofence_active', 'geofences', ['user_id'],
+        postgresql_where=sa.text("status = 'active' AND monitoring_enabled")
+    )
+
+    op.drop_index('idx_event_processed', table_name='geofence_events')
+    op.create_index(
+        'idx_event_unprocessed', 'geofence_events', ['created_at'],
+        postgresql_where=sa.text("processed = false")
+    )
+
+    op.drop_index('idx_notification_status', table_name='geofence_notifications')
+    op.create_index(
+        'idx_notification_pending', 'geofence_notifications', ['created_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+    op.create_index(
+        'idx_share_pending', 'geofence_shares', ['shared_with_user_id'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+def downgrade() -> None:
+    op.drop_index('idx_share_pending', table_name='geofence_shares')
+
+    op.drop_index('idx_notification_pending', table_name='geofence_notifications')
+    op.create_index('idx_notification_status', 'geofence_notifications', ['status', 'created_at'])
+
+    op.drop_index('idx_event_unprocessed', table_name='geofence_events')
+    op.create_index('idx_event_processed', 'geofence_events', ['processed', 'created_at'])
+
+    op.drop_index('idx_geofence_active', table_name='geofences')
+    op.create_index('idx_geofence_monitoring', 'geofences', ['monitoring_enabled', 'status'])
+    op.create_index('idx_geofence_user_status', 'geofences', ['user_id', 'status'])
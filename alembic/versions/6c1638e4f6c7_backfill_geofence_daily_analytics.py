@@ -0,0 +1,56 @@
+"""backfill geofence daily analytics
+
+Revision ID: 6c1638e4f6c7
+Revises: 5b0527d3f5b6
+Create Date: 2026-10-15 08:21:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1638e4f6c7'
+down_revision = '5b0527d3f5b6'
+branch_labels = None
+depends_on = None
+
+# ANALYTICS_ALL_SCOPE: the per-user rollup rows carry no geofence
+ALL_SCOPE = '00000000-0000-0000-0000-000000000000'
+
+def upgrade() -> None:
+    # Rebuild the per-user daily rows read by the analytics summary from every
+    # recorded event. The counts are recomputed from scratch, so rows already
+    # written by update_location are overwritten rather than added to.
+    op.execute(f"""
+        INSERT INTO geofence_analytics (
+            analytics_type, analytics_date, user_id, geofence_id,
+            total_events, enter_events, exit_events, dwell_events, breach_events
+        )
+        SELECT
+            'daily',
+            date_trunc('day', event_timestamp AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+            user_id,
+            '{ALL_SCOPE}',
+            count(*),
+            count(*) FILTER (WHERE event_type = 'enter'),
+            count(*) FILTER (WHERE event_type = 'exit'),
+            count(*) FILTER (WHERE event_type = 'dwell'),
+            count(*) FILTER (WHERE event_type = 'breach')
+        FROM (
+            SELECT user_id, event_type, event_timestamp FROM geofence_events
+            UNION ALL
+            SELECT user_id, event_type, event_timestamp FROM geofence_events_archive
+        ) events
+        GROUP BY 2, 3
+        ON CONFLICT ON CONSTRAINT pk_geofence_analytics DO UPDATE SET
+            total_events = EXCLUDED.total_events,
+            enter_events = EXCLUDED.enter_events,
+            exit_events = EXCLUDED.exit_events,
+            dwell_events = EXCLUDED.dwell_events,
+            breach_events = EXCLUDED.breach_events
+    """)
+
+def downgrade() -> None:
+    # The rows are derived data; update_location keeps writing them either way
+    pass
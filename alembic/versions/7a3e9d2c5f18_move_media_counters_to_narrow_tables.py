@@ -0,0 +1,84 @@
+"""move media counters to narrow tables
+
+Revision ID: 7a3e9d2c5f18
+Revises: 2f8d6b0e41a3
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3e9d2c5f18'
+down_revision = '2f8d6b0e41a3'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'media_file_counters',
+        sa.Column('media_file_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('media_files.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('view_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('download_count', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.create_table(
+        'media_share_counters',
+        sa.Column('share_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('media_shares.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('view_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('download_count', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.create_table(
+        'media_collection_stats',
+        sa.Column('collection_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('media_collections.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('media_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_size_bytes', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+
+    op.execute("""
+        INSERT INTO media_file_counters (media_file_id, view_count, download_count)
+        SELECT id, view_count, download_count FROM media_files
+        WHERE view_count <> 0 OR download_count <> 0
+    """)
+    op.execute("""
+        INSERT INTO media_share_counters (share_id, view_count, download_count)
+        SELECT id, view_count, download_count FROM media_shares
+        WHERE view_count <> 0 OR download_count <> 0
+    """)
+    op.execute("""
+        INSERT INTO media_collection_stats (collection_id, media_count, total_size_bytes)
+        SELECT id, media_count, total_size_bytes FROM media_collections
+    """)
+
+    op.drop_column('media_files', 'view_count')
+    op.drop_column('media_files', 'download_count')
+    op.drop_column('media_shares', 'view_count')
+    op.drop_column('media_shares', 'download_count')
+    op.drop_column('media_collections', 'media_count')
+    op.drop_column('media_collections', 'total_size_bytes')
+
+def downgrade() -> None:
+    op.add_column('media_collections', sa.Column('total_size_bytes', sa.BigInteger(), nullable=False, server_default='0'))
+    op.add_column('media_collections', sa.Column('media_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('media_shares', sa.Column('download_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('media_shares', sa.Column('view_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('media_files', sa.Column('download_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('media_files', sa.Column('view_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute("""
+        UPDATE media_files f SET view_count = c.view_count, download_count = c.download_count
+        FROM media_file_counters c WHERE c.media_file_id = f.id
+    """)
+    op.execute("""
+        UPDATE media_shares s SET view_count = c.view_count, download_count = c.download_count
+        FROM media_share_counters c WHERE c.share_id = s.id
+    """)
+    op.execute("""
+        UPDATE media_collections m SET media_count = c.media_count, total_size_bytes = c.total_size_bytes
+        FROM media_collection_stats c WHERE c.collection_id = m.id
+    """)
+
+    op.drop_table('media_collection_stats')
+    op.drop_table('media_share_counters')
+    op.drop_table('media_file_counters')
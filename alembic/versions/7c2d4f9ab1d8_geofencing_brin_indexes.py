@@ -0,0 +1,36 @@
+"""geofencing brin indexes
+
+Revision ID: 7c2d4f9ab1d8
+Revises: 6b1c3e8fa0c7
+Create Date: 2026-10-15 08:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2d4f9ab1d8'
+down_revision = '6b1c3e8fa0c7'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.drop_index('ix_geofence_events_event_timestamp', table_name='geofence_events')
+    op.drop_index('idx_event_timestamp', table_name='geofence_events')
+    op.create_index(
+        'idx_event_ts_brin', 'geofence_events', ['event_timestamp'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+    )
+    op.drop_index('ix_geofence_analytics_analytics_date', table_name='geofence_analytics')
+    op.create_index(
+        'idx_analytics_date_brin', 'geofence_analytics', ['analytics_date'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+    )
+
+def downgrade() -> None:
+    op.drop_index('idx_analytics_date_brin', table_name='geofence_analytics')
+    op.create_index('ix_geofence_analytics_analytics_date', 'geofence_analytics', ['analytics_date'])
+    op.drop_index('idx_event_ts_brin', table_name='geofence_events')
+    op.create_index('idx_event_timestamp', 'geofence_events', ['event_timestamp'])
+    op.create_index('ix_geofence_events_event_timestamp', 'geofence_events', ['event_timestamp'])
@@ -0,0 +1,27 @@
+"""geofencing metadata not null
+
+Revision ID: 7d2749f5f7d8
+Revises: 6c1638e4f6c7
+Create Date: 2026-10-15 08:22:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2749f5f7d8'
+down_revision = '6c1638e4f6c7'
+branch_labels = None
+depends_on = None
+
+TABLES = ['geofences', 'geofence_events']
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET metadata = '{{}}'::jsonb WHERE metadata IS NULL")
+        op.alter_column(table, 'metadata', nullable=False)
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'metadata', nullable=True)
@@ -0,0 +1,124 @@
+"""partition geofence events by month
+
+Revision ID: 8d3e5a0bc2e9
+Revises: 7c2d4f9ab1d8
+Create Date: 2026-10-15 08:07:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3e5a0bc2e9'
+down_revision = '7c2d4f9ab1d8'
+branch_labels = None
+depends_on = None
+
+TABLE = 'geofence_events'
+LEGACY = f'{TABLE}_legacy'
+
+INDEXES = [
+    "CREATE INDEX ix_geofence_events_id ON geofence_events (id)",
+    "CREATE INDEX ix_geofence_events_geofence_id ON geofence_events (geofence_id)",
+    "CREATE INDEX ix_geofence_events_user_id ON geofence_events (user_id)",
+    "CREATE INDEX ix_geofence_events_event_type ON geofence_events (event_type)",
+    "CREATE INDEX ix_geofence_events_processed ON geofence_events (processed)",
+    "CREATE INDEX idx_event_geofence_type ON geofence_events (geofence_id, event_type)",
+    "CREATE INDEX idx_event_user_timestamp ON geofence_events (user_id, event_timestamp)",
+    "CREATE INDEX idx_event_ts_brin ON geofence_events USING brin (event_timestamp) WITH (pages_per_range = 32)",
+    "CREATE INDEX idx_event_unprocessed ON geofence_events (created_at) WHERE processed = false",
+    "CREATE INDEX idx_event_geom_spgist ON geofence_events USING spgist (geom)",
+]
+
+PARTITION_FUNCTION = """
+    CREATE OR REPLACE FUNCTION create_geofence_events_partition(month_start date) RETURNS void AS $$
+    DECLARE
+        start_ts date := date_trunc('month', month_start);
+        end_ts date := (date_trunc('month', month_start) + interval '1 month')::date;
+    BEGIN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF geofence_events FOR VALUES FROM (%L) TO (%L)',
+            'geofence_events_' || to_char(start_ts, 'YYYY_MM'), start_ts, end_ts
+        );
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+def _stored_columns(table: str) -> str:
+    """Comma-separated columns of ``table`` that can be inserted (not generated)."""
+    rows = op.get_bind().execute(sa.text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name = :table AND is_generated = 'NEVER' ORDER BY ordinal_position"
+    ), {"table": table})
+    return ", ".join(row[0] for row in rows)
+
+def _rebuild(partitioned: bool) -> None:
+    """Recreate geofence_events as a (non-)partitioned table and move its rows across."""
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY}")
+    like = f"LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING GENERATED"
+    if partitioned:
+        op.execute(f"CREATE TABLE {TABLE} ({like}) PARTITION BY RANGE (event_timestamp)")
+        # One partition per month already holding rows, plus this month and the next
+        op.execute(f"""
+            SELECT create_geofence_events_partition(month::date)
+            FROM (
+                SELECT DISTINCT date_trunc('month', event_timestamp) AS month FROM {LEGACY}
+                UNION SELECT date_trunc('month', now())
+                UNION SELECT date_trunc('month', now() + interval '1 month')
+            ) months
+        """)
+        op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {TABLE} ({like})")
+
+    columns = _stored_columns(LEGACY)
+    op.execute(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {LEGACY}")
+    op.execute(f"DROP TABLE {LEGACY} CASCADE")
+
+    pk = "id, event_timestamp" if partitioned else "id"
+    op.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY ({pk})")
+    op.execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_geofence_id_fkey FOREIGN KEY (geofence_id) "
+        f"REFERENCES geofences(id) ON DELETE CASCADE"
+    )
+    for statement in INDEXES:
+        op.execute(statement)
+
+def upgrade() -> None:
+    # A foreign key into a partitioned table would have to reference (id, event_timestamp)
+    op.drop_constraint('geofence_notifications_event_id_fkey', 'geofence_notifications', type_='foreignkey')
+
+    op.execute(PARTITION_FUNCTION)
+    _rebuild(partitioned=True)
+
+    # Create next month's partition ahead of time when pg_cron is available
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+                PERFORM cron.schedule('geofence-events-partitions-create', '0 0 20 * *', $job$
+                    SELECT create_geofence_events_partition((current_date + interval '1 month')::date);
+                $job$);
+            END IF;
+        END;
+        $$
+    """)
+
+def downgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+                PERFORM cron.unschedule('geofence-events-partitions-create');
+            END IF;
+        END;
+        $$
+    """)
+    _rebuild(partitioned=False)
+    op.execute("DROP FUNCTION IF EXISTS create_geofence_events_partition(date)")
+
+    op.create_foreign_key(
+        'geofence_notifications_event_id_fkey', 'geofence_notifications', 'geofence_events',
+        ['event_id'], ['id'], ondelete='CASCADE'
+    )
@@ -0,0 +1,23 @@
+"""drop geofence bbox index
+
+Revision ID: 8e385a06a8e9
+Revises: 7d2749f5f7d8
+Create Date: 2026-10-15 08:23:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e385a06a8e9'
+down_revision = '7d2749f5f7d8'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # The bbox columns are only read from the cached geofences in update_location
+    op.drop_index('idx_geofence_bbox', table_name='geofences')
+
+def downgrade() -> None:
+    op.create_index('idx_geofence_bbox', 'geofences', ['min_lat', 'max_lat', 'min_lon', 'max_lon'])
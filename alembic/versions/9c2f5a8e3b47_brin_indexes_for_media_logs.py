@@ -0,0 +1,34 @@
+"""brin indexes for media logs
+
+Revision ID: 9c2f5a8e3b47
+Revises: 4b7e1c9a2d10
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2f5a8e3b47'
+down_revision = '4b7e1c9a2d10'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.drop_index('ix_media_access_logs_timestamp', table_name='media_access_logs')
+    op.create_index(
+        'idx_access_log_ts_brin', 'media_access_logs', ['timestamp'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+    )
+    op.drop_index('ix_media_analytics_analytics_date', table_name='media_analytics')
+    op.create_index(
+        'idx_analytics_date_brin', 'media_analytics', ['analytics_date'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+    )
+
+def downgrade() -> None:
+    op.drop_index('idx_analytics_date_brin', table_name='media_analytics')
+    op.create_index('ix_media_analytics_analytics_date', 'media_analytics', ['analytics_date'])
+    op.drop_index('idx_access_log_ts_brin', table_name='media_access_logs')
+    op.create_index('ix_media_access_logs_timestamp', 'media_access_logs', ['timestamp'])
@@ -0,0 +1,26 @@
+"""geofence metadata to jsonb
+
+Revision ID: 9e4f6b1cd3fa
+Revises: 8d3e5a0bc2e9
+Create Date: 2026-10-15 08:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4f6b1cd3fa'
+down_revision = '8d3e5a0bc2e9'
+branch_labels = None
+depends_on = None
+
+TABLES = ['geofences', 'geofence_events']
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN metadata TYPE jsonb USING metadata::jsonb")
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN metadata TYPE json USING metadata::json")
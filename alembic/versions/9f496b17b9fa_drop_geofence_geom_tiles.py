@@ -0,0 +1,53 @@
+"""drop geofence geom tiles
+
+Revision ID: 9f496b17b9fa
+Revises: 8e385a06a8e9
+Create Date: 2026-10-15 08:24:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f496b17b9fa'
+down_revision = '8e385a06a8e9'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Containment is matched in process against the cached geofences; nothing reads the tiles
+    op.execute("DROP TRIGGER IF EXISTS geofence_geom_tiles_refresh ON geofences")
+    op.execute("DROP FUNCTION IF EXISTS refresh_geofence_geom_tiles()")
+    op.drop_table('geofence_geom_tiles')
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE TABLE geofence_geom_tiles (
+            id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+            geofence_id uuid NOT NULL REFERENCES geofences(id) ON DELETE CASCADE,
+            tile geometry(POLYGON,4326) NOT NULL
+        )
+    """)
+    op.create_index('ix_geofence_geom_tiles_geofence_id', 'geofence_geom_tiles', ['geofence_id'])
+    op.create_index('idx_geofence_tile_spgist', 'geofence_geom_tiles', ['tile'], postgresql_using='spgist')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_geofence_geom_tiles() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM geofence_geom_tiles WHERE geofence_id = NEW.id;
+            INSERT INTO geofence_geom_tiles (geofence_id, tile)
+            SELECT NEW.id, (ST_Dump(ST_Subdivide(NEW.geom, 256))).geom;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER geofence_geom_tiles_refresh
+            AFTER INSERT OR UPDATE OF geom ON geofences
+            FOR EACH ROW EXECUTE FUNCTION refresh_geofence_geom_tiles()
+    """)
+    op.execute("""
+        INSERT INTO geofence_geom_tiles (geofence_id, tile)
+        SELECT id, (ST_Dump(ST_Subdivide(geom, 256))).geom FROM geofences
+    """)
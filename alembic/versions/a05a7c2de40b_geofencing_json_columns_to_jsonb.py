@@ -0,0 +1,48 @@
+"""geofencing json columns to jsonb
+
+Revision ID: a05a7c2de40b
+Revises: 9e4f6b1cd3fa
+Create Date: 2026-10-15 08:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a05a7c2de40b'
+down_revision = '9e4f6b1cd3fa'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ('geofences', 'coordinates'),
+    ('geofences', 'schedule_config'),
+    ('geofences', 'tags'),
+    ('geofence_templates', 'default_settings'),
+    ('geofence_templates', 'tags'),
+    ('geofence_import_jobs', 'error_details'),
+]
+
+# Containment (@>) lookups; jsonb_path_ops keeps the indexes small
+GIN_INDEXES = [
+    ('idx_geofence_tags_gin', 'geofences', 'tags'),
+    ('idx_geofence_schedule_gin', 'geofences', 'schedule_config'),
+    ('idx_template_tags_gin', 'geofence_templates', 'tags'),
+    ('idx_import_error_details_gin', 'geofence_import_jobs', 'error_details'),
+]
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb")
+    for name, table, column in GIN_INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'}
+        )
+
+def downgrade() -> None:
+    for name, table, _ in GIN_INDEXES:
+        op.drop_index(name, table_name=table)
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE json USING {column}::json")
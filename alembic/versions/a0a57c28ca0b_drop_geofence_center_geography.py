@@ -0,0 +1,31 @@
+"""drop geofence center geography
+
+Revision ID: a0a57c28ca0b
+Revises: 9f496b17b9fa
+Create Date: 2026-10-15 08:25:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a0a57c28ca0b'
+down_revision = '9f496b17b9fa'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Circles are matched in process; no query uses the geography center
+    op.drop_index('idx_geofence_center_geog', table_name='geofences')
+    op.drop_column('geofences', 'center_geog')
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE geofences ADD COLUMN center_geog geography(POINT,4326) NOT NULL
+            GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(center_longitude, center_latitude), 4326)::geography) STORED
+    """)
+    op.create_index(
+        'idx_geofence_center_geog', 'geofences', ['center_geog'],
+        postgresql_using='gist', postgresql_where=sa.text("is_circle")
+    )
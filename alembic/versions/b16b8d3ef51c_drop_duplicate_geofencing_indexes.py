@@ -0,0 +1,46 @@
+"""drop duplicate geofencing indexes
+
+Revision ID: b16b8d3ef51c
+Revises: a05a7c2de40b
+Create Date: 2026-10-15 08:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b16b8d3ef51c'
+down_revision = 'a05a7c2de40b'
+branch_labels = None
+depends_on = None
+
+# (table, column) whose standalone index duplicates the primary key or the
+# leading column of a composite index
+COLUMNS = [
+    ('geofences', 'id'),
+    ('geofence_events', 'id'),
+    ('geofence_events', 'geofence_id'),
+    ('geofence_events', 'user_id'),
+    ('geofence_notifications', 'id'),
+    ('geofence_notifications', 'geofence_id'),
+    ('geofence_notifications', 'event_id'),
+    ('geofence_templates', 'id'),
+    ('geofence_analytics', 'id'),
+    ('geofence_analytics', 'user_id'),
+    ('geofence_analytics', 'geofence_id'),
+    ('geofence_import_jobs', 'id'),
+    ('geofence_import_jobs', 'user_id'),
+    ('geofence_shares', 'id'),
+    ('geofence_shares', 'geofence_id'),
+    ('geofence_shares', 'owner_user_id'),
+    ('geofence_shares', 'shared_with_user_id'),
+]
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
+
+def downgrade() -> None:
+    for table, column in COLUMNS:
+        op.create_index(f'ix_{table}_{column}', table, [column])
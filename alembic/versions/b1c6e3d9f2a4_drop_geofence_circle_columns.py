@@ -0,0 +1,28 @@
+"""drop geofence circle columns
+
+Revision ID: b1c6e3d9f2a4
+Revises: a0a57c28ca0b
+Create Date: 2026-10-15 08:26:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b1c6e3d9f2a4'
+down_revision = 'a0a57c28ca0b'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.drop_column('geofences', 'cos_center_latitude')
+    op.drop_column('geofences', 'is_circle')
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE geofences
+            ADD COLUMN is_circle boolean NOT NULL GENERATED ALWAYS AS (shape = 'circle') STORED,
+            ADD COLUMN cos_center_latitude double precision NOT NULL
+                GENERATED ALWAYS AS (cos(radians(center_latitude))) STORED
+    """)
@@ -0,0 +1,42 @@
+"""geofencing covering indexes
+
+Revision ID: c27c9e4fa62d
+Revises: b16b8d3ef51c
+Create Date: 2026-10-15 08:11:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c27c9e4fa62d'
+down_revision = 'b16b8d3ef51c'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.drop_index('idx_event_unprocessed', table_name='geofence_events')
+    op.create_index(
+        'idx_event_unprocessed_covering', 'geofence_events', ['created_at'],
+        postgresql_where=sa.text("processed = false"),
+        postgresql_include=['id', 'geofence_id', 'user_id', 'event_type', 'latitude', 'longitude']
+    )
+    op.drop_index('idx_notification_pending', table_name='geofence_notifications')
+    op.create_index(
+        'idx_notification_pending_covering', 'geofence_notifications', ['created_at'],
+        postgresql_where=sa.text("status = 'pending'"),
+        postgresql_include=['id', 'recipient_identifier', 'notification_type']
+    )
+
+def downgrade() -> None:
+    op.drop_index('idx_notification_pending_covering', table_name='geofence_notifications')
+    op.create_index(
+        'idx_notification_pending', 'geofence_notifications', ['created_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.drop_index('idx_event_unprocessed_covering', table_name='geofence_events')
+    op.create_index(
+        'idx_event_unprocessed', 'geofence_events', ['created_at'],
+        postgresql_where=sa.text("processed = false")
+    )
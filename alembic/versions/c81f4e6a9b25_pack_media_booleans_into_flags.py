@@ -0,0 +1,72 @@
+"""pack media booleans into flags
+
+Revision ID: c81f4e6a9b25
+Revises: 7a3e9d2c5f18
+Create Date: 2026-10-15 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f4e6a9b25'
+down_revision = '7a3e9d2c5f18'
+branch_labels = None
+depends_on = None
+
+# (table, column, bit, old default)
+FLAG_COLUMNS = [
+    ('media_files', 'is_encrypted', 1, False),
+    ('media_files', 'is_public', 2, False),
+    ('media_files', 'is_backed_up', 4, False),
+    ('media_files', 'auto_delete', 8, False),
+    ('media_shares', 'can_view', 1, True),
+    ('media_shares', 'can_download', 2, True),
+    ('media_shares', 'can_share', 4, False),
+    ('media_shares', 'password_protected', 8, False),
+    ('media_shares', 'is_active', 16, True),
+]
+
+# (name, table, old columns, new column, new predicate)
+INDEXES = [
+    ('idx_media_expires', 'media_files', ['expires_at', 'auto_delete'], 'expires_at', 'flags & 8 <> 0'),
+    ('idx_media_backup', 'media_files', ['is_backed_up', 'backup_timestamp'], 'backup_timestamp', 'flags & 4 <> 0'),
+    ('idx_share_media_active', 'media_shares', ['media_file_id', 'is_active'], 'media_file_id', 'flags & 16 <> 0'),
+    ('idx_share_expires', 'media_shares', ['expires_at', 'is_active'], 'expires_at', 'flags & 16 <> 0'),
+    ('idx_share_type_active', 'media_shares', ['share_type', 'is_active'], 'share_type', 'flags & 16 <> 0'),
+]
+
+def _tables():
+    return sorted({table for table, _, _, _ in FLAG_COLUMNS})
+
+def upgrade() -> None:
+    for name, table, _, _, _ in INDEXES:
+        op.drop_index(name, table_name=table)
+
+    for table in _tables():
+        columns = [(column, bit) for t, column, bit, _ in FLAG_COLUMNS if t == table]
+        default = sum(bit for t, _, bit, on in FLAG_COLUMNS if t == table and on)
+        op.add_column(table, sa.Column('flags', sa.SmallInteger(), nullable=False, server_default=str(default)))
+        packed = " | ".join(f"(CASE WHEN {column} THEN {bit} ELSE 0 END)" for column, bit in columns)
+        op.execute(f"UPDATE {table} SET flags = {packed}")
+        op.alter_column(table, 'flags', server_default=None)
+        for column, _ in columns:
+            op.drop_column(table, column)
+
+    for name, table, _, column, predicate in INDEXES:
+        op.create_index(name, table, [column], postgresql_where=sa.text(predicate))
+
+def downgrade() -> None:
+    for name, table, _, _, _ in INDEXES:
+        op.drop_index(name, table_name=table)
+
+    for table, column, bit, default in FLAG_COLUMNS:
+        op.add_column(table, sa.Column(column, sa.Boolean(), nullable=False, server_default=sa.true() if default else sa.false()))
+        op.execute(f"UPDATE {table} SET {column} = (flags & {bit}) <> 0")
+        op.alter_column(table, column, server_default=None)
+    for table in _tables():
+        op.drop_column(table, 'flags')
+
+    for name, table, columns, _, _ in INDEXES:
+        op.create_index(name, table, columns)
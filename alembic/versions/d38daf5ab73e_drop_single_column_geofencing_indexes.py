@@ -0,0 +1,37 @@
+"""drop single column geofencing indexes
+
+Revision ID: d38daf5ab73e
+Revises: c27c9e4fa62d
+Create Date: 2026-10-15 08:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd38daf5ab73e'
+down_revision = 'c27c9e4fa62d'
+branch_labels = None
+depends_on = None
+
+# (table, column) whose standalone index a composite or partial index already serves
+COLUMNS = [
+    ('geofences', 'geofence_type'),
+    ('geofences', 'status'),
+    ('geofence_events', 'event_type'),
+    ('geofence_events', 'processed'),
+    ('geofence_notifications', 'notification_type'),
+    ('geofence_templates', 'name'),
+    ('geofence_templates', 'category'),
+    ('geofence_templates', 'geofence_type'),
+    ('geofence_analytics', 'analytics_type'),
+]
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
+
+def downgrade() -> None:
+    for table, column in COLUMNS:
+        op.create_index(f'ix_{table}_{column}', table, [column])
@@ -0,0 +1,63 @@
+"""media state columns to enums
+
+Revision ID: d4b6a2e8f053
+Revises: c81f4e6a9b25
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b6a2e8f053'
+down_revision = 'c81f4e6a9b25'
+branch_labels = None
+depends_on = None
+
+# Enum type -> member names (SQLAlchemy stores the names, as for mediatype)
+ENUMS = {
+    'processingstatus': ['PENDING', 'PROCESSING', 'COMPLETED', 'FAILED'],
+    'virusscanstatus': ['PENDING', 'CLEAN', 'INFECTED', 'FAILED'],
+    'moderationstatus': ['PENDING', 'APPROVED', 'REJECTED', 'FLAGGED'],
+    'sharetype': ['USER', 'PUBLIC', 'LINK'],
+    'accesstype': ['VIEW', 'DOWNLOAD', 'SHARE', 'DELETE'],
+    'accessmethod': ['DIRECT', 'SHARE_LINK', 'API'],
+    'jobtype': ['THUMBNAIL', 'TRANSCODE', 'COMPRESS', 'WATERMARK', 'CONVERT', 'EXTRACT_METADATA', 'VIRUS_SCAN'],
+    'jobstatus': ['PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', 'CANCELLED'],
+    'analyticstype': ['DAILY', 'WEEKLY', 'MONTHLY'],
+}
+
+# (table, column, enum type, previous string length)
+COLUMNS = [
+    ('media_files', 'processing_status', 'processingstatus', 20),
+    ('media_files', 'virus_scan_status', 'virusscanstatus', 20),
+    ('media_files', 'moderation_status', 'moderationstatus', 20),
+    ('media_shares', 'share_type', 'sharetype', 20),
+    ('media_access_logs', 'access_type', 'accesstype', 20),
+    ('media_access_logs', 'access_method', 'accessmethod', 20),
+    ('media_processing_jobs', 'job_type', 'jobtype', 50),
+    ('media_processing_jobs', 'status', 'jobstatus', 20),
+    ('media_analytics', 'analytics_type', 'analyticstype', 20),
+]
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for name, members in ENUMS.items():
+        postgresql.ENUM(*members, name=name).create(bind, checkfirst=True)
+    for table, column, enum_name, _ in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} "
+            f"USING upper({column})::{enum_name}"
+        )
+
+def downgrade() -> None:
+    for table, column, _, length in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar({length}) "
+            f"USING lower({column}::text)"
+        )
+    bind = op.get_bind()
+    for name in ENUMS:
+        postgresql.ENUM(name=name).drop(bind, checkfirst=True)
@@ -0,0 +1,51 @@
+"""geofence stats materialized view
+
+Revision ID: e49eb06bc84f
+Revises: d38daf5ab73e
+Create Date: 2026-10-15 08:13:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e49eb06bc84f'
+down_revision = 'd38daf5ab73e'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW geofence_stats AS
+        SELECT
+            geofence_id,
+            count(*) FILTER (WHERE event_type = 'enter') AS total_entries,
+            count(*) FILTER (WHERE event_type = 'exit') AS total_exits,
+            count(*) FILTER (WHERE event_type = 'dwell') AS total_dwells,
+            max(event_timestamp) AS last_triggered
+        FROM geofence_events
+        GROUP BY geofence_id
+    """)
+    op.execute("CREATE UNIQUE INDEX idx_geofence_stats_geofence ON geofence_stats (geofence_id)")
+
+    op.drop_column('geofences', 'total_entries')
+    op.drop_column('geofences', 'total_exits')
+    op.drop_column('geofences', 'total_dwells')
+    op.drop_column('geofences', 'last_triggered')
+
+def downgrade() -> None:
+    op.add_column('geofences', sa.Column('last_triggered', sa.DateTime(timezone=True)))
+    op.add_column('geofences', sa.Column('total_dwells', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('geofences', sa.Column('total_exits', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('geofences', sa.Column('total_entries', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE geofences g
+        SET total_entries = s.total_entries,
+            total_exits = s.total_exits,
+            total_dwells = s.total_dwells,
+            last_triggered = s.last_triggered
+        FROM geofence_stats s
+        WHERE g.id = s.geofence_id
+    """)
+    op.execute("DROP MATERIALIZED VIEW geofence_stats")
@@ -0,0 +1,157 @@
+"""partition media logs by month
+
+Revision ID: e5a1d3f7c924
+Revises: 9c2f5a8e3b47
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1d3f7c924'
+down_revision = '9c2f5a8e3b47'
+branch_labels = None
+depends_on = None
+
+# Access logs older than this are dropped by the pg_cron job
+ACCESS_LOG_RETENTION = '13 months'
+
+TABLES = {
+    'media_access_logs': {
+        'key': 'timestamp',
+        'foreign_keys': [
+            ('media_access_logs_media_file_id_fkey', 'media_file_id', 'media_files(id)', 'CASCADE'),
+            ('media_access_logs_share_id_fkey', 'share_id', 'media_shares(id)', 'SET NULL'),
+        ],
+        'indexes': [
+            "CREATE INDEX ix_media_access_logs_id ON {t} (id)",
+            "CREATE INDEX ix_media_access_logs_media_file_id ON {t} (media_file_id)",
+            "CREATE INDEX ix_media_access_logs_user_id ON {t} (user_id)",
+            "CREATE INDEX ix_media_access_logs_access_type ON {t} (access_type)",
+            "CREATE INDEX ix_media_access_logs_ip_address ON {t} (ip_address)",
+            "CREATE INDEX idx_access_media_timestamp ON {t} (media_file_id, timestamp)",
+            "CREATE INDEX idx_access_user_timestamp ON {t} (user_id, timestamp)",
+            "CREATE INDEX idx_access_type_timestamp ON {t} (access_type, timestamp)",
+            "CREATE INDEX idx_access_ip_timestamp ON {t} (ip_address, timestamp)",
+            "CREATE INDEX idx_access_log_ts_brin ON {t} USING brin (timestamp) WITH (pages_per_range = 32)",
+        ],
+    },
+    'media_analytics': {
+        'key': 'analytics_date',
+        'foreign_keys': [],
+        'indexes': [
+            "CREATE INDEX ix_media_analytics_id ON {t} (id)",
+            "CREATE INDEX ix_media_analytics_analytics_type ON {t} (analytics_type)",
+            "CREATE INDEX ix_media_analytics_user_id ON {t} (user_id)",
+            "CREATE INDEX idx_analytics_date_type ON {t} (analytics_date, analytics_type)",
+            "CREATE INDEX idx_analytics_user_date ON {t} (user_id, analytics_date)",
+            "CREATE INDEX idx_analytics_date_brin ON {t} USING brin (analytics_date) WITH (pages_per_range = 32)",
+        ],
+    },
+}
+
+PARTITION_FUNCTIONS = """
+    CREATE OR REPLACE FUNCTION create_media_partition(parent text, month_start date) RETURNS void AS $$
+    DECLARE
+        start_ts date := date_trunc('month', month_start);
+        end_ts date := (date_trunc('month', month_start) + interval '1 month')::date;
+    BEGIN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent || '_' || to_char(start_ts, 'YYYY_MM'), parent, start_ts, end_ts
+        );
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION drop_media_partitions(parent text, retention interval) RETURNS void AS $$
+    DECLARE
+        part text;
+    BEGIN
+        FOR part IN
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = parent::regclass
+              AND c.relname ~ ('^' || parent || '_[0-9]{4}_[0-9]{2}$')
+              AND to_date(right(c.relname, 7), 'YYYY_MM') + interval '1 month' <= now() - retention
+        LOOP
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, part);
+            EXECUTE format('DROP TABLE %I', part);
+        END LOOP;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate ``table`` as a (non-)partitioned table and move its rows across."""
+    spec = TABLES[table]
+    key = spec['key']
+    legacy = f"{table}_legacy"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    if partitioned:
+        op.execute(f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})")
+        # One partition per month already holding rows, plus this month and the next
+        op.execute(f"""
+            SELECT create_media_partition('{table}', month::date)
+            FROM (
+                SELECT DISTINCT date_trunc('month', {key}) AS month FROM {legacy}
+                UNION SELECT date_trunc('month', now())
+                UNION SELECT date_trunc('month', now() + interval '1 month')
+            ) months
+        """)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS)")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy} CASCADE")
+
+    pk = f"id, {key}" if partitioned else "id"
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({pk})")
+    for name, column, target, on_delete in spec['foreign_keys']:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+            f"REFERENCES {target} ON DELETE {on_delete}"
+        )
+    for statement in spec['indexes']:
+        op.execute(statement.format(t=table))
+
+def upgrade() -> None:
+    op.execute(PARTITION_FUNCTIONS)
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+    # Monthly maintenance when pg_cron is available: create next month, drop expired months
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+                PERFORM cron.schedule('media-partitions-create', '0 0 20 * *', $job$
+                    SELECT create_media_partition('media_access_logs', (current_date + interval '1 month')::date);
+                    SELECT create_media_partition('media_analytics', (current_date + interval '1 month')::date);
+                $job$);
+                PERFORM cron.schedule('media-partitions-drop', '0 3 1 * *', $job$
+                    SELECT drop_media_partitions('media_access_logs', interval '{ACCESS_LOG_RETENTION}');
+                $job$);
+            END IF;
+        END;
+        $$
+    """)
+
+def downgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+                PERFORM cron.unschedule('media-partitions-create');
+                PERFORM cron.unschedule('media-partitions-drop');
+            END IF;
+        END;
+        $$
+    """)
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
+    op.execute("DROP FUNCTION IF EXISTS drop_media_partitions(text, interval)")
+    op.execute("DROP FUNCTION IF EXISTS create_media_partition(text, date)")
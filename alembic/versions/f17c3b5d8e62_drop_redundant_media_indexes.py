@@ -0,0 +1,35 @@
+"""drop redundant media indexes
+
+Revision ID: f17c3b5d8e62
+Revises: d4b6a2e8f053
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f17c3b5d8e62'
+down_revision = 'd4b6a2e8f053'
+branch_labels = None
+depends_on = None
+
+# Single-column indexes already served by the primary key or by a composite
+# index with the same leading column
+REDUNDANT_INDEXES = {
+    'media_files': ['id', 'user_id', 'file_extension', 'mime_type', 'file_size', 'media_type', 'status', 'visibility'],
+    'media_shares': ['id', 'owner_user_id'],
+    'media_access_logs': ['id', 'media_file_id', 'user_id', 'access_type', 'ip_address'],
+    'media_processing_jobs': ['id', 'media_file_id', 'job_type', 'status'],
+}
+
+def upgrade() -> None:
+    for table, columns in REDUNDANT_INDEXES.items():
+        for column in columns:
+            op.drop_index(f'ix_{table}_{column}', table_name=table)
+
+def downgrade() -> None:
+    for table, columns in REDUNDANT_INDEXES.items():
+        for column in columns:
+            op.create_index(f'ix_{table}_{column}', table, [column])
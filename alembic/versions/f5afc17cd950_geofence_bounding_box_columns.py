@@ -0,0 +1,37 @@
+"""geofence bounding box columns
+
+Revision ID: f5afc17cd950
+Revises: e49eb06bc84f
+Create Date: 2026-10-15 08:14:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5afc17cd950'
+down_revision = 'e49eb06bc84f'
+branch_labels = None
+depends_on = None
+
+# Column -> expression over geom
+BBOX_COLUMNS = {
+    'min_lat': 'ST_YMin(geom)',
+    'max_lat': 'ST_YMax(geom)',
+    'min_lon': 'ST_XMin(geom)',
+    'max_lon': 'ST_XMax(geom)',
+}
+
+def upgrade() -> None:
+    # One ALTER so the table is rewritten once for all four columns
+    op.execute("ALTER TABLE geofences " + ", ".join(
+        f"ADD COLUMN {column} double precision NOT NULL GENERATED ALWAYS AS ({expression}) STORED"
+        for column, expression in BBOX_COLUMNS.items()
+    ))
+    op.create_index('idx_geofence_bbox', 'geofences', list(BBOX_COLUMNS))
+
+def downgrade() -> None:
+    op.drop_index('idx_geofence_bbox', table_name='geofences')
+    for column in BBOX_COLUMNS:
+        op.drop_column('geofences', column)
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
 from datetime import datetime, timedelta
 import re
 
-from ..shared.database import get_db
+from ..database import get_db
 from ..shared.config import settings
 from .models import User, Agent, RefreshToken, TokenManager
 from .schemas import (
@@ -38,7 +39,7 @@ def validate_password(password: str) -> bool:
     return True
 
 # Dependency to get current user from token
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)):
     """Get current user from JWT token."""
     token = credentials.credentials
     
@@ -54,7 +55,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     user_type = payload.get("user_type")
     
     if user_type == "user":
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.scalar(select(User).where(User.id == user_id).limit(1))
         if user is None or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,7 +63,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             )
         return user
     elif user_type == "agent":
-        agent = db.query(Agent).filter(Agent.id == user_id).first()
+        agent = await db.scalar(select(Agent).where(Agent.id == user_id).limit(1))
         if agent is None or not agent.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -77,7 +78,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 
 # User registration
 @router.post("/register/user", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
     
     # Validate password
@@ -88,9 +89,9 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if user already exists
-    existing_user = db.query(User).filter(
+    existing_user = await db.scalar(select(User).where(
         (User.email == user_data.email) | (User.phone == user_data.phone)
-    ).first()
+    ).limit(1))
     
     if existing_user:
         raise HTTPException(
@@ -110,8 +111,8 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return UserResponse(
         user=new_user.to_dict(),
@@ -120,7 +121,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
 
 # Agent registration
 @router.post("/register/agent", response_model=AgentResponse, status_code=status.HTTP_201_CREATED)
-async def register_agent(agent_data: AgentCreate, db: Session = Depends(get_db)):
+async def register_agent(agent_data: AgentCreate, db: AsyncSession = Depends(get_db)):
     """Register a new agent."""
     
     # Validate password
@@ -131,11 +132,11 @@ async def register_agent(agent_data: AgentCreate, db: Session = Depends(get_db))
         )
     
     # Check if agent already exists
-    existing_agent = db.query(Agent).filter(
+    existing_agent = await db.scalar(select(Agent).where(
         (Agent.email == agent_data.email) | 
         (Agent.phone == agent_data.phone) |
         (Agent.employee_id == agent_data.employee_id)
-    ).first()
+    ).limit(1))
     
     if existing_agent:
         raise HTTPException(
@@ -159,8 +160,8 @@ async def register_agent(agent_data: AgentCreate, db: Session = Depends(get_db))
     )
     
     db.add(new_agent)
-    db.commit()
-    db.refresh(new_agent)
+    await db.commit()
+    await db.refresh(new_agent)
     
     return AgentResponse(
         agent=new_agent.to_dict(),
@@ -169,13 +170,13 @@ async def register_agent(agent_data: AgentCreate, db: Session = Depends(get_db))
 
 # User login
 @router.post("/login/user", response_model=TokenResponse)
-async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login_user(login_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """Authenticate user and return tokens."""
     
     # Find user by email or phone
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         (User.email == login_data.identifier) | (User.phone == login_data.identifier)
-    ).first()
+    ).limit(1))
     
     if not user or not user.verify_password(login_data.password):
         raise HTTPException(
@@ -201,7 +202,7 @@ async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
     )
     
     db.add(refresh_token_record)
-    db.commit()
+    await db.commit()
     
     return TokenResponse(
         access_token=tokens["access_token"],
@@ -213,15 +214,15 @@ async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
 
 # Agent login
 @router.post("/login/agent", response_model=TokenResponse)
-async def login_agent(login_data: AgentLogin, db: Session = Depends(get_db)):
+async def login_agent(login_data: AgentLogin, db: AsyncSession = Depends(get_db)):
     """Authenticate agent and return tokens."""
     
     # Find agent by email, phone, or employee ID
-    agent = db.query(Agent).filter(
+    agent = await db.scalar(select(Agent).where(
         (Agent.email == login_data.identifier) | 
         (Agent.phone == login_data.identifier) |
         (Agent.employee_id == login_data.identifier)
-    ).first()
+    ).limit(1))
     
     if not agent or not agent.verify_password(login_data.password):
         raise HTTPException(
@@ -247,7 +248,7 @@ async def login_agent(login_data: AgentLogin, db: Session = Depends(get_db)):
     )
     
     db.add(refresh_token_record)
-    db.commit()
+    await db.commit()
     
     return TokenResponse(
         access_token=tokens["access_token"],
@@ -259,13 +260,13 @@ async def login_agent(login_data: AgentLogin, db: Session = Depends(get_db)):
 
 # Token refresh
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)):
     """Refresh access token using refresh token."""
     
     # Find refresh token in database
-    token_record = db.query(RefreshToken).filter(
+    token_record = await db.scalar(select(RefreshToken).where(
         RefreshToken.token == refresh_token
-    ).first()
+    ).limit(1))
     
     if not token_record or not token_record.is_valid:
         raise HTTPException(
@@ -275,7 +276,7 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
     
     # Get user or agent
     if token_record.user_type == "user":
-        user = db.query(User).filter(User.id == token_record.user_id).first()
+        user = await db.scalar(select(User).where(User.id == token_record.user_id).limit(1))
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -284,7 +285,7 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
         tokens = TokenManager.create_user_tokens(user)
         user_data = user.to_dict()
     else:
-        agent = db.query(Agent).filter(Agent.id == token_record.agent_id).first()
+        agent = await db.scalar(select(Agent).where(Agent.id == token_record.agent_id).limit(1))
         if not agent or not agent.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -306,7 +307,7 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
     )
     
     db.add(new_refresh_token_record)
-    db.commit()
+    await db.commit()
     
     return TokenResponse(
         access_token=tokens["access_token"],
@@ -318,16 +319,16 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
 
 # Logout
 @router.post("/logout")
-async def logout(refresh_token: str, db: Session = Depends(get_db)):
+async def logout(refresh_token: str, db: AsyncSession = Depends(get_db)):
     """Logout user by revoking refresh token."""
     
-    token_record = db.query(RefreshToken).filter(
+    token_record = await db.scalar(select(RefreshToken).where(
         RefreshToken.token == refresh_token
-    ).first()
+    ).limit(1))
     
     if token_record:
         token_record.is_revoked = True
-        db.commit()
+        await db.commit()
     
     return {"message": "Logged out successfully"}
 
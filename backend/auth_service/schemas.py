@@ -1,10 +1,31 @@
-from pydantic import BaseModel, EmailStr, validator, Field
-from typing import Optional, Dict, Any, List
+from pydantic import (
+    BaseModel, ConfigDict, EmailStr, StringConstraints, TypeAdapter, ValidationInfo, Field,
+    field_validator, model_validator
+)
+from typing import Optional, Dict, Any, List, Annotated
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
 import re
 
+# Shared phone type: pydantic-core compiles one regex per Field(pattern=...)
+# declaration, so every phone field must reference this alias instead of
+# repeating the pattern inline.
+Phone = Annotated[str, Field(pattern=r'^\+?[\d\s\-()]{10,20}$')]
+
+# Non-blank string checked entirely by pydantic-core (strip + length)
+Identifier = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+def _strip_title(v: str) -> str:
+    """Strip and title-case a name, skipping the copy when already title-cased."""
+    v = v.strip()
+    if not v:
+        raise ValueError('Name cannot be empty or just whitespace')
+    # For ASCII, istitle() implies title() would return an identical string
+    if v.isascii() and v.istitle():
+        return v
+    return v.title()
+
 class UserRole(str, Enum):
     """Enumeration for user roles."""
     USER = "user"
@@ -33,12 +54,13 @@ class AuthProvider(str, Enum):
 class UserCreate(BaseModel):
     """Schema for user registration."""
     email: EmailStr
-    phone: str = Field(..., min_length=10, max_length=20)
+    phone: Phone
     password: str = Field(..., min_length=8)
     first_name: str = Field(..., min_length=1, max_length=100)
     last_name: str = Field(..., min_length=1, max_length=100)
     
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone(cls, v):
         # Remove any non-digit characters for validation
         digits_only = re.sub(r'\D', '', v)
@@ -46,17 +68,16 @@ class UserCreate(BaseModel):
             raise ValueError('Phone number must have at least 10 digits')
         return v
     
-    @validator('first_name', 'last_name')
+    @field_validator('first_name', 'last_name')
+    @classmethod
     def validate_names(cls, v):
-        if not v.strip():
-            raise ValueError('Name cannot be empty or just whitespace')
-        return v.strip().title()
+        return _strip_title(v)
 
 class AgentCreate(BaseModel):
     """Schema for agent registration."""
     employee_id: str = Field(..., min_length=1, max_length=50)
     email: EmailStr
-    phone: str = Field(..., min_length=10, max_length=20)
+    phone: Phone
     password: str = Field(..., min_length=8)
     first_name: str = Field(..., min_length=1, max_length=100)
     last_name: str = Field(..., min_length=1, max_length=100)
@@ -64,20 +85,21 @@ class AgentCreate(BaseModel):
     department: Optional[str] = Field(None, max_length=100)
     role: Optional[str] = Field("agent", max_length=50)
     
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone(cls, v):
         digits_only = re.sub(r'\D', '', v)
         if len(digits_only) < 10:
             raise ValueError('Phone number must have at least 10 digits')
         return v
     
-    @validator('first_name', 'last_name')
+    @field_validator('first_name', 'last_name')
+    @classmethod
     def validate_names(cls, v):
-        if not v.strip():
-            raise ValueError('Name cannot be empty or just whitespace')
-        return v.strip().title()
+        return _strip_title(v)
     
-    @validator('role')
+    @field_validator('role')
+    @classmethod
     def validate_role(cls, v):
         allowed_roles = ['agent', 'supervisor', 'admin', 'dispatcher']
         if v and v.lower() not in allowed_roles:
@@ -86,25 +108,13 @@ class AgentCreate(BaseModel):
 
 class UserLogin(BaseModel):
     """Schema for user login."""
-    identifier: str = Field(..., description="Email or phone number")
+    identifier: Identifier = Field(..., description="Email or phone number")
     password: str = Field(..., min_length=1)
-    
-    @validator('identifier')
-    def validate_identifier(cls, v):
-        if not v.strip():
-            raise ValueError('Identifier cannot be empty')
-        return v.strip()
 
 class AgentLogin(BaseModel):
     """Schema for agent login."""
-    identifier: str = Field(..., description="Email, phone number, or employee ID")
+    identifier: Identifier = Field(..., description="Email, phone number, or employee ID")
     password: str = Field(..., min_length=1)
-    
-    @validator('identifier')
-    def validate_identifier(cls, v):
-        if not v.strip():
-            raise ValueError('Identifier cannot be empty')
-        return v.strip()
 
 class TokenResponse(BaseModel):
     """Schema for token response."""
@@ -113,16 +123,22 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
     expires_in: int
     user_data: Dict[str, Any]
+    
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
 class UserResponse(BaseModel):
     """Schema for user response."""
     user: Dict[str, Any]
     message: str
+    
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
 class AgentResponse(BaseModel):
     """Schema for agent response."""
     agent: Dict[str, Any]
     message: str
+    
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
 class PasswordChange(BaseModel):
     """Schema for password change."""
@@ -130,21 +146,15 @@ class PasswordChange(BaseModel):
     new_password: str = Field(..., min_length=8)
     confirm_password: str = Field(..., min_length=8)
     
-    @validator('confirm_password')
-    def passwords_match(cls, v, values):
-        if 'new_password' in values and v != values['new_password']:
+    @model_validator(mode='after')
+    def passwords_match(self):
+        if self.new_password != self.confirm_password:
             raise ValueError('Passwords do not match')
-        return v
+        return self
 
 class PasswordReset(BaseModel):
     """Schema for password reset request."""
-    identifier: str = Field(..., description="Email or phone number")
-    
-    @validator('identifier')
-    def validate_identifier(cls, v):
-        if not v.strip():
-            raise ValueError('Identifier cannot be empty')
-        return v.strip()
+    identifier: Identifier = Field(..., description="Email or phone number")
 
 class PasswordResetConfirm(BaseModel):
     """Schema for password reset confirmation."""
@@ -152,11 +162,11 @@ class PasswordResetConfirm(BaseModel):
     new_password: str = Field(..., min_length=8)
     confirm_password: str = Field(..., min_length=8)
     
-    @validator('confirm_password')
-    def passwords_match(cls, v, values):
-        if 'new_password' in values and v != values['new_password']:
+    @model_validator(mode='after')
+    def passwords_match(self):
+        if self.new_password != self.confirm_password:
             raise ValueError('Passwords do not match')
-        return v
+        return self
 
 class EmailVerification(BaseModel):
     """Schema for email verification."""
@@ -164,10 +174,11 @@ class EmailVerification(BaseModel):
 
 class PhoneVerification(BaseModel):
     """Schema for phone verification."""
-    phone: str = Field(..., min_length=10, max_length=20)
+    phone: Phone
     verification_code: str = Field(..., min_length=4, max_length=10)
     
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone(cls, v):
         digits_only = re.sub(r'\D', '', v)
         if len(digits_only) < 10:
@@ -186,9 +197,10 @@ class UserUpdate(BaseModel):
     """Schema for user profile update."""
     first_name: Optional[str] = Field(None, min_length=1, max_length=100)
     last_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    phone: Optional[str] = Field(None, min_length=10, max_length=20)
+    phone: Optional[Phone] = None
     
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone(cls, v):
         if v is not None:
             digits_only = re.sub(r'\D', '', v)
@@ -196,24 +208,24 @@ class UserUpdate(BaseModel):
                 raise ValueError('Phone number must have at least 10 digits')
         return v
     
-    @validator('first_name', 'last_name')
+    @field_validator('first_name', 'last_name')
+    @classmethod
     def validate_names(cls, v):
         if v is not None:
-            if not v.strip():
-                raise ValueError('Name cannot be empty or just whitespace')
-            return v.strip().title()
+            return _strip_title(v)
         return v
 
 class AgentUpdate(BaseModel):
     """Schema for agent profile update."""
     first_name: Optional[str] = Field(None, min_length=1, max_length=100)
     last_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    phone: Optional[str] = Field(None, min_length=10, max_length=20)
+    phone: Optional[Phone] = None
     badge_number: Optional[str] = Field(None, max_length=50)
     department: Optional[str] = Field(None, max_length=100)
     is_on_duty: Optional[bool] = None
     
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone(cls, v):
         if v is not None:
             digits_only = re.sub(r'\D', '', v)
@@ -221,12 +233,11 @@ class AgentUpdate(BaseModel):
                 raise ValueError('Phone number must have at least 10 digits')
         return v
     
-    @validator('first_name', 'last_name')
+    @field_validator('first_name', 'last_name')
+    @classmethod
     def validate_names(cls, v):
         if v is not None:
-            if not v.strip():
-                raise ValueError('Name cannot be empty or just whitespace')
-            return v.strip().title()
+            return _strip_title(v)
         return v
 
 class TokenVerification(BaseModel):
@@ -244,30 +255,26 @@ class AuthResponse(BaseModel):
 class SocialLogin(BaseModel):
     """Schema for social media login."""
     provider: AuthProvider
-    access_token: str
+    access_token: str = Field(..., min_length=1)
     device_info: Optional[Dict[str, str]] = None
-    
-    @validator('access_token')
-    def validate_access_token(cls, v):
-        if len(v) < 1:
-            raise ValueError('Access token is required')
-        return v
 
 class TwoFactorSetup(BaseModel):
     """Schema for two-factor authentication setup."""
     method: str  # 'totp', 'sms', 'email'
     phone_number: Optional[str] = None
     
-    @validator('method')
+    @field_validator('method')
+    @classmethod
     def validate_method(cls, v):
         valid_methods = ['totp', 'sms', 'email']
         if v not in valid_methods:
             raise ValueError(f'Method must be one of: {valid_methods}')
         return v
     
-    @validator('phone_number')
-    def validate_phone_number(cls, v, values):
-        if values.get('method') == 'sms' and v is None:
+    @field_validator('phone_number')
+    @classmethod
+    def validate_phone_number(cls, v, info: ValidationInfo):
+        if info.data.get('method') == 'sms' and v is None:
             raise ValueError('Phone number is required for SMS 2FA')
         if v is not None:
             digits_only = ''.join(filter(str.isdigit, v))
@@ -287,19 +294,28 @@ class TwoFactorVerify(BaseModel):
     code: str
     backup_code: Optional[str] = None
     
-    @validator('code')
+    @field_validator('code')
+    @classmethod
     def validate_code(cls, v):
         if v is not None:
-            v = v.strip().replace(' ', '')
-            if len(v) != 6 or not v.isdigit():
+            v = v.strip()
+            # Autofilled codes are already clean; only copy when needed
+            if ' ' in v:
+                v = v.replace(' ', '')
+            if len(v) != 6 or not v.isascii() or not v.isdecimal():
                 raise ValueError('Code must be 6 digits')
         return v
     
-    @validator('backup_code')
+    @field_validator('backup_code')
+    @classmethod
     def validate_backup_code(cls, v):
         if v is not None:
-            v = v.strip().replace(' ', '').replace('-', '')
-            if len(v) != 8 or not v.isalnum():
+            v = v.strip()
+            if ' ' in v:
+                v = v.replace(' ', '')
+            if '-' in v:
+                v = v.replace('-', '')
+            if len(v) != 8 or not v.isascii() or not v.isalnum():
                 raise ValueError('Backup code must be 8 alphanumeric characters')
         return v
 
@@ -315,31 +331,39 @@ class SessionInfo(BaseModel):
     expires_at: datetime
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra='forbid', frozen=True)
+
+_VALID_PERMISSIONS = frozenset({
+    'read:profile', 'write:profile', 'read:alerts', 'write:alerts',
+    'read:geofences', 'write:geofences', 'read:media', 'write:media',
+    'read:analytics', 'admin:users', 'admin:system'
+})
+
+# Built once so session listings skip per-call schema resolution
+_SESSION_LIST_TA = TypeAdapter(List[SessionInfo])
 
 class SessionListResponse(BaseModel):
     """Response schema for session list."""
     sessions: List[SessionInfo]
     current_session_id: UUID
     
+    @classmethod
+    def from_rows(cls, rows, current_session_id: UUID) -> "SessionListResponse":
+        """Build the response from session ORM rows in a single validation pass."""
+        return cls(
+            sessions=_SESSION_LIST_TA.validate_python(rows, from_attributes=True),
+            current_session_id=current_session_id
+        )
+    
 class APIKeyCreate(BaseModel):
     """Schema for creating API keys."""
-    name: str
+    name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
     description: Optional[str] = None
     permissions: List[str] = []
     expires_at: Optional[datetime] = None
     
-    @validator('name')
-    def validate_name(cls, v):
-        v = v.strip()
-        if len(v) < 1:
-            raise ValueError('Name is required')
-        if len(v) > 100:
-            raise ValueError('Name cannot be longer than 100 characters')
-        return v
-    
-    @validator('description')
+    @field_validator('description')
+    @classmethod
     def validate_description(cls, v):
         if v is not None:
             v = v.strip()
@@ -347,16 +371,12 @@ class APIKeyCreate(BaseModel):
                 raise ValueError('Description cannot be longer than 500 characters')
         return v
     
-    @validator('permissions')
+    @field_validator('permissions')
+    @classmethod
     def validate_permissions(cls, v):
-        valid_permissions = [
-            'read:profile', 'write:profile', 'read:alerts', 'write:alerts',
-            'read:geofences', 'write:geofences', 'read:media', 'write:media',
-            'read:analytics', 'admin:users', 'admin:system'
-        ]
-        for permission in v:
-            if permission not in valid_permissions:
-                raise ValueError(f'Invalid permission: {permission}')
+        invalid = set(v) - _VALID_PERMISSIONS
+        if invalid:
+            raise ValueError(f'Invalid permissions: {", ".join(sorted(invalid))}')
         return v
 
 class APIKeyResponse(BaseModel):
@@ -372,8 +392,7 @@ class APIKeyResponse(BaseModel):
     is_active: bool
     usage_count: int = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra='forbid', frozen=True)
 
 class SecurityEvent(BaseModel):
     """Schema for security events."""
@@ -386,7 +405,8 @@ class SecurityEvent(BaseModel):
     timestamp: datetime
     severity: str = 'info'
     
-    @validator('event_type')
+    @field_validator('event_type')
+    @classmethod
     def validate_event_type(cls, v):
         valid_types = [
             'login_success', 'login_failure', 'logout', 'password_change',
@@ -398,12 +418,12 @@ class SecurityEvent(BaseModel):
             raise ValueError(f'Event type must be one of: {valid_types}')
         return v
     
-    @validator('severity')
+    @field_validator('severity')
+    @classmethod
     def validate_severity(cls, v):
         valid_severities = ['info', 'warning', 'error', 'critical']
         if v not in valid_severities:
             raise ValueError(f'Severity must be one of: {valid_severities}')
         return v
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, extra='forbid', frozen=True)
\ No newline at end of file
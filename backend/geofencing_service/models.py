@@ -1,11 +1,51 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, Float, JSON, ForeignKey, Index, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, CHAR, Boolean, DateTime, Text, Integer, SmallInteger, Float, ForeignKey, Index, Enum, Computed, DDL, MetaData, PrimaryKeyConstraint, Table, event, select, FetchedValue
+from sqlalchemy.dialects.postgresql import UUID, JSONB, insert as pg_insert
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
+from sqlalchemy.types import LargeBinary, UserDefinedType
 from backend.database import Base
+from datetime import datetime, timezone
+import json
 import uuid
 import enum
 
+class Geometry(UserDefinedType):
+    """PostGIS ``geometry`` column type.
+    
+    Values are exchanged as WKB so both bind and column expressions are static,
+    which keeps statements using it in SQLAlchemy's compiled cache.
+    """
+    cache_ok = True
+    
+    def __init__(self, geometry_type: str = 'GEOMETRY', srid: int = 4326):
+        self.geometry_type = geometry_type
+        self.srid = srid
+    
+    def get_col_spec(self, **kw):
+        return f"geometry({self.geometry_type},{self.srid})"
+    
+    def bind_processor(self, dialect):
+        def process(value):
+            # Accept shapely geometries as well as raw WKB bytes
+            return getattr(value, "wkb", value)
+        return process
+    
+    def bind_expression(self, bindvalue):
+        return func.ST_SetSRID(func.ST_GeomFromWKB(bindvalue), self.srid)
+    
+    def column_expression(self, col):
+        return func.ST_AsBinary(col, type_=LargeBinary)
+
+class Geography(Geometry):
+    """PostGIS ``geography`` column type, exchanged as WKB like ``Geometry``."""
+    cache_ok = True
+    
+    def get_col_spec(self, **kw):
+        return f"geography({self.geometry_type},{self.srid})"
+    
+    def bind_expression(self, bindvalue):
+        return func.ST_GeogFromWKB(bindvalue)
+
 class GeofenceType(enum.Enum):
     """Geofence type enumeration."""
     SAFE_ZONE = "safe_zone"
@@ -36,27 +76,70 @@ class GeofenceEventType(enum.Enum):
     DWELL = "dwell"
     BREACH = "breach"
 
+class NetworkType(enum.Enum):
+    """Device network type enumeration."""
+    WIFI = "wifi"
+    CELLULAR = "cellular"
+    OFFLINE = "offline"
+
+def _enum_values(enum_cls):
+    """Persist enum values (e.g. 'active') rather than member names as labels."""
+    return [member.value for member in enum_cls]
+
+# Native PostgreSQL ENUM types, shared by every column that uses them
+geofence_type_enum = Enum(GeofenceType, name="geofence_type", values_callable=_enum_values)
+geofence_status_enum = Enum(GeofenceStatus, name="geofence_status", values_callable=_enum_values)
+geofence_shape_enum = Enum(GeofenceShape, name="geofence_shape", values_callable=_enum_values)
+geofence_event_type_enum = Enum(GeofenceEventType, name="geofence_event_type", values_callable=_enum_values)
+network_type_enum = Enum(NetworkType, name="network_type", values_callable=_enum_values)
+
+def geofence_geometry(shape, coordinates=None, center_latitude=None, center_longitude=None, radius=None):
+    """Build the SQL expression that populates ``Geofence.geom`` from a shape definition.
+
+    Circles are buffered on the geography type so ``radius`` is in meters;
+    polygons and rectangles are built from their ``(lat, lng)`` vertex list.
+    All values are bound as parameters.
+    """
+    if GeofenceShape(shape) == GeofenceShape.CIRCLE:
+        center = func.ST_SetSRID(func.ST_MakePoint(center_longitude, center_latitude), 4326)
+        return func.ST_Buffer(center.cast(Geography), radius).cast(Geometry)
+    
+    ring = [(lng, lat) for lat, lng in coordinates]
+    if ring[0] != ring[-1]:
+        ring.append(ring[0])
+    geojson = {"type": "Polygon", "coordinates": [ring]}
+    return func.ST_SetSRID(func.ST_GeomFromGeoJSON(json.dumps(geojson)), 4326)
+
 class Geofence(Base):
     """Geofence model for storing geofence definitions."""
     __tablename__ = "geofences"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # Reference to user service
     
     # Basic information
     name = Column(String(100), nullable=False)
     description = Column(Text)
-    geofence_type = Column(Enum(GeofenceType), nullable=False, index=True)
-    status = Column(Enum(GeofenceStatus), default=GeofenceStatus.ACTIVE, nullable=False, index=True)
+    geofence_type = Column(geofence_type_enum, nullable=False)
+    status = Column(geofence_status_enum, default=GeofenceStatus.ACTIVE, nullable=False)
     
     # Geometry
-    shape = Column(Enum(GeofenceShape), nullable=False)
-    coordinates = Column(JSON, nullable=False)  # Coordinates based on shape
-    radius = Column(Float)  # For circle geofences (in meters)
+    shape = Column(geofence_shape_enum, nullable=False)
+    coordinates = Column(JSONB, nullable=False)  # Coordinates based on shape
+    radius = Column(Float)  # For circle geofences (in meters, informational; geom is authoritative)
+    
+    # Boundary geometry used for all containment/proximity checks
+    geom = Column(Geometry(geometry_type='GEOMETRY', srid=4326), nullable=False)
     
-    # Center point (for indexing and quick distance calculations)
-    center_latitude = Column(Float, nullable=False, index=True)
-    center_longitude = Column(Float, nullable=False, index=True)
+    # Center point (kept for display; spatial queries go through geom)
+    center_latitude = Column(Float, nullable=False)
+    center_longitude = Column(Float, nullable=False)
+    
+    # Bounding box of geom; update_location rejects fixes outside it before any polygon math
+    min_lat = Column(Float, Computed("ST_YMin(geom)", persisted=True), nullable=False)
+    max_lat = Column(Float, Computed("ST_YMax(geom)", persisted=True), nullable=False)
+    min_lon = Column(Float, Computed("ST_XMin(geom)", persisted=True), nullable=False)
+    max_lon = Column(Float, Computed("ST_XMax(geom)", persisted=True), nullable=False)
     
     # Address information
     address = Column(Text)
@@ -69,7 +152,7 @@ class Geofence(Base):
     trigger_on_enter = Column(Boolean, default=True, nullable=False)
     trigger_on_exit = Column(Boolean, default=True, nullable=False)
     trigger_on_dwell = Column(Boolean, default=False, nullable=False)
-    dwell_time_minutes = Column(Integer, default=5)  # Minutes to trigger dwell event
+    dwell_time_minutes = Column(SmallInteger, default=5)  # Minutes to trigger dwell event
     
     # Notification settings
     notify_user = Column(Boolean, default=True, nullable=False)
@@ -78,7 +161,7 @@ class Geofence(Base):
     
     # Schedule settings
     is_scheduled = Column(Boolean, default=False, nullable=False)
-    schedule_config = Column(JSON)  # Schedule configuration
+    schedule_config = Column(JSONB)  # Schedule configuration
     
     # Validity period
     valid_from = Column(DateTime(timezone=True))
@@ -88,19 +171,16 @@ class Geofence(Base):
     monitoring_enabled = Column(Boolean, default=True, nullable=False)
     sensitivity_level = Column(String(20), default='medium')  # 'low', 'medium', 'high'
     
-    # Statistics
-    total_entries = Column(Integer, default=0, nullable=False)
-    total_exits = Column(Integer, default=0, nullable=False)
-    total_dwells = Column(Integer, default=0, nullable=False)
-    last_triggered = Column(DateTime(timezone=True))
+    # Statistics live in the geofence_stats materialized view
     
     # Metadata
-    tags = Column(JSON)  # Tags for categorization
-    metadata = Column(JSON)  # Additional metadata
+    tags = Column(JSONB)  # Tags for categorization
+    # "metadata" is reserved on declarative classes; keep it as the column name only
+    extra_metadata = Column('metadata', JSONB, default=dict, nullable=False)  # Additional metadata
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Relationships
     events = relationship("GeofenceEvent", back_populates="geofence", cascade="all, delete-orphan")
@@ -108,46 +188,58 @@ class Geofence(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_geofence_user_status', 'user_id', 'status'),
+        Index('idx_geofence_active', 'user_id', postgresql_where=text("status = 'active' AND monitoring_enabled")),
         Index('idx_geofence_type_status', 'geofence_type', 'status'),
-        Index('idx_geofence_center', 'center_latitude', 'center_longitude'),
         Index('idx_geofence_validity', 'valid_from', 'valid_until'),
-        Index('idx_geofence_monitoring', 'monitoring_enabled', 'status'),
+        Index('idx_geofence_geom_spgist', 'geom', postgresql_using='spgist'),
+        Index('idx_geofence_tags_gin', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}),
+        Index('idx_geofence_schedule_gin', 'schedule_config', postgresql_using='gin', postgresql_ops={'schedule_config': 'jsonb_path_ops'}),
     )
     
     def __repr__(self):
         return f"<Geofence(id={self.id}, name={self.name}, type={self.geofence_type.value}, user_id={self.user_id})>"
 
+# Spatial types require PostGIS in the target database
+event.listen(
+    Geofence.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS postgis")
+)
+
 class GeofenceEvent(Base):
     """Geofence event model for storing geofence trigger events."""
     __tablename__ = "geofence_events"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    geofence_id = Column(UUID(as_uuid=True), ForeignKey("geofences.id", ondelete="CASCADE"), nullable=False, index=True)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    geofence_id = Column(UUID(as_uuid=True), ForeignKey("geofences.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Event details
-    event_type = Column(Enum(GeofenceEventType), nullable=False, index=True)
+    event_type = Column(geofence_event_type_enum, nullable=False)
     
     # Location information
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     accuracy = Column(Float)  # Location accuracy in meters
+    geom = Column(
+        Geometry(geometry_type='POINT', srid=4326),
+        Computed("ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)", persisted=True)
+    )
     
     # Distance from geofence boundary
     distance_from_boundary = Column(Float)  # Distance in meters (negative = inside, positive = outside)
     
     # Device information
     device_id = Column(String(255))
-    battery_level = Column(Integer)
-    network_type = Column(String(20))  # 'wifi', 'cellular', 'offline'
+    battery_level = Column(SmallInteger)  # 0-100
+    network_type = Column(network_type_enum)
     
-    # Timing information
-    event_timestamp = Column(DateTime(timezone=True), nullable=False, index=True)
+    # Timing information (partition key, hence part of the primary key)
+    event_timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     dwell_duration_minutes = Column(Integer)  # For dwell events
     
     # Processing information
-    processed = Column(Boolean, default=False, nullable=False, index=True)
+    processed = Column(Boolean, default=False, nullable=False)
     processed_at = Column(DateTime(timezone=True))
     processing_error = Column(Text)
     
@@ -156,37 +248,144 @@ class GeofenceEvent(Base):
     notification_count = Column(Integer, default=0, nullable=False)
     
     # Additional context
-    metadata = Column(JSON)
+    extra_metadata = Column('metadata', JSONB, default=dict, nullable=False)
     
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Timestamps (set client-side so batched inserts need no RETURNING round-trip)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     
     # Relationships
     geofence = relationship("Geofence", back_populates="events")
-    notifications = relationship("GeofenceNotification", back_populates="event", cascade="all, delete-orphan")
+    notifications = relationship(
+        "GeofenceNotification",
+        back_populates="event",
+        primaryjoin="GeofenceEvent.id == foreign(GeofenceNotification.event_id)",
+        cascade="all, delete-orphan"
+    )
     
     # Indexes
     __table_args__ = (
         Index('idx_event_geofence_type', 'geofence_id', 'event_type'),
         Index('idx_event_user_timestamp', 'user_id', 'event_timestamp'),
-        Index('idx_event_timestamp', 'event_timestamp'),
-        Index('idx_event_processed', 'processed', 'created_at'),
-        Index('idx_event_location', 'latitude', 'longitude'),
+        # Recent-event lookup in update_location; event_type included for an index-only scan
+        Index(
+            'idx_event_user_geofence_created', 'user_id', 'geofence_id', text('created_at DESC'),
+            postgresql_include=['event_type']
+        ),
+        Index('idx_event_ts_brin', 'event_timestamp', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        Index(
+            'idx_event_unprocessed_covering', 'created_at',
+            postgresql_where=text("processed = false"),
+            postgresql_include=['id', 'geofence_id', 'user_id', 'event_type', 'latitude', 'longitude']
+        ),
+        Index('idx_event_geom_spgist', 'geom', postgresql_using='spgist'),
+        {'postgresql_partition_by': 'RANGE (event_timestamp)'},
     )
     
     def __repr__(self):
         return f"<GeofenceEvent(id={self.id}, geofence_id={self.geofence_id}, type={self.event_type.value})>"
 
+# Monthly partitions for geofence_events. create_geofence_events_partition()
+# should be run ahead of each month (e.g. from pg_cron); the default partition
+# only catches rows that arrive before their month has been created.
+for _statement in (
+    """
+    CREATE OR REPLACE FUNCTION create_geofence_events_partition(month_start date) RETURNS void AS $$
+    DECLARE
+        start_ts date := date_trunc('month', month_start);
+        end_ts date := (date_trunc('month', month_start) + interval '1 month')::date;
+    BEGIN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %%I PARTITION OF geofence_events FOR VALUES FROM (%%L) TO (%%L)',
+            'geofence_events_' || to_char(start_ts, 'YYYY_MM'), start_ts, end_ts
+        );
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "SELECT create_geofence_events_partition(current_date)",
+    "SELECT create_geofence_events_partition((current_date + interval '1 month')::date)",
+    "CREATE TABLE IF NOT EXISTS geofence_events_default PARTITION OF geofence_events DEFAULT",
+):
+    event.listen(GeofenceEvent.__table__, "after_create", DDL(_statement))
+
+# Cold storage for processed events past the retention window. It mirrors the
+# geofence_events columns (geom as a plain column) so ARCHIVE_GEOFENCE_EVENTS
+# can move rows with SELECT *; rows are never updated, so pages are packed full.
+for _statement in (
+    """
+    CREATE TABLE IF NOT EXISTS geofence_events_archive (LIKE geofence_events)
+        WITH (fillfactor = 100, toast_tuple_target = 128)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_event_archive_ts_brin ON geofence_events_archive
+        USING brin (event_timestamp) WITH (pages_per_range = 32)
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_event_archive_user_timestamp ON geofence_events_archive (user_id, event_timestamp)",
+):
+    event.listen(GeofenceEvent.__table__, "after_create", DDL(_statement))
+
+# Run every GEOFENCE_ARCHIVE_INTERVAL by the app lifespan; moves processed events
+# older than :retention_days in one statement
+ARCHIVE_GEOFENCE_EVENTS = text("""
+    WITH moved AS (
+        DELETE FROM geofence_events
+        WHERE processed AND event_timestamp < now() - make_interval(days => :retention_days)
+        RETURNING *
+    )
+    INSERT INTO geofence_events_archive SELECT * FROM moved
+""")
+
+# Per-geofence trigger counters, aggregated from geofence_events instead of
+# being incremented on the geofence row by every event
+event.listen(
+    GeofenceEvent.__table__,
+    "after_create",
+    DDL("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS geofence_stats AS
+        SELECT
+            geofence_id,
+            count(*) FILTER (WHERE event_type = 'enter') AS total_entries,
+            count(*) FILTER (WHERE event_type = 'exit') AS total_exits,
+            count(*) FILTER (WHERE event_type = 'dwell') AS total_dwells,
+            max(event_timestamp) AS last_triggered
+        FROM (
+            SELECT geofence_id, event_type, event_timestamp FROM geofence_events
+            UNION ALL
+            SELECT geofence_id, event_type, event_timestamp FROM geofence_events_archive
+        ) AS all_events
+        GROUP BY geofence_id
+    """)
+)
+event.listen(
+    GeofenceEvent.__table__,
+    "after_create",
+    DDL("CREATE UNIQUE INDEX IF NOT EXISTS idx_geofence_stats_geofence ON geofence_stats (geofence_id)")
+)
+
+# Read-only mapping of the view; kept off Base.metadata so create_all skips it
+geofence_stats = Table(
+    "geofence_stats",
+    MetaData(),
+    Column("geofence_id", UUID(as_uuid=True), primary_key=True),
+    Column("total_entries", Integer, nullable=False),
+    Column("total_exits", Integer, nullable=False),
+    Column("total_dwells", Integer, nullable=False),
+    Column("last_triggered", DateTime(timezone=True)),
+)
+
+# Run every GEOFENCE_STATS_REFRESH_INTERVAL by the app lifespan; CONCURRENTLY relies on the unique index
+REFRESH_GEOFENCE_STATS = text("REFRESH MATERIALIZED VIEW CONCURRENTLY geofence_stats")
+
 class GeofenceNotification(Base):
     """Geofence notification model for tracking sent notifications."""
     __tablename__ = "geofence_notifications"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    geofence_id = Column(UUID(as_uuid=True), ForeignKey("geofences.id", ondelete="CASCADE"), nullable=False, index=True)
-    event_id = Column(UUID(as_uuid=True), ForeignKey("geofence_events.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    geofence_id = Column(UUID(as_uuid=True), ForeignKey("geofences.id", ondelete="CASCADE"), nullable=False)
+    # No FK constraint: geofence_events is partitioned and its key includes event_timestamp
+    event_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Notification details
-    notification_type = Column(String(20), nullable=False, index=True)  # 'sms', 'email', 'push', 'call'
+    notification_type = Column(String(20), nullable=False)  # 'sms', 'email', 'push', 'call'
     recipient_type = Column(String(20), nullable=False)  # 'user', 'emergency_contact'
     recipient_id = Column(UUID(as_uuid=True))  # ID of the recipient
     recipient_identifier = Column(String(255), nullable=False)  # Phone, email, etc.
@@ -197,7 +396,7 @@ class GeofenceNotification(Base):
     
     # Delivery status
     status = Column(String(20), default='pending', nullable=False, index=True)  # 'pending', 'sent', 'delivered', 'failed'
-    delivery_attempts = Column(Integer, default=0, nullable=False)
+    delivery_attempts = Column(SmallInteger, default=0, nullable=False)
     
     # External references
     external_message_id = Column(String(255))  # Provider's message ID
@@ -214,13 +413,21 @@ class GeofenceNotification(Base):
     
     # Relationships
     geofence = relationship("Geofence", back_populates="notifications")
-    event = relationship("GeofenceEvent", back_populates="notifications")
+    event = relationship(
+        "GeofenceEvent",
+        back_populates="notifications",
+        primaryjoin="foreign(GeofenceNotification.event_id) == GeofenceEvent.id"
+    )
     
     # Indexes
     __table_args__ = (
         Index('idx_notification_geofence_type', 'geofence_id', 'notification_type'),
         Index('idx_notification_event_status', 'event_id', 'status'),
-        Index('idx_notification_status', 'status', 'created_at'),
+        Index(
+            'idx_notification_pending_covering', 'created_at',
+            postgresql_where=text("status = 'pending'"),
+            postgresql_include=['id', 'recipient_identifier', 'notification_type']
+        ),
         Index('idx_notification_recipient', 'recipient_type', 'recipient_id'),
     )
     
@@ -231,23 +438,23 @@ class GeofenceTemplate(Base):
     """Geofence template model for predefined geofence configurations."""
     __tablename__ = "geofence_templates"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Template information
-    name = Column(String(100), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
     description = Column(Text)
-    category = Column(String(50), nullable=False, index=True)  # 'safety', 'work', 'family', 'custom'
-    geofence_type = Column(Enum(GeofenceType), nullable=False, index=True)
+    category = Column(String(50), nullable=False)  # 'safety', 'work', 'family', 'custom'
+    geofence_type = Column(geofence_type_enum, nullable=False)
     
     # Default configuration
-    default_shape = Column(Enum(GeofenceShape), nullable=False)
+    default_shape = Column(geofence_shape_enum, nullable=False)
     default_radius = Column(Float)  # Default radius for circle templates
-    default_settings = Column(JSON, nullable=False)  # Default geofence settings
+    default_settings = Column(JSONB, nullable=False)  # Default geofence settings
     
     # Template metadata
     icon = Column(String(100))  # Icon identifier
-    color = Column(String(7))   # Hex color code
-    tags = Column(JSON)         # Template tags
+    color = Column(CHAR(7))   # Hex color code
+    tags = Column(JSONB)          # Template tags
     
     # Availability
     is_active = Column(Boolean, default=True, nullable=False)
@@ -259,31 +466,33 @@ class GeofenceTemplate(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Indexes
     __table_args__ = (
         Index('idx_template_category_active', 'category', 'is_active'),
         Index('idx_template_type_active', 'geofence_type', 'is_active'),
         Index('idx_template_usage', 'usage_count', 'last_used'),
+        Index('idx_template_tags_gin', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}),
     )
     
     def __repr__(self):
         return f"<GeofenceTemplate(id={self.id}, name={self.name}, category={self.category})>"
 
+# Scope value for analytics rows that are not tied to a single user/geofence
+ANALYTICS_ALL_SCOPE = uuid.UUID(int=0)
+
 class GeofenceAnalytics(Base):
     """Geofence analytics model for storing aggregated geofence statistics."""
     __tablename__ = "geofence_analytics"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    
     # Analytics period
-    analytics_date = Column(DateTime(timezone=True), nullable=False, index=True)
-    analytics_type = Column(String(20), nullable=False, index=True)  # 'daily', 'weekly', 'monthly'
+    analytics_date = Column(DateTime(timezone=True), nullable=False)
+    analytics_type = Column(String(20), nullable=False)  # 'daily', 'weekly', 'monthly'
     
-    # Scope
-    user_id = Column(UUID(as_uuid=True), index=True)  # NULL for system-wide analytics
-    geofence_id = Column(UUID(as_uuid=True), index=True)  # NULL for user-wide analytics
+    # Scope (ANALYTICS_ALL_SCOPE instead of NULL, so the natural key can be the PK)
+    user_id = Column(UUID(as_uuid=True), default=ANALYTICS_ALL_SCOPE, nullable=False)  # sentinel for system-wide analytics
+    geofence_id = Column(UUID(as_uuid=True), default=ANALYTICS_ALL_SCOPE, nullable=False)  # sentinel for user-wide analytics
     
     # Event counts
     total_events = Column(Integer, default=0, nullable=False)
@@ -299,8 +508,8 @@ class GeofenceAnalytics(Base):
     
     # Frequency analytics
     unique_entries = Column(Integer, default=0, nullable=False)
-    most_active_hour = Column(Integer)  # Hour of day (0-23)
-    most_active_day = Column(Integer)   # Day of week (0-6)
+    most_active_hour = Column(SmallInteger)  # Hour of day (0-23)
+    most_active_day = Column(SmallInteger)   # Day of week (0-6)
     
     # Notification analytics
     notifications_sent = Column(Integer, default=0, nullable=False)
@@ -312,24 +521,46 @@ class GeofenceAnalytics(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Indexes
     __table_args__ = (
-        Index('idx_analytics_date_type', 'analytics_date', 'analytics_type'),
-        Index('idx_analytics_user_date', 'user_id', 'analytics_date'),
-        Index('idx_analytics_geofence_date', 'geofence_id', 'analytics_date'),
+        PrimaryKeyConstraint('analytics_type', 'analytics_date', 'user_id', 'geofence_id', name='pk_geofence_analytics'),
+        Index('idx_analytics_date_brin', 'analytics_date', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
     
     def __repr__(self):
-        return f"<GeofenceAnalytics(id={self.id}, date={self.analytics_date}, type={self.analytics_type})>"
+        return f"<GeofenceAnalytics(type={self.analytics_type}, date={self.analytics_date}, user_id={self.user_id}, geofence_id={self.geofence_id})>"
+
+# Counters that an incremental rollup adds to instead of overwriting
+_ANALYTICS_COUNTERS = (
+    'total_events', 'enter_events', 'exit_events', 'dwell_events', 'breach_events',
+    'unique_entries', 'notifications_sent', 'processing_errors',
+)
+
+def upsert_geofence_analytics(rows):
+    """Build an upsert that merges rollup rows into ``geofence_analytics``.
+    
+    Conflicts on the natural key add the counters and take the latest value
+    for the other supplied columns, so repeated rollups never create
+    duplicates. Columns the rows don't supply are left untouched.
+    """
+    stmt = pg_insert(GeofenceAnalytics).values(rows)
+    table = GeofenceAnalytics.__table__
+    key = {col.name for col in table.primary_key.columns} | {'created_at'}
+    updates = {
+        name: table.c[name] + stmt.excluded[name]
+        if name in _ANALYTICS_COUNTERS else stmt.excluded[name]
+        for name in rows[0] if name not in key
+    }
+    return stmt.on_conflict_do_update(constraint='pk_geofence_analytics', set_=updates)
 
 class GeofenceImportJob(Base):
     """Geofence import job model for tracking bulk geofence imports."""
     __tablename__ = "geofence_import_jobs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Job information
     job_name = Column(String(100), nullable=False)
@@ -339,7 +570,7 @@ class GeofenceImportJob(Base):
     
     # Processing status
     status = Column(String(20), default='pending', nullable=False, index=True)  # 'pending', 'processing', 'completed', 'failed'
-    progress_percentage = Column(Integer, default=0, nullable=False)
+    progress_percentage = Column(SmallInteger, default=0, nullable=False)
     
     # Results
     total_records = Column(Integer, default=0, nullable=False)
@@ -349,7 +580,7 @@ class GeofenceImportJob(Base):
     
     # Error tracking
     error_message = Column(Text)
-    error_details = Column(JSON)  # Detailed error information
+    error_details = Column(JSONB)  # Detailed error information
     
     # File paths
     input_file_path = Column(String(500), nullable=False)
@@ -364,6 +595,7 @@ class GeofenceImportJob(Base):
     __table_args__ = (
         Index('idx_import_user_status', 'user_id', 'status'),
         Index('idx_import_status_created', 'status', 'created_at'),
+        Index('idx_import_error_details_gin', 'error_details', postgresql_using='gin', postgresql_ops={'error_details': 'jsonb_path_ops'}),
     )
     
     def __repr__(self):
@@ -373,10 +605,10 @@ class GeofenceShare(Base):
     """Geofence share model for sharing geofences between users."""
     __tablename__ = "geofence_shares"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    geofence_id = Column(UUID(as_uuid=True), ForeignKey("geofences.id", ondelete="CASCADE"), nullable=False, index=True)
-    owner_user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    shared_with_user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    geofence_id = Column(UUID(as_uuid=True), ForeignKey("geofences.id", ondelete="CASCADE"), nullable=False)
+    owner_user_id = Column(UUID(as_uuid=True), nullable=False)
+    shared_with_user_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Share permissions
     can_view = Column(Boolean, default=True, nullable=False)
@@ -397,7 +629,7 @@ class GeofenceShare(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Relationships
     geofence = relationship("Geofence")
@@ -407,6 +639,7 @@ class GeofenceShare(Base):
         Index('idx_share_geofence_status', 'geofence_id', 'status'),
         Index('idx_share_owner_shared', 'owner_user_id', 'shared_with_user_id'),
         Index('idx_share_shared_with', 'shared_with_user_id', 'status'),
+        Index('idx_share_pending', 'shared_with_user_id', postgresql_where=text("status = 'pending'")),
         Index('idx_share_expiry', 'share_expiry', 'status'),
     )
     
@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from sqlalchemy.dialects.postgresql import JSONB
+from collections import OrderedDict
+from typing import List, Literal, Optional, Tuple
+from types import SimpleNamespace
 from uuid import UUID
 from datetime import datetime
+import base64
+import json
+import time
+import redis.asyncio as redis
 
-from shared.database import get_db_session
+from backend.database import AsyncSessionLocal
+from shared.database import get_db_session, get_redis, RedisKeys
 from auth_service.models import get_current_user, User
 from .schemas import (
     GeofenceCreate,
@@ -13,477 +22,689 @@ from .schemas import (
     GeofenceListResponse,
     LocationUpdate,
     GeofenceEventResponse,
+    GeofenceEventListResponse,
     GeofenceAnalyticsResponse
 )
-from .models import Geofence, GeofenceEvent, GeofenceType, EventType
-from shared.kafka_client import publish_geofence_event
-from shared.location import calculate_distance, get_location_info
+from .models import (
+    Geofence,
+    GeofenceEvent,
+    GeofenceAnalytics,
+    GeofenceType,
+    GeofenceStatus,
+    GeofenceShape,
+    GeofenceEventType as EventType,
+    ANALYTICS_ALL_SCOPE,
+    geofence_geometry,
+    geofence_stats,
+    upsert_geofence_analytics
+)
+from shared.kafka_client import publish_geofence_event, publish_geofence_events_batch
+from shared.location import GeofenceMatcher, calculate_distance, get_location_info
+from shared.geometry import pack_coordinates
 
 router = APIRouter()
 
-@router.post("/", response_model=GeofenceResponse, status_code=status.HTTP_201_CREATED)
+# Active geofences per user are cached for update_location, which only needs
+# the columns GeofenceMatcher and the event rows read
+_GEOFENCE_CACHE_TTL = 3600
+_MATCH_GEOFENCE_COLUMNS = (
+    Geofence.id,
+    Geofence.name,
+    Geofence.geofence_type,
+    Geofence.shape,
+    Geofence.geom,
+    Geofence.center_latitude,
+    Geofence.center_longitude,
+    Geofence.radius,
+    Geofence.trigger_on_enter,
+    Geofence.trigger_on_exit,
+    Geofence.min_lat,
+    Geofence.max_lat,
+    Geofence.min_lon,
+    Geofence.max_lon
+)
+
+def _geofence_to_cache(geofence: SimpleNamespace) -> dict:
+    entry = dict(vars(geofence))
+    entry['id'] = str(geofence.id)
+    entry['geofence_type'] = geofence.geofence_type.value
+    entry['shape'] = geofence.shape.value
+    entry['geom'] = base64.b64encode(geofence.geom).decode('ascii')
+    return entry
+
+def _geofence_from_cache(entry: dict) -> SimpleNamespace:
+    entry['id'] = UUID(entry['id'])
+    entry['geofence_type'] = GeofenceType(entry['geofence_type'])
+    entry['shape'] = GeofenceShape(entry['shape'])
+    entry['geom'] = base64.b64decode(entry['geom'])
+    return SimpleNamespace(**entry)
+
+def _bbox_contains(geofence: SimpleNamespace, latitude: float, longitude: float) -> bool:
+    """Return False when the point is certainly outside the geofence's bounding box."""
+    return (
+        geofence.min_lat <= latitude <= geofence.max_lat
+        and geofence.min_lon <= longitude <= geofence.max_lon
+    )
+
+def _distance_from_boundary(geofence: SimpleNamespace, latitude: float, longitude: float) -> Optional[float]:
+    """Signed distance in meters from a circle's edge (negative = inside); None for other shapes."""
+    if geofence.shape != GeofenceShape.CIRCLE:
+        return None
+    return calculate_distance(latitude, longitude, geofence.center_latitude, geofence.center_longitude) - geofence.radius
+
+# Location fixes closer than this to the user's last checked fix, in both space
+# and time, can't have changed any geofence state and are acknowledged directly
+_LOCATION_DEBOUNCE_METERS = 10
+_LOCATION_DEBOUNCE_SECONDS = 2
+_LOCATION_DEBOUNCE_MAX_USERS = 10000
+# user_id -> (monotonic time, lat, lon), oldest check first
+_last_checked_locations: "OrderedDict[UUID, Tuple[float, float, float]]" = OrderedDict()
+
+def _remember_checked_location(user_id: UUID, checked_at: float, latitude: float, longitude: float) -> None:
+    """Record a user's last checked fix, dropping entries past the debounce window or over the size cap."""
+    _last_checked_locations[user_id] = (checked_at, latitude, longitude)
+    _last_checked_locations.move_to_end(user_id)
+    while _last_checked_locations:
+        oldest_at = next(iter(_last_checked_locations.values()))[0]
+        if checked_at - oldest_at < _LOCATION_DEBOUNCE_SECONDS and len(_last_checked_locations) <= _LOCATION_DEBOUNCE_MAX_USERS:
+            break
+        _last_checked_locations.popitem(last=False)
+
+# GeofenceUpdate fields that map one-to-one onto a column update_geofence may change
+_UPDATABLE_GEOFENCE_COLUMNS = {
+    'name': 'name',
+    'description': 'description',
+    'radius_meters': 'radius',
+    'coordinates': 'coordinates',
+    'send_notifications': 'notify_user'
+}
+
+# Column lists for the read endpoints, labelled with the response field names
+# so rows map straight onto the response models without ORM objects
+_GEOFENCE_RESPONSE_COLUMNS = (
+    Geofence.id,
+    Geofence.user_id,
+    Geofence.name,
+    Geofence.description,
+    Geofence.geofence_type,
+    Geofence.shape,
+    Geofence.center_latitude,
+    Geofence.center_longitude,
+    Geofence.radius.label("radius_meters"),
+    Geofence.coordinates,
+    (Geofence.status == GeofenceStatus.ACTIVE).label("is_active"),
+    Geofence.notify_user.label("send_notifications"),
+    Geofence.trigger_on_enter,
+    Geofence.trigger_on_exit,
+    Geofence.trigger_on_dwell,
+    Geofence.address,
+    Geofence.created_at,
+    Geofence.updated_at,
+    Geofence.extra_metadata.label("metadata")
+)
+_EVENT_RESPONSE_COLUMNS = (
+    GeofenceEvent.id,
+    GeofenceEvent.user_id,
+    GeofenceEvent.geofence_id,
+    Geofence.name.label("geofence_name"),
+    GeofenceEvent.event_type,
+    GeofenceEvent.latitude,
+    GeofenceEvent.longitude,
+    GeofenceEvent.accuracy,
+    GeofenceEvent.event_timestamp.label("timestamp"),
+    (GeofenceEvent.dwell_duration_minutes * 60).label("duration_seconds"),
+    GeofenceEvent.created_at,
+    GeofenceEvent.extra_metadata.label("metadata")
+)
+
+def _geofence_stats_columns():
+    """Trigger counters for ``_GEOFENCE_RESPONSE_COLUMNS`` from the geofence_stats view.
+    
+    Correlated scalar subqueries rather than a join, so they work in
+    UPDATE ... RETURNING as well as in SELECT.
+    """
+    stats = geofence_stats.c
+    own_row = stats.geofence_id == Geofence.id
+    return (
+        select(stats.last_triggered).where(own_row).scalar_subquery().label("last_triggered"),
+        func.coalesce(
+            select(stats.total_entries + stats.total_exits + stats.total_dwells).where(own_row).scalar_subquery(),
+            0
+        ).label("trigger_count")
+    )
+
+# Trigger columns folded into GeofenceResponse.notification_events
+_NOTIFICATION_TRIGGERS = (
+    (EventType.ENTER, 'trigger_on_enter'),
+    (EventType.EXIT, 'trigger_on_exit'),
+    (EventType.DWELL, 'trigger_on_dwell')
+)
+
+# The read endpoints return ORJSONResponse bodies built from these instead of
+# declaring response_model, so FastAPI doesn't validate rows that were
+# validated on write. The models are still listed in responses= for OpenAPI.
+_GEOFENCE_RESPONSE_DEFAULTS = {'coordinates_blob': None, 'last_triggered': None, 'trigger_count': 0}
+
+def _geofence_response(row, **overrides) -> dict:
+    """Build a GeofenceResponse body from a ``_GEOFENCE_RESPONSE_COLUMNS`` row."""
+    fields = {**_GEOFENCE_RESPONSE_DEFAULTS, **row}
+    fields['notification_events'] = [
+        event_type.value for event_type, trigger in _NOTIFICATION_TRIGGERS if fields.pop(trigger)
+    ]
+    fields['geofence_type'] = fields['geofence_type'].value
+    fields['shape'] = fields['shape'].value
+    fields.update(overrides)
+    return fields
+
+def _event_response(row) -> dict:
+    """Build a GeofenceEventResponse body from an ``_EVENT_RESPONSE_COLUMNS`` row."""
+    fields = {'address': None, **row}
+    del fields['created_at']  # pagination cursor only
+    fields['event_type'] = fields['event_type'].value
+    return fields
+
+# Keyset pagination cursors: opaque base64 of the last row's (created_at, id)
+def _encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id.hex}".encode()).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(hex=row_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+@router.post("/", status_code=status.HTTP_201_CREATED, responses={status.HTTP_201_CREATED: {"model": GeofenceResponse}})
 async def create_geofence(
     geofence_data: GeofenceCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session)
+    redis_client: redis.Redis = Depends(get_redis)
 ):
-    """Create a new geofence (safe zone or restricted area)."""
-    try:
-        # Check if user already has maximum geofences (limit to 10)
+    """Create a new geofence (safe zone or restricted area).
+    
+    The geocoder call runs between two short sessions rather than holding a
+    pooled connection for its duration.
+    """
+    # Check if user already has maximum geofences (limit to 10)
+    async with AsyncSessionLocal() as db:
         result = await db.execute(
             select(func.count(Geofence.id)).where(
                 Geofence.user_id == current_user.id,
-                Geofence.is_active == True
+                Geofence.status == GeofenceStatus.ACTIVE
             )
         )
         geofence_count = result.scalar()
-        
-        if geofence_count >= 10:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Maximum of 10 active geofences allowed"
-            )
-        
-        # Get location information for the geofence center
-        location_info = await get_location_info(
-            geofence_data.latitude,
-            geofence_data.longitude
+    
+    if geofence_count >= 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum of 10 active geofences allowed"
         )
-        
-        # Create new geofence
-        new_geofence = Geofence(
-            user_id=current_user.id,
-            name=geofence_data.name,
-            description=geofence_data.description,
-            geofence_type=geofence_data.geofence_type,
-            latitude=geofence_data.latitude,
-            longitude=geofence_data.longitude,
-            radius_meters=geofence_data.radius_meters,
-            is_active=geofence_data.is_active,
-            notify_on_enter=geofence_data.notify_on_enter,
-            notify_on_exit=geofence_data.notify_on_exit,
-            metadata={
-                'location_info': location_info,
-                'created_via': 'api'
-            }
+    
+    # Get location information for the geofence center
+    location_info = await get_location_info(
+        geofence_data.center_latitude,
+        geofence_data.center_longitude
+    )
+    
+    async with AsyncSessionLocal() as db:
+        # Create new geofence; RETURNING hands back server defaults without a refresh
+        result = await db.execute(
+            insert(Geofence).values(
+                user_id=current_user.id,
+                name=geofence_data.name,
+                description=geofence_data.description,
+                geofence_type=geofence_data.geofence_type,
+                status=GeofenceStatus.ACTIVE if geofence_data.is_active else GeofenceStatus.INACTIVE,
+                shape=geofence_data.shape,
+                coordinates=geofence_data.coordinates or [],
+                radius=geofence_data.radius_meters,
+                geom=geofence_geometry(
+                    geofence_data.shape,
+                    geofence_data.coordinates,
+                    geofence_data.center_latitude,
+                    geofence_data.center_longitude,
+                    geofence_data.radius_meters
+                ),
+                center_latitude=geofence_data.center_latitude,
+                center_longitude=geofence_data.center_longitude,
+                trigger_on_enter=EventType.ENTER.value in geofence_data.notification_events,
+                trigger_on_exit=EventType.EXIT.value in geofence_data.notification_events,
+                trigger_on_dwell=EventType.DWELL.value in geofence_data.notification_events,
+                notify_user=geofence_data.send_notifications,
+                extra_metadata={
+                    **(geofence_data.metadata or {}),
+                    'location_info': location_info,
+                    'created_via': 'api'
+                }
+            ).returning(*_GEOFENCE_RESPONSE_COLUMNS)
         )
-        
-        db.add(new_geofence)
+        new_geofence = result.mappings().one()
         await db.commit()
-        await db.refresh(new_geofence)
-        
-        # Publish geofence created event
-        await publish_geofence_event({
-            "event_type": "geofence_created",
-            "geofence_id": str(new_geofence.id),
-            "user_id": str(current_user.id),
-            "geofence_name": new_geofence.name,
-            "geofence_type": new_geofence.geofence_type.value,
-            "latitude": new_geofence.latitude,
-            "longitude": new_geofence.longitude,
-            "radius_meters": new_geofence.radius_meters,
-            "is_active": new_geofence.is_active,
-            "timestamp": new_geofence.created_at.isoformat()
-        })
-        
-        return GeofenceResponse(
-            id=new_geofence.id,
-            name=new_geofence.name,
-            description=new_geofence.description,
-            geofence_type=new_geofence.geofence_type,
-            latitude=new_geofence.latitude,
-            longitude=new_geofence.longitude,
-            radius_meters=new_geofence.radius_meters,
-            is_active=new_geofence.is_active,
-            notify_on_enter=new_geofence.notify_on_enter,
-            notify_on_exit=new_geofence.notify_on_exit,
-            created_at=new_geofence.created_at,
-            updated_at=new_geofence.updated_at,
-            metadata=new_geofence.metadata
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create geofence: {str(e)}"
-        )
+    
+    await redis_client.delete(RedisKeys.user_geofences(current_user.id))
+    
+    # Publish geofence created event
+    background_tasks.add_task(publish_geofence_event, {
+        "event_type": "geofence_created",
+        "geofence_id": str(new_geofence["id"]),
+        "user_id": str(current_user.id),
+        "geofence_name": new_geofence["name"],
+        "geofence_type": new_geofence["geofence_type"].value,
+        "latitude": new_geofence["center_latitude"],
+        "longitude": new_geofence["center_longitude"],
+        "radius_meters": new_geofence["radius_meters"],
+        "is_active": new_geofence["is_active"],
+        "timestamp": new_geofence["created_at"].isoformat()
+    })
+    
+    return ORJSONResponse(_geofence_response(new_geofence), status_code=status.HTTP_201_CREATED)
 
-@router.get("/", response_model=GeofenceListResponse)
+@router.get("/", responses={status.HTTP_200_OK: {"model": GeofenceListResponse}})
 async def get_user_geofences(
-    skip: int = 0,
-    limit: int = 20,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     active_only: bool = True,
     geofence_type_filter: Optional[GeofenceType] = None,
+    include_total: bool = False,
+    coordinates_format: Literal['list', 'blob'] = Query('list', alias='format'),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
-    """Get user's geofences with pagination and filtering."""
-    try:
-        # Build query
-        query = select(Geofence).where(Geofence.user_id == current_user.id)
-        
-        if active_only:
-            query = query.where(Geofence.is_active == True)
-        if geofence_type_filter:
-            query = query.where(Geofence.geofence_type == geofence_type_filter)
-        
-        # Get total count
-        count_query = select(func.count(Geofence.id)).where(Geofence.user_id == current_user.id)
-        if active_only:
-            count_query = count_query.where(Geofence.is_active == True)
-        if geofence_type_filter:
-            count_query = count_query.where(Geofence.geofence_type == geofence_type_filter)
-        
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
-        
-        # Get geofences with pagination
-        query = query.order_by(Geofence.created_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        geofences = result.scalars().all()
-        
+    """Get user's geofences with pagination and filtering.
+    
+    ``format=blob`` returns polygon vertices packed in ``coordinates_blob``
+    instead of as a list of pairs.
+    """
+    # Build query
+    query = select(*_GEOFENCE_RESPONSE_COLUMNS, *_geofence_stats_columns()).where(Geofence.user_id == current_user.id)
+    
+    if active_only:
+        query = query.where(Geofence.status == GeofenceStatus.ACTIVE)
+    if geofence_type_filter:
+        query = query.where(Geofence.geofence_type == geofence_type_filter)
+    
+    # Total is only counted on request; pages don't need it
+    total = None
+    if include_total:
+        total = (await db.execute(query.with_only_columns(func.count()))).scalar()
+    
+    # Seek past the cursor instead of scanning and discarding skipped rows
+    if cursor:
+        query = query.where(tuple_(Geofence.created_at, Geofence.id) < tuple_(*_decode_cursor(cursor)))
+    
+    # One extra row tells whether another page follows
+    query = query.order_by(Geofence.created_at.desc(), Geofence.id.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    rows = result.mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more and rows else None
+    
+    if coordinates_format == 'blob':
         geofence_responses = [
-            GeofenceResponse(
-                id=geofence.id,
-                name=geofence.name,
-                description=geofence.description,
-                geofence_type=geofence.geofence_type,
-                latitude=geofence.latitude,
-                longitude=geofence.longitude,
-                radius_meters=geofence.radius_meters,
-                is_active=geofence.is_active,
-                notify_on_enter=geofence.notify_on_enter,
-                notify_on_exit=geofence.notify_on_exit,
-                created_at=geofence.created_at,
-                updated_at=geofence.updated_at,
-                metadata=geofence.metadata
+            _geofence_response(
+                row,
+                coordinates=None,
+                coordinates_blob=base64.b64encode(pack_coordinates(row['coordinates'])).decode()
+                if row['coordinates'] else None
             )
-            for geofence in geofences
+            for row in rows
         ]
-        
-        return GeofenceListResponse(
-            geofences=geofence_responses,
-            total=total,
-            skip=skip,
-            limit=limit
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve geofences: {str(e)}"
-        )
+    else:
+        geofence_responses = [_geofence_response(row) for row in rows]
+    
+    return ORJSONResponse({
+        "geofences": geofence_responses,
+        "total": total,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": next_cursor
+    })
 
-@router.get("/{geofence_id}", response_model=GeofenceResponse)
+@router.get("/{geofence_id}", responses={status.HTTP_200_OK: {"model": GeofenceResponse}})
 async def get_geofence(
     geofence_id: UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
     """Get a specific geofence by ID."""
-    try:
-        result = await db.execute(
-            select(Geofence).where(
-                Geofence.id == geofence_id,
-                Geofence.user_id == current_user.id
-            )
-        )
-        geofence = result.scalar_one_or_none()
-        
-        if not geofence:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Geofence not found"
-            )
-        
-        return GeofenceResponse(
-            id=geofence.id,
-            name=geofence.name,
-            description=geofence.description,
-            geofence_type=geofence.geofence_type,
-            latitude=geofence.latitude,
-            longitude=geofence.longitude,
-            radius_meters=geofence.radius_meters,
-            is_active=geofence.is_active,
-            notify_on_enter=geofence.notify_on_enter,
-            notify_on_exit=geofence.notify_on_exit,
-            created_at=geofence.created_at,
-            updated_at=geofence.updated_at,
-            metadata=geofence.metadata
+    result = await db.execute(
+        select(*_GEOFENCE_RESPONSE_COLUMNS, *_geofence_stats_columns()).where(
+            Geofence.id == geofence_id,
+            Geofence.user_id == current_user.id
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    )
+    geofence = result.mappings().one_or_none()
+    
+    if not geofence:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve geofence: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Geofence not found"
         )
+    
+    return ORJSONResponse(_geofence_response(geofence))
 
-@router.put("/{geofence_id}", response_model=GeofenceResponse)
+@router.put("/{geofence_id}", responses={status.HTTP_200_OK: {"model": GeofenceResponse}})
 async def update_geofence(
     geofence_id: UUID,
     geofence_data: GeofenceUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db_session),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
     """Update a geofence."""
-    try:
+    # Map the supplied fields onto geofence columns
+    fields = geofence_data.dict(exclude_none=True)
+    changes = {
+        column: fields[field]
+        for field, column in _UPDATABLE_GEOFENCE_COLUMNS.items()
+        if field in fields
+    }
+    if 'is_active' in fields:
+        changes['status'] = GeofenceStatus.ACTIVE if fields['is_active'] else GeofenceStatus.INACTIVE
+    if 'notification_events' in fields:
+        for event_type, trigger in _NOTIFICATION_TRIGGERS:
+            changes[trigger] = event_type.value in fields['notification_events']
+    if 'metadata' in fields:
+        # Merge so server-set keys (location_info, created_via) survive
+        changes['extra_metadata'] = Geofence.extra_metadata.op('||')(literal(fields['metadata'], JSONB))
+    
+    # Rebuild geom in the same statement so the bbox columns derived from it
+    # never go stale
+    if 'radius' in changes or 'coordinates' in changes:
+        changes['geom'] = case(
+            (
+                Geofence.shape == GeofenceShape.CIRCLE,
+                geofence_geometry(
+                    GeofenceShape.CIRCLE,
+                    center_latitude=Geofence.center_latitude,
+                    center_longitude=Geofence.center_longitude,
+                    radius=changes['radius']
+                )
+                if 'radius' in changes else Geofence.geom
+            ),
+            else_=geofence_geometry(GeofenceShape.POLYGON, changes['coordinates'])
+            if 'coordinates' in changes else Geofence.geom
+        )
+    
+    # UPDATE ... RETURNING checks ownership, applies changes and reads back in one trip
+    if changes:
+        stmt = update(Geofence).values(**changes).returning(*_GEOFENCE_RESPONSE_COLUMNS, *_geofence_stats_columns())
+    else:
+        stmt = select(*_GEOFENCE_RESPONSE_COLUMNS, *_geofence_stats_columns())
+    
+    # Commits on success, rolls back on any exception
+    async with db.begin():
         result = await db.execute(
-            select(Geofence).where(
+            stmt.where(
                 Geofence.id == geofence_id,
                 Geofence.user_id == current_user.id
             )
         )
-        geofence = result.scalar_one_or_none()
+        geofence = result.mappings().one_or_none()
         
         if not geofence:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Geofence not found"
             )
-        
-        # Update geofence fields
-        if geofence_data.name is not None:
-            geofence.name = geofence_data.name
-        if geofence_data.description is not None:
-            geofence.description = geofence_data.description
-        if geofence_data.latitude is not None:
-            geofence.latitude = geofence_data.latitude
-        if geofence_data.longitude is not None:
-            geofence.longitude = geofence_data.longitude
-        if geofence_data.radius_meters is not None:
-            geofence.radius_meters = geofence_data.radius_meters
-        if geofence_data.is_active is not None:
-            geofence.is_active = geofence_data.is_active
-        if geofence_data.notify_on_enter is not None:
-            geofence.notify_on_enter = geofence_data.notify_on_enter
-        if geofence_data.notify_on_exit is not None:
-            geofence.notify_on_exit = geofence_data.notify_on_exit
-        
-        await db.commit()
-        await db.refresh(geofence)
-        
-        # Publish geofence updated event
-        await publish_geofence_event({
-            "event_type": "geofence_updated",
-            "geofence_id": str(geofence.id),
-            "user_id": str(current_user.id),
-            "updated_fields": geofence_data.dict(exclude_unset=True),
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
-        return GeofenceResponse(
-            id=geofence.id,
-            name=geofence.name,
-            description=geofence.description,
-            geofence_type=geofence.geofence_type,
-            latitude=geofence.latitude,
-            longitude=geofence.longitude,
-            radius_meters=geofence.radius_meters,
-            is_active=geofence.is_active,
-            notify_on_enter=geofence.notify_on_enter,
-            notify_on_exit=geofence.notify_on_exit,
-            created_at=geofence.created_at,
-            updated_at=geofence.updated_at,
-            metadata=geofence.metadata
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update geofence: {str(e)}"
-        )
+    
+    await redis_client.delete(RedisKeys.user_geofences(current_user.id))
+    
+    # Publish geofence updated event
+    background_tasks.add_task(publish_geofence_event, {
+        "event_type": "geofence_updated",
+        "geofence_id": str(geofence["id"]),
+        "user_id": str(current_user.id),
+        "updated_fields": geofence_data.dict(exclude_unset=True),
+        "timestamp": datetime.utcnow().isoformat()
+    })
+    
+    return ORJSONResponse(_geofence_response(geofence))
 
 @router.delete("/{geofence_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_geofence(
     geofence_id: UUID,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db_session),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
     """Delete a geofence."""
-    try:
+    # Commits on success, rolls back on any exception
+    async with db.begin():
         result = await db.execute(
-            select(Geofence).where(
+            delete(Geofence).where(
                 Geofence.id == geofence_id,
                 Geofence.user_id == current_user.id
-            )
+            ).returning(Geofence.name)
         )
-        geofence = result.scalar_one_or_none()
+        geofence = result.first()
         
-        if not geofence:
+        if geofence is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Geofence not found"
             )
-        
-        await db.delete(geofence)
-        await db.commit()
-        
-        # Publish geofence deleted event
-        await publish_geofence_event({
-            "event_type": "geofence_deleted",
-            "geofence_id": str(geofence_id),
-            "user_id": str(current_user.id),
-            "geofence_name": geofence.name,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete geofence: {str(e)}"
-        )
+    
+    await redis_client.delete(RedisKeys.user_geofences(current_user.id))
+    
+    # Publish geofence deleted event
+    background_tasks.add_task(publish_geofence_event, {
+        "event_type": "geofence_deleted",
+        "geofence_id": str(geofence_id),
+        "user_id": str(current_user.id),
+        "geofence_name": geofence.name,
+        "timestamp": datetime.utcnow().isoformat()
+    })
 
 @router.post("/location-update", status_code=status.HTTP_200_OK)
 async def update_location(
     location_data: LocationUpdate,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session)
+    redis_client: redis.Redis = Depends(get_redis)
 ):
-    """Update user location and check geofence events."""
-    try:
-        # Get all active geofences for the user
-        result = await db.execute(
-            select(Geofence).where(
-                Geofence.user_id == current_user.id,
-                Geofence.is_active == True
+    """Update user location and check geofence events.
+    
+    Database sessions are opened only around the read and write phases, so no
+    pooled connection is held while the cache or the distance checks run.
+    """
+    # Coalesce bursts of near-identical fixes from the same device
+    checked_at = time.monotonic()
+    last_checked = _last_checked_locations.get(current_user.id)
+    if (
+        last_checked is not None
+        and checked_at - last_checked[0] < _LOCATION_DEBOUNCE_SECONDS
+        and calculate_distance(
+            location_data.latitude,
+            location_data.longitude,
+            last_checked[1],
+            last_checked[2]
+        ) < _LOCATION_DEBOUNCE_METERS
+    ):
+        return {"message": "Location updated successfully"}
+    _remember_checked_location(current_user.id, checked_at, location_data.latitude, location_data.longitude)
+    
+    # One timestamp for the whole update keeps the recency window and events consistent
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    
+    # Get all active geofences for the user, from the cache when possible
+    cache_key = RedisKeys.user_geofences(current_user.id)
+    cached = await redis_client.get(cache_key)
+    if cached is not None:
+        geofences = [_geofence_from_cache(entry) for entry in json.loads(cached)]
+    
+    async with AsyncSessionLocal() as db:
+        if cached is None:
+            result = await db.execute(
+                select(*_MATCH_GEOFENCE_COLUMNS).where(
+                    Geofence.user_id == current_user.id,
+                    Geofence.status == GeofenceStatus.ACTIVE
+                )
             )
-        )
-        geofences = result.scalars().all()
+            geofences = [SimpleNamespace(**row) for row in result.mappings()]
         
-        # Check each geofence for entry/exit events
-        for geofence in geofences:
-            distance = calculate_distance(
-                location_data.latitude,
-                location_data.longitude,
-                geofence.latitude,
-                geofence.longitude
+        # Type of the most recent event per geofence in the last 5 minutes, to avoid
+        # duplicates; answered from idx_event_user_geofence_created alone
+        recent_events_result = await db.execute(
+            select(GeofenceEvent.geofence_id, GeofenceEvent.event_type).where(
+                GeofenceEvent.user_id == current_user.id,
+                GeofenceEvent.geofence_id.in_([geofence.id for geofence in geofences]),
+                GeofenceEvent.created_at >= now - timedelta(minutes=5)
             )
+            .distinct(GeofenceEvent.geofence_id)
+            .order_by(GeofenceEvent.geofence_id, GeofenceEvent.created_at.desc())
+        )
+        recent_by_geofence = dict(recent_events_result.all())
+    
+    if cached is None:
+        await redis_client.set(
+            cache_key,
+            json.dumps([_geofence_to_cache(geofence) for geofence in geofences]),
+            ex=_GEOFENCE_CACHE_TTL
+        )
+    
+    pending_events = []
+    event_rows = []
+    
+    # Cheap bounding-box rejection first; only geofences whose box holds the fix
+    # reach the matcher (circles by Haversine, other shapes through the STRtree)
+    candidates = [
+        geofence for geofence in geofences
+        if _bbox_contains(geofence, location_data.latitude, location_data.longitude)
+    ]
+    inside_ids = {
+        geofence_id for _, geofence_id in GeofenceMatcher(candidates).match(
+            [location_data.latitude], [location_data.longitude]
+        )
+    } if candidates else set()
+    
+    # Check each geofence for entry/exit events
+    for geofence in geofences:
+        is_inside = geofence.id in inside_ids
+        recent_event_type = recent_by_geofence.get(geofence.id)
+        
+        # Determine if we need to create an event
+        should_create_event = False
+        event_type = None
+        
+        if is_inside and geofence.trigger_on_enter:
+            if recent_event_type is None or recent_event_type == EventType.EXIT:
+                should_create_event = True
+                event_type = EventType.ENTER
+        elif not is_inside and geofence.trigger_on_exit:
+            if recent_event_type == EventType.ENTER:
+                should_create_event = True
+                event_type = EventType.EXIT
+        
+        if should_create_event:
+            distance = _distance_from_boundary(geofence, location_data.latitude, location_data.longitude)
             
-            is_inside = distance <= geofence.radius_meters
-            
-            # Check for recent events to avoid duplicates
-            recent_event_result = await db.execute(
-                select(GeofenceEvent).where(
-                    GeofenceEvent.geofence_id == geofence.id,
-                    GeofenceEvent.user_id == current_user.id,
-                    GeofenceEvent.created_at >= datetime.utcnow() - timedelta(minutes=5)
-                ).order_by(GeofenceEvent.created_at.desc())
-            )
-            recent_event = recent_event_result.scalar_one_or_none()
+            # Queue geofence event row; all rows are inserted in one statement
+            event_rows.append({
+                'geofence_id': geofence.id,
+                'user_id': current_user.id,
+                'event_type': event_type,
+                'latitude': location_data.latitude,
+                'longitude': location_data.longitude,
+                'accuracy': location_data.accuracy,
+                'distance_from_boundary': distance,
+                'event_timestamp': now,
+                'extra_metadata': {
+                    'geofence_name': geofence.name,
+                    'geofence_type': geofence.geofence_type.value
+                }
+            })
             
-            # Determine if we need to create an event
-            should_create_event = False
-            event_type = None
+            # Queue geofence event for publishing once the batch is committed
+            pending_events.append({
+                "event_type": f"geofence_{event_type.value}",
+                "geofence_id": str(geofence.id),
+                "geofence_name": geofence.name,
+                "geofence_type": geofence.geofence_type.value,
+                "user_id": str(current_user.id),
+                "user_name": f"{current_user.first_name} {current_user.last_name}",
+                "latitude": location_data.latitude,
+                "longitude": location_data.longitude,
+                "distance_from_boundary": distance,
+                "timestamp": now_iso,
+                "priority": "MEDIUM" if geofence.geofence_type == GeofenceType.SAFE_ZONE else "HIGH"
+            })
+    
+    if event_rows:
+        event_types = [row['event_type'] for row in event_rows]
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(GeofenceEvent), event_rows)
             
-            if is_inside and geofence.notify_on_enter:
-                if not recent_event or recent_event.event_type == EventType.EXIT:
-                    should_create_event = True
-                    event_type = EventType.ENTER
-            elif not is_inside and geofence.notify_on_exit:
-                if recent_event and recent_event.event_type == EventType.ENTER:
-                    should_create_event = True
-                    event_type = EventType.EXIT
+            # Fold the new events into today's rollup row read by the analytics summary
+            await db.execute(upsert_geofence_analytics([{
+                'analytics_type': 'daily',
+                'analytics_date': now.replace(hour=0, minute=0, second=0, microsecond=0),
+                'user_id': current_user.id,
+                'geofence_id': ANALYTICS_ALL_SCOPE,
+                'total_events': len(event_types),
+                'enter_events': event_types.count(EventType.ENTER),
+                'exit_events': event_types.count(EventType.EXIT),
+                'dwell_events': event_types.count(EventType.DWELL),
+                'breach_events': event_types.count(EventType.BREACH)
+            }]))
             
-            if should_create_event:
-                # Create geofence event
-                geofence_event = GeofenceEvent(
-                    geofence_id=geofence.id,
-                    user_id=current_user.id,
-                    event_type=event_type,
-                    latitude=location_data.latitude,
-                    longitude=location_data.longitude,
-                    distance_meters=distance,
-                    metadata={
-                        'location_accuracy': location_data.accuracy,
-                        'device_info': location_data.device_info,
-                        'geofence_name': geofence.name,
-                        'geofence_type': geofence.geofence_type.value
-                    }
-                )
-                
-                db.add(geofence_event)
-                
-                # Publish geofence event
-                await publish_geofence_event({
-                    "event_type": f"geofence_{event_type.value}",
-                    "geofence_id": str(geofence.id),
-                    "geofence_name": geofence.name,
-                    "geofence_type": geofence.geofence_type.value,
-                    "user_id": str(current_user.id),
-                    "user_name": f"{current_user.first_name} {current_user.last_name}",
-                    "latitude": location_data.latitude,
-                    "longitude": location_data.longitude,
-                    "distance_meters": distance,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "priority": "MEDIUM" if geofence.geofence_type == GeofenceType.SAFE_ZONE else "HIGH"
-                })
-        
-        await db.commit()
+            await db.commit()
         
-        return {"message": "Location updated successfully"}
-        
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update location: {str(e)}"
-        )
+        background_tasks.add_task(publish_geofence_events_batch, pending_events)
+    
+    return {"message": "Location updated successfully"}
 
-@router.get("/events", response_model=List[GeofenceEventResponse])
+@router.get("/events", responses={status.HTTP_200_OK: {"model": GeofenceEventListResponse}})
 async def get_geofence_events(
-    skip: int = 0,
-    limit: int = 50,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
     geofence_id: Optional[UUID] = None,
     event_type_filter: Optional[EventType] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
     """Get user's geofence events with pagination and filtering."""
-    try:
-        # Build query
-        query = select(GeofenceEvent).where(GeofenceEvent.user_id == current_user.id)
-        
-        if geofence_id:
-            query = query.where(GeofenceEvent.geofence_id == geofence_id)
-        if event_type_filter:
-            query = query.where(GeofenceEvent.event_type == event_type_filter)
-        
-        # Get events with pagination
-        query = query.order_by(GeofenceEvent.created_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        events = result.scalars().all()
-        
-        return [
-            GeofenceEventResponse(
-                id=event.id,
-                geofence_id=event.geofence_id,
-                event_type=event.event_type,
-                latitude=event.latitude,
-                longitude=event.longitude,
-                distance_meters=event.distance_meters,
-                created_at=event.created_at,
-                metadata=event.metadata
-            )
-            for event in events
-        ]
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve geofence events: {str(e)}"
-        )
+    # Build query
+    query = (
+        select(*_EVENT_RESPONSE_COLUMNS)
+        .select_from(GeofenceEvent)
+        .join(Geofence, Geofence.id == GeofenceEvent.geofence_id)
+        .where(GeofenceEvent.user_id == current_user.id)
+    )
+    
+    if geofence_id:
+        query = query.where(GeofenceEvent.geofence_id == geofence_id)
+    if event_type_filter:
+        query = query.where(GeofenceEvent.event_type == event_type_filter)
+    
+    # Seek past the cursor instead of scanning and discarding skipped rows
+    if cursor:
+        query = query.where(tuple_(GeofenceEvent.created_at, GeofenceEvent.id) < tuple_(*_decode_cursor(cursor)))
+    
+    # Get events with pagination; one extra row tells whether another page follows
+    query = query.order_by(GeofenceEvent.created_at.desc(), GeofenceEvent.id.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    rows = result.mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more and rows else None
+    
+    return ORJSONResponse({
+        "events": [_event_response(row) for row in rows],
+        "total": None,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": next_cursor
+    })
 
 @router.get("/analytics/summary", response_model=GeofenceAnalyticsResponse)
 async def get_geofence_analytics(
@@ -492,74 +713,47 @@ async def get_geofence_analytics(
     db: AsyncSession = Depends(get_db_session)
 ):
     """Get user's geofence analytics and statistics."""
-    try:
-        # Calculate date range
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-        
-        # Get total geofences
-        total_geofences_result = await db.execute(
-            select(func.count(Geofence.id)).where(
-                Geofence.user_id == current_user.id
-            )
-        )
-        total_geofences = total_geofences_result.scalar()
-        
-        # Get active geofences
-        active_geofences_result = await db.execute(
-            select(func.count(Geofence.id)).where(
-                Geofence.user_id == current_user.id,
-                Geofence.is_active == True
-            )
-        )
-        active_geofences = active_geofences_result.scalar()
-        
-        # Get total events in period
-        total_events_result = await db.execute(
-            select(func.count(GeofenceEvent.id)).where(
-                GeofenceEvent.user_id == current_user.id,
-                GeofenceEvent.created_at >= start_date
-            )
-        )
-        total_events = total_events_result.scalar()
-        
-        # Get enter events
-        enter_events_result = await db.execute(
-            select(func.count(GeofenceEvent.id)).where(
-                GeofenceEvent.user_id == current_user.id,
-                GeofenceEvent.event_type == EventType.ENTER,
-                GeofenceEvent.created_at >= start_date
-            )
-        )
-        enter_events = enter_events_result.scalar()
-        
-        # Get exit events
-        exit_events_result = await db.execute(
-            select(func.count(GeofenceEvent.id)).where(
-                GeofenceEvent.user_id == current_user.id,
-                GeofenceEvent.event_type == EventType.EXIT,
-                GeofenceEvent.created_at >= start_date
-            )
-        )
-        exit_events = exit_events_result.scalar()
-        
-        return GeofenceAnalyticsResponse(
-            period_days=days,
-            total_geofences=total_geofences,
-            active_geofences=active_geofences,
-            total_events=total_events,
-            enter_events=enter_events,
-            exit_events=exit_events,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve geofence analytics: {str(e)}"
+    # Calculate date range
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+    
+    # Geofence counts in one pass
+    geofence_counts = (await db.execute(
+        select(
+            func.count().label("total"),
+            func.count().filter(Geofence.status == GeofenceStatus.ACTIVE).label("active")
+        ).where(Geofence.user_id == current_user.id)
+    )).one()
+    
+    # Event counts for the period, summed from the daily rollup rows
+    event_counts = (await db.execute(
+        select(
+            func.coalesce(func.sum(GeofenceAnalytics.total_events), 0).label("total"),
+            func.coalesce(func.sum(GeofenceAnalytics.enter_events), 0).label("enter"),
+            func.coalesce(func.sum(GeofenceAnalytics.exit_events), 0).label("exit"),
+            func.coalesce(func.sum(GeofenceAnalytics.dwell_events), 0).label("dwell"),
+            func.coalesce(func.sum(GeofenceAnalytics.breach_events), 0).label("breach")
+        ).where(
+            GeofenceAnalytics.analytics_type == 'daily',
+            GeofenceAnalytics.analytics_date >= start_date.replace(hour=0, minute=0, second=0, microsecond=0),
+            GeofenceAnalytics.user_id == current_user.id,
+            GeofenceAnalytics.geofence_id == ANALYTICS_ALL_SCOPE
         )
+    )).one()
+    
+    return GeofenceAnalyticsResponse(
+        period_days=days,
+        total_geofences=geofence_counts.total,
+        active_geofences=geofence_counts.active,
+        total_events=event_counts.total,
+        enter_events=event_counts.enter,
+        exit_events=event_counts.exit,
+        dwell_events=event_counts.dwell,
+        breach_events=event_counts.breach,
+        start_date=start_date,
+        end_date=end_date
+    )
 
 # Import required SQLAlchemy functions and datetime
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, update, delete, case, func, literal, tuple_
 from datetime import timedelta
\ No newline at end of file
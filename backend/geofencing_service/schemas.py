@@ -1,9 +1,26 @@
-from pydantic import BaseModel, validator
-from typing import Optional, List, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator, model_validator
+from typing import Optional, List, Dict, Any, Tuple, Annotated, Literal
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
 
+# Numeric range types checked inside pydantic-core, no Python callbacks
+Latitude = Annotated[float, Field(ge=-90, le=90)]
+Longitude = Annotated[float, Field(ge=-180, le=180)]
+Heading = Annotated[float, Field(ge=0, le=360)]
+NonNegFloat = Annotated[float, Field(ge=0)]
+Radius = Annotated[float, Field(ge=10, le=100000)]  # 10 meters to 100 km
+
+# Stripped, length-bounded text checked by pydantic-core
+Name = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
+Description = Annotated[str, StringConstraints(strip_whitespace=True, max_length=500)]
+
+# Polygon vertices; each pair is range-checked by its element types
+Coordinates = Annotated[List[Tuple[Latitude, Longitude]], Field(max_length=100)]
+
+# 24-hour "HH:MM"
+TimeOfDay = Annotated[str, StringConstraints(pattern=r'^([01]\d|2[0-3]):[0-5]\d$')]
+
 class GeofenceType(str, Enum):
     """Enumeration for geofence types."""
     SAFE_ZONE = "safe_zone"
@@ -35,132 +52,46 @@ class GeofenceShape(str, Enum):
 
 class GeofenceCreate(BaseModel):
     """Schema for creating a geofence."""
-    name: str
-    description: Optional[str] = None
+    name: Name
+    description: Optional[Description] = None
     geofence_type: GeofenceType
     shape: GeofenceShape = GeofenceShape.CIRCLE
-    center_latitude: float
-    center_longitude: float
-    radius_meters: Optional[float] = None
-    coordinates: Optional[List[Tuple[float, float]]] = None
+    center_latitude: Latitude
+    center_longitude: Longitude
+    radius_meters: Optional[Radius] = None
+    coordinates: Optional[Coordinates] = None
     is_active: bool = True
     send_notifications: bool = True
-    notification_events: List[GeofenceEventType] = [GeofenceEventType.ENTER, GeofenceEventType.EXIT]
+    notification_events: Annotated[List[GeofenceEventType], Field(min_length=1)] = [GeofenceEventType.ENTER, GeofenceEventType.EXIT]
     metadata: Optional[Dict[str, Any]] = None
     
-    @validator('name')
-    def validate_name(cls, v):
-        v = v.strip()
-        if len(v) < 1:
-            raise ValueError('Name is required')
-        if len(v) > 100:
-            raise ValueError('Name cannot be longer than 100 characters')
-        return v
-    
-    @validator('description')
-    def validate_description(cls, v):
-        if v is not None:
-            v = v.strip()
-            if len(v) > 500:
-                raise ValueError('Description cannot be longer than 500 characters')
-        return v
-    
-    @validator('center_latitude')
-    def validate_latitude(cls, v):
-        if not -90 <= v <= 90:
-            raise ValueError('Latitude must be between -90 and 90 degrees')
-        return v
-    
-    @validator('center_longitude')
-    def validate_longitude(cls, v):
-        if not -180 <= v <= 180:
-            raise ValueError('Longitude must be between -180 and 180 degrees')
-        return v
-    
-    @validator('radius_meters')
-    def validate_radius(cls, v, values):
-        if values.get('shape') == GeofenceShape.CIRCLE:
-            if v is None:
-                raise ValueError('Radius is required for circular geofences')
-            if not 10 <= v <= 100000:  # 10 meters to 100 km
-                raise ValueError('Radius must be between 10 and 100,000 meters')
-        return v
+    @model_validator(mode='after')
+    def validate_radius(self):
+        if self.shape == GeofenceShape.CIRCLE and self.radius_meters is None:
+            raise ValueError('Radius is required for circular geofences')
+        return self
     
-    @validator('coordinates')
-    def validate_coordinates(cls, v, values):
-        shape = values.get('shape')
+    @model_validator(mode='after')
+    def validate_coordinates(self):
+        shape = self.shape
+        v = self.coordinates
         if shape in [GeofenceShape.POLYGON, GeofenceShape.RECTANGLE]:
             if v is None or len(v) < 3:
                 raise ValueError(f'{shape} geofences require at least 3 coordinates')
             if shape == GeofenceShape.RECTANGLE and len(v) != 4:
                 raise ValueError('Rectangle geofences require exactly 4 coordinates')
-            if len(v) > 100:
-                raise ValueError('Maximum 100 coordinates allowed')
-            
-            # Validate each coordinate
-            for i, (lat, lng) in enumerate(v):
-                if not -90 <= lat <= 90:
-                    raise ValueError(f'Coordinate {i}: Latitude must be between -90 and 90 degrees')
-                if not -180 <= lng <= 180:
-                    raise ValueError(f'Coordinate {i}: Longitude must be between -180 and 180 degrees')
-        return v
-    
-    @validator('notification_events')
-    def validate_notification_events(cls, v):
-        if len(v) == 0:
-            raise ValueError('At least one notification event is required')
-        return v
+        return self
 
 class GeofenceUpdate(BaseModel):
     """Schema for updating a geofence."""
-    name: Optional[str] = None
-    description: Optional[str] = None
+    name: Optional[Name] = None
+    description: Optional[Description] = None
     is_active: Optional[bool] = None
     send_notifications: Optional[bool] = None
     notification_events: Optional[List[GeofenceEventType]] = None
-    radius_meters: Optional[float] = None
-    coordinates: Optional[List[Tuple[float, float]]] = None
+    radius_meters: Optional[Radius] = None
+    coordinates: Optional[Annotated[Coordinates, Field(min_length=3)]] = None
     metadata: Optional[Dict[str, Any]] = None
-    
-    @validator('name')
-    def validate_name(cls, v):
-        if v is not None:
-            v = v.strip()
-            if len(v) < 1:
-                raise ValueError('Name cannot be empty')
-            if len(v) > 100:
-                raise ValueError('Name cannot be longer than 100 characters')
-        return v
-    
-    @validator('description')
-    def validate_description(cls, v):
-        if v is not None:
-            v = v.strip()
-            if len(v) > 500:
-                raise ValueError('Description cannot be longer than 500 characters')
-        return v
-    
-    @validator('radius_meters')
-    def validate_radius(cls, v):
-        if v is not None and not 10 <= v <= 100000:
-            raise ValueError('Radius must be between 10 and 100,000 meters')
-        return v
-    
-    @validator('coordinates')
-    def validate_coordinates(cls, v):
-        if v is not None:
-            if len(v) < 3:
-                raise ValueError('At least 3 coordinates are required')
-            if len(v) > 100:
-                raise ValueError('Maximum 100 coordinates allowed')
-            
-            # Validate each coordinate
-            for i, (lat, lng) in enumerate(v):
-                if not -90 <= lat <= 90:
-                    raise ValueError(f'Coordinate {i}: Latitude must be between -90 and 90 degrees')
-                if not -180 <= lng <= 180:
-                    raise ValueError(f'Coordinate {i}: Longitude must be between -180 and 180 degrees')
-        return v
 
 class GeofenceResponse(BaseModel):
     """Response schema for geofence."""
@@ -174,6 +105,9 @@ class GeofenceResponse(BaseModel):
     center_longitude: float
     radius_meters: Optional[float] = None
     coordinates: Optional[List[Tuple[float, float]]] = None
+    # Alternative to coordinates for ?format=blob: base64 of 2*N little-endian
+    # float64 values (lat0, lng0, lat1, lng1, ...)
+    coordinates_blob: Optional[bytes] = None
     is_active: bool
     send_notifications: bool
     notification_events: List[GeofenceEventType]
@@ -184,77 +118,36 @@ class GeofenceResponse(BaseModel):
     address: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid', ser_json_bytes='base64')
 
 class GeofenceListResponse(BaseModel):
     """Response schema for geofence list."""
     geofences: List[GeofenceResponse]
-    total: int
-    skip: int
+    total: Optional[int] = None  # Only computed when include_total is requested
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
+    
+    model_config = ConfigDict(frozen=True, extra='forbid')
 
 class LocationUpdate(BaseModel):
     """Schema for location updates."""
-    latitude: float
-    longitude: float
-    accuracy: Optional[float] = None
+    latitude: Latitude
+    longitude: Longitude
+    accuracy: Optional[NonNegFloat] = None
     altitude: Optional[float] = None
-    speed: Optional[float] = None
-    heading: Optional[float] = None
+    speed: Optional[NonNegFloat] = None
+    heading: Optional[Heading] = None
     timestamp: Optional[datetime] = None
-    
-    @validator('latitude')
-    def validate_latitude(cls, v):
-        if not -90 <= v <= 90:
-            raise ValueError('Latitude must be between -90 and 90 degrees')
-        return v
-    
-    @validator('longitude')
-    def validate_longitude(cls, v):
-        if not -180 <= v <= 180:
-            raise ValueError('Longitude must be between -180 and 180 degrees')
-        return v
-    
-    @validator('accuracy')
-    def validate_accuracy(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Accuracy cannot be negative')
-        return v
-    
-    @validator('speed')
-    def validate_speed(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Speed cannot be negative')
-        return v
-    
-    @validator('heading')
-    def validate_heading(cls, v):
-        if v is not None and not 0 <= v <= 360:
-            raise ValueError('Heading must be between 0 and 360 degrees')
-        return v
 
 class GeofenceEventCreate(BaseModel):
     """Schema for creating a geofence event."""
     geofence_id: UUID
     event_type: GeofenceEventType
-    latitude: float
-    longitude: float
-    accuracy: Optional[float] = None
+    latitude: Latitude
+    longitude: Longitude
+    accuracy: Optional[NonNegFloat] = None
     metadata: Optional[Dict[str, Any]] = None
-    
-    @validator('latitude')
-    def validate_latitude(cls, v):
-        if not -90 <= v <= 90:
-            raise ValueError('Latitude must be between -90 and 90 degrees')
-        return v
-    
-    @validator('longitude')
-    def validate_longitude(cls, v):
-        if not -180 <= v <= 180:
-            raise ValueError('Longitude must be between -180 and 180 degrees')
-        return v
 
 class GeofenceEventResponse(BaseModel):
     """Response schema for geofence event."""
@@ -271,16 +164,17 @@ class GeofenceEventResponse(BaseModel):
     duration_seconds: Optional[int] = None
     metadata: Optional[Dict[str, Any]] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
 
 class GeofenceEventListResponse(BaseModel):
     """Response schema for geofence event list."""
     events: List[GeofenceEventResponse]
-    total: int
-    skip: int
+    total: Optional[int] = None
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
+    
+    model_config = ConfigDict(frozen=True, extra='forbid')
 
 class GeofenceAnalyticsRequest(BaseModel):
     """Schema for geofence analytics request."""
@@ -288,24 +182,23 @@ class GeofenceAnalyticsRequest(BaseModel):
     end_date: Optional[datetime] = None
     geofence_ids: Optional[List[UUID]] = None
     event_types: Optional[List[GeofenceEventType]] = None
-    group_by: str = 'day'  # 'hour', 'day', 'week', 'month'
+    group_by: Literal['hour', 'day', 'week', 'month'] = 'day'
     
-    @validator('group_by')
-    def validate_group_by(cls, v):
-        valid_groups = ['hour', 'day', 'week', 'month']
-        if v not in valid_groups:
-            raise ValueError(f'Group by must be one of: {valid_groups}')
-        return v
+    @model_validator(mode='after')
+    def validate_date_range(self):
+        if self.start_date and self.end_date and self.end_date <= self.start_date:
+            raise ValueError('End date must be after start date')
+        return self
     
-    @validator('end_date')
-    def validate_date_range(cls, v, values):
-        if v is not None and 'start_date' in values and values['start_date'] is not None:
-            if v <= values['start_date']:
-                raise ValueError('End date must be after start date')
-        return v
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceAnalyticsResponse(BaseModel):
     """Response schema for geofence analytics."""
+    period_days: int
+    start_date: datetime
+    end_date: datetime
+    total_geofences: int
+    active_geofences: int
     total_events: int
     enter_events: int
     exit_events: int
@@ -317,6 +210,8 @@ class GeofenceAnalyticsResponse(BaseModel):
     events_by_geofence: List[Dict[str, Any]] = []
     events_by_hour: List[Dict[str, Any]] = []
     events_by_day_of_week: List[Dict[str, Any]] = []
+    
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceSearchRequest(BaseModel):
     """Schema for searching geofences."""
@@ -329,13 +224,15 @@ class GeofenceSearchRequest(BaseModel):
     limit: int = 20
     skip: int = 0
     
-    @validator('limit')
+    @field_validator('limit')
+    @classmethod
     def validate_limit(cls, v):
         if not 1 <= v <= 100:
             raise ValueError('Limit must be between 1 and 100')
         return v
     
-    @validator('radius_km')
+    @field_validator('radius_km')
+    @classmethod
     def validate_radius(cls, v):
         if v is not None and (v <= 0 or v > 1000):
             raise ValueError('Radius must be between 0 and 1000 km')
@@ -343,16 +240,10 @@ class GeofenceSearchRequest(BaseModel):
 
 class GeofenceImportRequest(BaseModel):
     """Schema for importing geofences."""
-    geofences: List[GeofenceCreate]
+    geofences: Annotated[List[GeofenceCreate], Field(min_length=1, max_length=100)]
     overwrite_existing: bool = False
     
-    @validator('geofences')
-    def validate_geofences(cls, v):
-        if len(v) == 0:
-            raise ValueError('At least one geofence is required')
-        if len(v) > 100:
-            raise ValueError('Cannot import more than 100 geofences at once')
-        return v
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceImportResponse(BaseModel):
     """Response schema for geofence import."""
@@ -360,19 +251,16 @@ class GeofenceImportResponse(BaseModel):
     failed_count: int
     errors: List[Dict[str, str]] = []
     imported_geofence_ids: List[UUID]
+    
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceExportRequest(BaseModel):
     """Schema for exporting geofences."""
-    format: str = 'json'  # 'json', 'csv', 'kml', 'geojson'
+    format: Literal['json', 'csv', 'kml', 'geojson'] = 'json'
     geofence_ids: Optional[List[UUID]] = None
     include_events: bool = False
     
-    @validator('format')
-    def validate_format(cls, v):
-        valid_formats = ['json', 'csv', 'kml', 'geojson']
-        if v not in valid_formats:
-            raise ValueError(f'Format must be one of: {valid_formats}')
-        return v
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceExportResponse(BaseModel):
     """Response schema for geofence export."""
@@ -383,10 +271,12 @@ class GeofenceExportResponse(BaseModel):
     expires_at: Optional[datetime] = None
     file_size_bytes: Optional[int] = None
     record_count: Optional[int] = None
+    
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceTemplate(BaseModel):
     """Schema for geofence templates."""
-    name: str
+    name: Name
     description: Optional[str] = None
     geofence_type: GeofenceType
     shape: GeofenceShape
@@ -395,14 +285,7 @@ class GeofenceTemplate(BaseModel):
     default_notification_events: List[GeofenceEventType] = [GeofenceEventType.ENTER, GeofenceEventType.EXIT]
     is_public: bool = False
     
-    @validator('name')
-    def validate_name(cls, v):
-        v = v.strip()
-        if len(v) < 1:
-            raise ValueError('Name is required')
-        if len(v) > 100:
-            raise ValueError('Name cannot be longer than 100 characters')
-        return v
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceTemplateResponse(BaseModel):
     """Response schema for geofence template."""
@@ -419,35 +302,17 @@ class GeofenceTemplateResponse(BaseModel):
     created_at: datetime
     usage_count: int = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid', defer_build=True)
 
 class GeofenceNotificationSettings(BaseModel):
     """Schema for geofence notification settings."""
     send_push_notifications: bool = True
     send_sms_notifications: bool = False
     send_email_notifications: bool = False
-    notification_delay_seconds: int = 0
+    notification_delay_seconds: Annotated[int, Field(ge=0, le=3600)] = 0  # 0 to 1 hour
     quiet_hours_enabled: bool = False
-    quiet_hours_start: Optional[str] = None  # Format: "HH:MM"
-    quiet_hours_end: Optional[str] = None    # Format: "HH:MM"
-    
-    @validator('notification_delay_seconds')
-    def validate_delay(cls, v):
-        if not 0 <= v <= 3600:  # 0 to 1 hour
-            raise ValueError('Notification delay must be between 0 and 3600 seconds')
-        return v
-    
-    @validator('quiet_hours_start', 'quiet_hours_end')
-    def validate_time_format(cls, v):
-        if v is not None:
-            try:
-                hour, minute = map(int, v.split(':'))
-                if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                    raise ValueError('Invalid time format')
-            except (ValueError, AttributeError):
-                raise ValueError('Time must be in HH:MM format (24-hour)')
-        return v
+    quiet_hours_start: Optional[TimeOfDay] = None
+    quiet_hours_end: Optional[TimeOfDay] = None
 
 class GeofenceStatistics(BaseModel):
     """Schema for geofence statistics."""
@@ -461,30 +326,21 @@ class GeofenceStatistics(BaseModel):
     most_triggered_geofence: Optional[Dict[str, Any]] = None
     average_events_per_geofence: float
     last_event_timestamp: Optional[datetime] = None
+    
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceBulkAction(BaseModel):
     """Schema for bulk geofence actions."""
-    geofence_ids: List[UUID]
-    action: str  # 'activate', 'deactivate', 'delete', 'duplicate'
+    geofence_ids: Annotated[List[UUID], Field(min_length=1, max_length=50)]
+    action: Literal['activate', 'deactivate', 'delete', 'duplicate']
     
-    @validator('geofence_ids')
-    def validate_geofence_ids(cls, v):
-        if len(v) == 0:
-            raise ValueError('At least one geofence ID is required')
-        if len(v) > 50:
-            raise ValueError('Cannot perform bulk action on more than 50 geofences')
-        return v
-    
-    @validator('action')
-    def validate_action(cls, v):
-        valid_actions = ['activate', 'deactivate', 'delete', 'duplicate']
-        if v not in valid_actions:
-            raise ValueError(f'Action must be one of: {valid_actions}')
-        return v
+    model_config = ConfigDict(defer_build=True)
 
 class GeofenceBulkActionResponse(BaseModel):
     """Response schema for bulk geofence actions."""
     successful_count: int
     failed_count: int
     errors: List[Dict[str, str]] = []
-    processed_geofence_ids: List[UUID]
\ No newline at end of file
+    processed_geofence_ids: List[UUID]
+    
+    model_config = ConfigDict(defer_build=True)
\ No newline at end of file
@@ -1,21 +1,71 @@
 import asyncio
-import json
 import logging
-from typing import Optional, Dict, Any, List
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
-from aiokafka.errors import KafkaError
+import orjson
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Union
 import os
+import time
+from dataclasses import dataclass
 from datetime import datetime
 
+# aiokafka is imported on first producer/consumer creation to keep worker startup light
+if TYPE_CHECKING:
+    from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+
 logger = logging.getLogger(__name__)
 
+# Producer settings per delivery class. Panic alerts go out immediately;
+# other durable events wait a few ms to share larger batches. Telemetry is
+# replaceable, so it skips the replica round-trip and idempotent sequencing.
+PRODUCER_PROFILES: Dict[str, Dict[str, Any]] = {
+    "critical": {
+        "acks": "all",
+        "enable_idempotence": True,
+        "compression_type": "lz4",
+        "linger_ms": 0,
+    },
+    "batched": {
+        "acks": "all",
+        "enable_idempotence": True,
+        "compression_type": "lz4",
+        "linger_ms": 5,
+        "max_batch_size": 131072,
+    },
+    "telemetry": {
+        "acks": 1,
+        "enable_idempotence": False,
+        "compression_type": "lz4",
+        "linger_ms": 10,
+        "max_batch_size": 65536,
+    },
+}
+
+# Producer profile per topic; unlisted topics use DEFAULT_PRODUCER_PROFILE
+TOPIC_PROFILES: Dict[str, str] = {
+    "emergency_alerts": "critical",
+    "location_updates": "telemetry",
+    "agent_updates": "telemetry",
+}
+DEFAULT_PRODUCER_PROFILE = "batched"
+
+# ISO timestamp shared by every message built within the same millisecond
+_ts_cache = {'v': '', 't': 0.0}
+
+def _current_ts() -> str:
+    """Return the current UTC ISO timestamp, reformatted at most once per millisecond."""
+    now = time.monotonic()
+    if now - _ts_cache['t'] > 0.001:
+        _ts_cache['v'] = datetime.utcnow().isoformat()
+        _ts_cache['t'] = now
+    return _ts_cache['v']
+
 class KafkaConfig:
     """Kafka configuration and connection management."""
     
     def __init__(self):
         self.bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-        self.producer: Optional[AIOKafkaProducer] = None
-        self.consumers: Dict[str, AIOKafkaConsumer] = {}
+        self.producers: Dict[str, "AIOKafkaProducer"] = {}  # profile -> producer
+        self._producer_start_lock = asyncio.Lock()
+        self.consumers: Dict[str, "AIOKafkaConsumer"] = {}
         
         # Topic configurations
         self.topics = {
@@ -69,36 +119,41 @@ class KafkaConfig:
             }
         }
     
-    async def create_producer(self) -> AIOKafkaProducer:
-        """Create and start Kafka producer."""
+    @property
+    def producer(self) -> Optional["AIOKafkaProducer"]:
+        """The low-latency critical producer."""
+        return self.producers.get("critical")
+    
+    async def create_producer(self, profile: str = "critical") -> "AIOKafkaProducer":
+        """Create and start a Kafka producer using one of PRODUCER_PROFILES."""
         try:
+            from aiokafka import AIOKafkaProducer
+            
             producer = AIOKafkaProducer(
                 bootstrap_servers=self.bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8'),
-                key_serializer=lambda k: k.encode('utf-8') if k else None,
-                acks='all',  # Wait for all replicas
-                retries=3,
-                max_in_flight_requests_per_connection=1,
-                enable_idempotence=True,
-                compression_type='gzip'
+                value_serializer=lambda v: v if isinstance(v, bytes) else orjson.dumps(v, default=str, option=orjson.OPT_NAIVE_UTC),
+                key_serializer=lambda k: k if isinstance(k, bytes) else k.encode('utf-8') if k else None,
+                **PRODUCER_PROFILES[profile]
             )
             
             await producer.start()
-            logger.info("Kafka producer started successfully")
+            logger.info(f"Kafka producer started successfully ({profile})")
             return producer
             
         except Exception as e:
             logger.error(f"Failed to create Kafka producer: {e}")
             raise
     
-    async def create_consumer(self, topics: List[str], group_id: str) -> AIOKafkaConsumer:
+    async def create_consumer(self, topics: List[str], group_id: str) -> "AIOKafkaConsumer":
         """Create and start Kafka consumer."""
         try:
+            from aiokafka import AIOKafkaConsumer
+            
             consumer = AIOKafkaConsumer(
                 *topics,
                 bootstrap_servers=self.bootstrap_servers,
                 group_id=group_id,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')) if m else None,
+                value_deserializer=lambda m: orjson.loads(m) if m else None,
                 key_deserializer=lambda k: k.decode('utf-8') if k else None,
                 auto_offset_reset='latest',
                 enable_auto_commit=True,
@@ -108,26 +163,49 @@ class KafkaConfig:
             )
             
             await consumer.start()
-            logger.info(f"Kafka consumer started for topics: {topics}, group: {group_id}")
+            logger.info("Kafka consumer started for topics: %s, group: %s", topics, group_id)
             return consumer
             
         except Exception as e:
             logger.error(f"Failed to create Kafka consumer: {e}")
             raise
     
-    async def send_message(self, topic: str, message: Dict[Any, Any], key: Optional[str] = None) -> bool:
-        """Send message to Kafka topic."""
+    async def start_producers(self):
+        """Start one producer per profile once; safe to call concurrently."""
+        async with self._producer_start_lock:
+            for profile in PRODUCER_PROFILES:
+                if profile not in self.producers:
+                    self.producers[profile] = await self.create_producer(profile)
+    
+    def producer_for(self, topic: str) -> Optional["AIOKafkaProducer"]:
+        """Route a topic to its profile's producer, falling back to the critical one."""
+        return self.producers.get(TOPIC_PROFILES.get(topic, DEFAULT_PRODUCER_PROFILE)) or self.producer
+    
+    async def send_message(self, topic: str, message: Union[Dict[Any, Any], bytes], key: Optional[Union[str, bytes]] = None) -> bool:
+        """Send message to Kafka topic.
+        
+        Pre-serialized bytes payloads are sent as-is and must carry their own timestamp.
+        """
         try:
-            if not self.producer:
+            # Producers start on first publish when init_kafka was not called, or
+            # when this topic's profile failed to start with the others
+            if TOPIC_PROFILES.get(topic, DEFAULT_PRODUCER_PROFILE) not in self.producers:
+                await self.start_producers()
+            
+            producer = self.producer_for(topic)
+            if not producer:
                 logger.error("Kafka producer not initialized")
                 return False
             
             # Add timestamp to message
-            message['timestamp'] = datetime.utcnow().isoformat()
+            if not isinstance(message, bytes):
+                message['timestamp'] = _current_ts()
             
             # Send message
-            await self.producer.send(topic, value=message, key=key)
-            logger.debug(f"Message sent to topic '{topic}': {message}")
+            await producer.send(topic, value=message, key=key)
+            # Skip formatting the payload unless debug output is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Message sent to topic '%s': %r", topic, message)
             return True
             
         except Exception as e:
@@ -135,15 +213,17 @@ class KafkaConfig:
             return False
     
     async def close_producer(self):
-        """Close Kafka producer."""
-        if self.producer:
+        """Close Kafka producers."""
+        for profile, producer in self.producers.items():
             try:
-                await self.producer.stop()
-                logger.info("Kafka producer closed")
+                await producer.stop()
+                logger.info(f"Kafka producer closed ({profile})")
             except Exception as e:
-                logger.error(f"Error closing Kafka producer: {e}")
+                logger.error(f"Error closing Kafka producer ({profile}): {e}")
+        
+        self.producers.clear()
     
-    async def close_consumer(self, consumer: AIOKafkaConsumer):
+    async def close_consumer(self, consumer: "AIOKafkaConsumer"):
         """Close Kafka consumer."""
         try:
             await consumer.stop()
@@ -169,7 +249,7 @@ kafka_config = KafkaConfig()
 async def init_kafka():
     """Initialize Kafka connections."""
     try:
-        kafka_config.producer = await kafka_config.create_producer()
+        await kafka_config.start_producers()
         logger.info("Kafka initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize Kafka: {e}")
@@ -184,21 +264,34 @@ async def close_kafka():
     except Exception as e:
         logger.error(f"Error closing Kafka connections: {e}")
 
-async def get_kafka_producer() -> Optional[AIOKafkaProducer]:
+async def get_kafka_producer() -> Optional["AIOKafkaProducer"]:
     """Get the global Kafka producer."""
     return kafka_config.producer
 
-async def send_kafka_message(topic: str, message: Dict[Any, Any], key: Optional[str] = None) -> bool:
+async def send_kafka_message(topic: str, message: Union[Dict[Any, Any], bytes], key: Optional[Union[str, bytes]] = None) -> bool:
     """Send message to Kafka topic."""
     return await kafka_config.send_message(topic, message, key)
 
-async def create_kafka_consumer(topics: List[str], group_id: str) -> AIOKafkaConsumer:
+async def create_kafka_consumer(topics: List[str], group_id: str) -> "AIOKafkaConsumer":
     """Create a new Kafka consumer."""
     consumer = await kafka_config.create_consumer(topics, group_id)
     kafka_config.consumers[group_id] = consumer
     return consumer
 
 # Message schemas for different topics
+@dataclass(slots=True)
+class LocationUpdateMsg:
+    """Location update payload; serialized straight to bytes without an intermediate dict."""
+    user_id: str
+    latitude: float
+    longitude: float
+    accuracy: float
+    speed: Optional[float]
+    timestamp: str
+    
+    def to_bytes(self) -> bytes:
+        return orjson.dumps(self)
+
 class MessageSchemas:
     """Standard message schemas for Kafka topics."""
     
@@ -211,19 +304,13 @@ class MessageSchemas:
             "location": location,
             "severity": severity,
             "message": message,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _current_ts()
         }
     
     @staticmethod
-    def location_update(user_id: str, latitude: float, longitude: float, accuracy: float, speed: Optional[float] = None) -> Dict:
-        return {
-            "user_id": user_id,
-            "latitude": latitude,
-            "longitude": longitude,
-            "accuracy": accuracy,
-            "speed": speed,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+    def location_update(user_id: str, latitude: float, longitude: float, accuracy: float, speed: Optional[float] = None) -> LocationUpdateMsg:
+        # Send with send_message(topic, msg.to_bytes())
+        return LocationUpdateMsg(user_id, latitude, longitude, accuracy, speed, _current_ts())
     
     @staticmethod
     def geofence_event(user_id: str, geofence_id: str, event_type: str, location: Dict) -> Dict:
@@ -232,7 +319,7 @@ class MessageSchemas:
             "geofence_id": geofence_id,
             "event_type": event_type,  # enter, exit, dwell
             "location": location,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _current_ts()
         }
     
     @staticmethod
@@ -242,7 +329,7 @@ class MessageSchemas:
             "status": status,
             "location": location,
             "incident_id": incident_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _current_ts()
         }
     
     @staticmethod
@@ -253,7 +340,7 @@ class MessageSchemas:
             "title": title,
             "message": message,
             "data": data or {},
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _current_ts()
         }
     
     @staticmethod
@@ -264,5 +351,5 @@ class MessageSchemas:
             "operation": operation,  # upload, process, delete
             "status": status,  # pending, processing, completed, failed
             "file_path": file_path,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _current_ts()
         }
\ No newline at end of file
@@ -1,10 +1,15 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import uvicorn
 import logging
+import os
 from typing import AsyncGenerator
 
 # Import routers from different services
@@ -16,8 +21,14 @@ from backend.media_service.routes import router as media_router
 from backend.agent_service.routes import router as agent_router
 
 # Import database and Kafka connections
-from backend.database import init_database, check_database_connection
+from backend.database import AsyncSessionLocal, init_async_database, check_async_database_connection
 from backend.kafka_config import init_kafka, close_kafka
+# Same module path as the media router, so the batcher it enqueues to is the one started here
+from shared.kafka_client import init_kafka as init_shared_kafka, close_kafka as close_shared_kafka
+# Likewise for the Redis client that buffers media view/download counters (closed at shutdown)
+from shared.database import close_db as close_shared_db
+from backend.media_service.counters import flush_media_counters
+from backend.geofencing_service.models import ARCHIVE_GEOFENCE_EVENTS, REFRESH_GEOFENCE_STATS
 from backend.config import settings
 
 # Configure logging
@@ -30,6 +41,42 @@ logger = logging.getLogger(__name__)
 # Security
 security = HTTPBearer()
 
+async def flush_media_counters_periodically() -> None:
+    """Fold the Redis-buffered media counters into PostgreSQL on a fixed interval."""
+    while True:
+        await asyncio.sleep(settings.MEDIA_COUNTER_FLUSH_INTERVAL)
+        try:
+            async with AsyncSessionLocal() as db:
+                await flush_media_counters(db)
+        except Exception as e:
+            logger.error(f"Failed to flush media counters: {e}")
+
+async def refresh_geofence_stats_periodically() -> None:
+    """Keep the geofence_stats materialized view behind the event log by at most one interval."""
+    while True:
+        await asyncio.sleep(settings.GEOFENCE_STATS_REFRESH_INTERVAL)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(REFRESH_GEOFENCE_STATS)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to refresh geofence stats: {e}")
+
+async def archive_geofence_events_periodically() -> None:
+    """Move processed geofence events past the retention window into the archive table."""
+    while True:
+        await asyncio.sleep(settings.GEOFENCE_ARCHIVE_INTERVAL)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    ARCHIVE_GEOFENCE_EVENTS,
+                    {"retention_days": settings.GEOFENCE_EVENT_RETENTION_DAYS}
+                )
+                await db.commit()
+            logger.info(f"Archived {result.rowcount} geofence events")
+        except Exception as e:
+            logger.error(f"Failed to archive geofence events: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager for startup and shutdown events."""
@@ -38,15 +85,28 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     try:
         # Initialize database
-        init_database()
-        if not check_database_connection():
+        await init_async_database()
+        if not await check_async_database_connection():
             raise Exception("Database connection failed")
         logger.info("Database initialized successfully")
         
         # Initialize Kafka
         await init_kafka()
+        await init_shared_kafka()
         logger.info("Kafka connection initialized")
         
+        # Start the media counter flush; it only needs Redis (created lazily by
+        # get_redis), so MongoDB stays optional
+        app.state.counter_flush_task = asyncio.create_task(flush_media_counters_periodically())
+        
+        # Geofence trigger counters are served from a periodically refreshed view
+        app.state.stats_refresh_task = asyncio.create_task(refresh_geofence_stats_periodically())
+        app.state.event_archive_task = asyncio.create_task(archive_geofence_events_periodically())
+        
+        # Render the OpenAPI document once per worker instead of on first request
+        app.openapi_schema = app.openapi()
+        app.state.openapi_json = ORJSONResponse(app.openapi_schema).body
+        
         logger.info("Backend startup completed successfully")
         
     except Exception as e:
@@ -59,7 +119,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down Panic Alert System Backend...")
     
     try:
+        # Stop the periodic flush, then apply whatever is still buffered
+        app.state.counter_flush_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await app.state.counter_flush_task
+        try:
+            async with AsyncSessionLocal() as db:
+                await flush_media_counters(db)
+        except Exception as e:
+            logger.error(f"Failed to flush media counters: {e}")
+        await close_shared_db()
+        
+        for task in (app.state.stats_refresh_task, app.state.event_archive_task):
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        
         # Close Kafka connections
+        await close_shared_kafka()
         await close_kafka()
         logger.info("Kafka connections closed")
         
@@ -68,16 +145,73 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
 
-# Create FastAPI application
+class ExceptionASGIMiddleware:
+    """Pure ASGI catch-all that turns unhandled exceptions into a JSON 500."""
+    
+    _BODY = b'{"detail":"Internal server error occurred"}'
+    _HEADERS = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_BODY)).encode()),
+    ]
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            logger.exception(f"Unhandled exception on {scope['method']} {scope['path']}")
+            # Too late to replace a response that is already on the wire
+            if response_started:
+                raise
+            await send({"type": "http.response.start", "status": 500, "headers": self._HEADERS})
+            await send({"type": "http.response.body", "body": self._BODY})
+
+# Create FastAPI application. The OpenAPI and docs routes are registered
+# below so /openapi.json can serve the document pre-rendered at startup.
+OPENAPI_URL = "/openapi.json"
+
 app = FastAPI(
     title="Panic Alert System API",
     description="Backend API for the Panic Alert System with real-time emergency response capabilities",
     version="1.0.0",
-    docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
-    redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json():
+    """Serve the OpenAPI document rendered during startup."""
+    return Response(app.state.openapi_json, media_type="application/json")
+
+if settings.ENVIRONMENT == "development":
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui():
+        return get_swagger_ui_html(openapi_url=OPENAPI_URL, title=f"{app.title} - Swagger UI")
+    
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc():
+        return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
+
+# Innermost middleware: routes let unexpected errors propagate to it
+app.add_middleware(ExceptionASGIMiddleware)
+
 # Add security middleware
 app.add_middleware(
     TrustedHostMiddleware,
@@ -85,13 +219,16 @@ app.add_middleware(
 )
 
 # Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
+_CORS_OPTIONS = dict(
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
 )
+app.add_middleware(CORSMiddleware, **_CORS_OPTIONS)
+
+# Compress larger responses (list endpoints); small ones aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # Health check endpoint
 @app.get("/health")
@@ -152,20 +289,52 @@ app.include_router(
     tags=["Agents"]
 )
 
-# Global exception handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    logger.error(f"Global exception: {exc}")
-    return HTTPException(
-        status_code=500,
-        detail="Internal server error occurred"
-    )
+# Fast path for latency-critical traffic (load-balancer probes, panic alert
+# triggers): a separate app that skips the main app's compression but keeps
+# its host check. Clients opt in by calling /fast/api/v1/alerts/... (and
+# /fast/health) instead of the unprefixed paths, which keep working.
+FAST_PATH_PREFIX = "/fast"
+
+fast_app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None, default_response_class=ORJSONResponse)
+fast_app.add_middleware(ExceptionASGIMiddleware)
+fast_app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
+fast_app.add_middleware(CORSMiddleware, **_CORS_OPTIONS)
+fast_app.add_api_route(f"{FAST_PATH_PREFIX}/health", health_check, methods=["GET"])
+fast_app.include_router(
+    alert_router,
+    prefix=f"{FAST_PATH_PREFIX}/api/v1/alerts",
+    tags=["Alerts"]
+)
+
+class FastPathMiddleware:
+    """Pure ASGI dispatch of ``prefix/...`` requests to a separate app."""
+    
+    def __init__(self, app, fast_app, prefix: str):
+        self.app = app
+        self.fast_app = fast_app
+        self.prefix = prefix.rstrip("/") + "/"
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.prefix):
+            await self.fast_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+# Added last so it runs first among the user middleware
+app.add_middleware(FastPathMiddleware, fast_app=fast_app, prefix=FAST_PATH_PREFIX)
 
 if __name__ == "__main__":
+    development = settings.ENVIRONMENT == "development"
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.ENVIRONMENT == "development",
-        log_level="info"
+        # "auto" picks uvloop/httptools when installed (not on Windows) and asyncio/h11 otherwise
+        loop="auto",
+        http="auto",
+        workers=None if development else settings.WORKERS or 2 * (os.cpu_count() or 1) + 1,
+        limit_concurrency=settings.LIMIT_CONCURRENCY,
+        reload=development,
+        log_level="info",
+        access_log=False
     )
\ No newline at end of file
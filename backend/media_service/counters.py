@@ -0,0 +1,92 @@
+import logging
+import uuid
+from typing import Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.database import RedisKeys, get_redis
+from .models import MediaFile, MediaShare, MediaFileCounter, MediaShareCounter, upsert_counter_deltas
+
+logger = logging.getLogger(__name__)
+
+# Counter kind -> (counter model, primary key column, parent model, counter fields)
+COUNTER_KINDS = {
+    "file": (MediaFileCounter, "media_file_id", MediaFile, ("view_count", "download_count")),
+    "share": (MediaShareCounter, "share_id", MediaShare, ("view_count", "download_count")),
+}
+
+FLUSH_BATCH_SIZE = 500
+
+async def record_media_hit(kind: str, object_id, field: str) -> None:
+    """Bump a view/download counter in Redis; never fails the request."""
+    try:
+        redis = await get_redis()
+        object_id = str(object_id)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.incr(RedisKeys.media_counter(kind, object_id, field))
+            pipe.sadd(RedisKeys.media_counters_dirty(kind), object_id)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record media {kind} {field} for {object_id}: {e}")
+
+async def _restore_deltas(redis, kind: str, fields, rows: List[Dict], key_column: str) -> None:
+    """Put popped deltas back into Redis so the next flush applies them."""
+    async with redis.pipeline(transaction=False) as pipe:
+        for row in rows:
+            object_id = row[key_column]
+            for field in fields:
+                if row[field]:
+                    pipe.incrby(RedisKeys.media_counter(kind, object_id, field), row[field])
+            pipe.sadd(RedisKeys.media_counters_dirty(kind), object_id)
+        await pipe.execute()
+
+async def flush_media_counters(db: AsyncSession) -> int:
+    """Fold the buffered Redis deltas into the counter tables.
+    
+    Meant to run periodically. Each key is read with GETDEL, so increments
+    that land while a flush is in progress are kept for the next one. If
+    the write fails, the popped deltas are added back to Redis. Deltas for
+    files or shares deleted since the hit are dropped.
+    Returns the number of counter rows updated.
+    """
+    redis = await get_redis()
+    flushed = 0
+    
+    for kind, (model, key_column, parent, fields) in COUNTER_KINDS.items():
+        while True:
+            object_ids = await redis.spop(RedisKeys.media_counters_dirty(kind), FLUSH_BATCH_SIZE)
+            if not object_ids:
+                break
+            
+            async with redis.pipeline(transaction=False) as pipe:
+                for object_id in object_ids:
+                    for field in fields:
+                        pipe.getdel(RedisKeys.media_counter(kind, object_id, field))
+                values = await pipe.execute()
+            
+            rows: List[Dict] = []
+            for i, object_id in enumerate(object_ids):
+                deltas = values[i * len(fields):(i + 1) * len(fields)]
+                row = {key_column: object_id}
+                row.update({field: int(delta or 0) for field, delta in zip(fields, deltas)})
+                rows.append(row)
+            
+            try:
+                existing = {
+                    str(object_id) for object_id in (await db.execute(
+                        select(parent.id).where(parent.id.in_([uuid.UUID(object_id) for object_id in object_ids]))
+                    )).scalars()
+                }
+                live_rows = [row for row in rows if row[key_column] in existing]
+                if live_rows:
+                    await db.execute(upsert_counter_deltas(model, live_rows))
+                    await db.commit()
+            except Exception:
+                await db.rollback()
+                await _restore_deltas(redis, kind, fields, rows, key_column)
+                raise
+            flushed += len(live_rows)
+    
+    logger.info(f"Flushed {flushed} media counter rows")
+    return flushed
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, Float, JSON, ForeignKey, Index, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, BigInteger, SmallInteger, Float, ForeignKey, Index, Enum, DDL, event, select, bindparam, literal_column, FetchedValue
+from sqlalchemy.dialects.postgresql import UUID, JSONB, insert as pg_insert
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from backend.database import Base
+from typing import List
 import uuid
 import enum
 
@@ -29,24 +31,108 @@ class MediaVisibility(enum.Enum):
     SHARED = "shared"
     PUBLIC = "public"
 
+class ProcessingStatus(enum.Enum):
+    """Media processing status enumeration."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class VirusScanStatus(enum.Enum):
+    """Virus scan status enumeration."""
+    PENDING = "pending"
+    CLEAN = "clean"
+    INFECTED = "infected"
+    FAILED = "failed"
+
+class ModerationStatus(enum.Enum):
+    """Content moderation status enumeration."""
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+    FLAGGED = "flagged"
+
+class ShareType(enum.Enum):
+    """Media share type enumeration."""
+    USER = "user"
+    PUBLIC = "public"
+    LINK = "link"
+
+class AccessType(enum.Enum):
+    """Media access type enumeration."""
+    VIEW = "view"
+    DOWNLOAD = "download"
+    SHARE = "share"
+    DELETE = "delete"
+
+class AccessMethod(enum.Enum):
+    """Media access method enumeration."""
+    DIRECT = "direct"
+    SHARE_LINK = "share_link"
+    API = "api"
+
+class JobType(enum.Enum):
+    """Media processing job type enumeration."""
+    THUMBNAIL = "thumbnail"
+    TRANSCODE = "transcode"
+    COMPRESS = "compress"
+    WATERMARK = "watermark"
+    CONVERT = "convert"
+    EXTRACT_METADATA = "extract_metadata"
+    VIRUS_SCAN = "virus_scan"
+
+class JobStatus(enum.Enum):
+    """Media processing job status enumeration."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class AnalyticsType(enum.Enum):
+    """Media analytics period enumeration."""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+def flag_property(bit: int, default_flags: int = 0) -> hybrid_property:
+    """Expose one bit of a model's ``flags`` column as a boolean attribute.
+    
+    Works on instances (read/write) and in queries, e.g.
+    ``select(MediaFile).where(MediaFile.is_public)``.
+    """
+    def fget(self):
+        flags = self.flags if self.flags is not None else default_flags
+        return bool(flags & bit)
+    
+    def fset(self, value):
+        flags = self.flags if self.flags is not None else default_flags
+        self.flags = flags | bit if value else flags & ~bit
+    
+    def expr(cls):
+        # Inline the constants so the predicate matches the partial indexes on (flags & N) <> 0
+        return cls.flags.op('&')(literal_column(str(bit))) != literal_column("0")
+    
+    return hybrid_property(fget, fset, expr=expr)
+
 class MediaFile(Base):
     """Media file model for storing uploaded media files."""
     __tablename__ = "media_files"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # Reference to user service
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), nullable=False)  # Reference to user service
     
     # File information
     original_filename = Column(String(255), nullable=False)
     filename = Column(String(255), nullable=False, index=True)
-    file_extension = Column(String(10), nullable=False, index=True)
-    mime_type = Column(String(100), nullable=False, index=True)
-    file_size = Column(Integer, nullable=False, index=True)
+    file_extension = Column(String(10), nullable=False)
+    mime_type = Column(String(100), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
     
     # Media classification
-    media_type = Column(Enum(MediaType), nullable=False, index=True)
-    status = Column(Enum(MediaStatus), default=MediaStatus.UPLOADING, nullable=False, index=True)
-    visibility = Column(Enum(MediaVisibility), default=MediaVisibility.PRIVATE, nullable=False, index=True)
+    media_type = Column(Enum(MediaType), nullable=False)
+    status = Column(Enum(MediaStatus), default=MediaStatus.UPLOADING, nullable=False)
+    visibility = Column(Enum(MediaVisibility), default=MediaVisibility.PRIVATE, nullable=False)
     
     # Storage information
     storage_path = Column(String(500), nullable=False)
@@ -64,7 +150,7 @@ class MediaFile(Base):
     # Content information
     title = Column(String(200))
     description = Column(Text)
-    tags = Column(JSON)  # Array of tags
+    tags = Column(JSONB)  # Array of tags
     
     # Location information (EXIF data or manual)
     latitude = Column(Float)
@@ -72,9 +158,8 @@ class MediaFile(Base):
     location_name = Column(String(200))
     
     # Processing information
-    processing_status = Column(String(20), default='pending')  # 'pending', 'processing', 'completed', 'failed'
-    processing_progress = Column(Integer, default=0)  # 0-100
-    processing_error = Column(Text)
+    processing_status = Column(Enum(ProcessingStatus), default=ProcessingStatus.PENDING)
+    processing_progress = Column(SmallInteger, default=0)  # 0-100
     
     # Thumbnails and previews
     thumbnail_path = Column(String(500))
@@ -82,41 +167,40 @@ class MediaFile(Base):
     preview_path = Column(String(500))
     preview_url = Column(String(500))
     
-    # Security and compliance
-    is_encrypted = Column(Boolean, default=False, nullable=False)
-    encryption_key_id = Column(String(255))
-    virus_scan_status = Column(String(20), default='pending')  # 'pending', 'clean', 'infected', 'failed'
-    virus_scan_result = Column(JSON)
+    # Boolean attributes packed into one column; see the FLAG_* bits below
+    flags = Column(SmallInteger, default=0, nullable=False)
     
-    # Access control
-    is_public = Column(Boolean, default=False, nullable=False)
-    access_token = Column(String(255), unique=True, index=True)  # For secure access
-    download_count = Column(Integer, default=0, nullable=False)
-    view_count = Column(Integer, default=0, nullable=False)
+    FLAG_ENCRYPTED = 1
+    FLAG_PUBLIC = 2
+    FLAG_BACKED_UP = 4
+    FLAG_AUTO_DELETE = 8
     
-    # Backup and archival
-    is_backed_up = Column(Boolean, default=False, nullable=False)
-    backup_path = Column(String(500))
-    backup_timestamp = Column(DateTime(timezone=True))
+    is_encrypted = flag_property(FLAG_ENCRYPTED)
+    is_public = flag_property(FLAG_PUBLIC)
+    is_backed_up = flag_property(FLAG_BACKED_UP)
+    auto_delete = flag_property(FLAG_AUTO_DELETE)
     
-    # Content moderation
-    moderation_status = Column(String(20), default='pending')  # 'pending', 'approved', 'rejected', 'flagged'
-    moderation_score = Column(Float)  # 0.0 to 1.0
-    moderation_labels = Column(JSON)  # AI-generated content labels
+    # Access control
+    access_token = Column(String(255), unique=True, index=True)  # For secure access
     
     # Expiration
     expires_at = Column(DateTime(timezone=True))
-    auto_delete = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     last_accessed = Column(DateTime(timezone=True))
     
     # Relationships
     shares = relationship("MediaShare", back_populates="media_file", cascade="all, delete-orphan")
     access_logs = relationship("MediaAccessLog", back_populates="media_file", cascade="all, delete-orphan")
     processing_jobs = relationship("MediaProcessingJob", back_populates="media_file", cascade="all, delete-orphan")
+    counters = relationship("MediaFileCounter", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    # Rarely read columns; load explicitly, e.g. options(selectinload(MediaFile.meta))
+    meta = relationship(
+        "MediaFileMeta", back_populates="media_file", uselist=False, lazy="raise",
+        cascade="all, delete-orphan", passive_deletes=True
+    )
     
     # Indexes
     __table_args__ = (
@@ -126,87 +210,136 @@ class MediaFile(Base):
         Index('idx_media_created_at', 'created_at'),
         Index('idx_media_size', 'file_size'),
         Index('idx_media_location', 'latitude', 'longitude'),
-        Index('idx_media_expires', 'expires_at', 'auto_delete'),
-        Index('idx_media_backup', 'is_backed_up', 'backup_timestamp'),
+        # Partial on FLAG_AUTO_DELETE in place of the old boolean key column
+        Index('idx_media_expires', 'expires_at', postgresql_where=text("flags & 8 <> 0")),
+        # Containment lookups, e.g. MediaFile.tags.contains(["panic"])
+        Index('idx_media_tags_gin', 'tags', postgresql_using='gin'),
     )
     
     def __repr__(self):
         return f"<MediaFile(id={self.id}, filename={self.filename}, type={self.media_type.value}, user_id={self.user_id})>"
 
+class MediaFileMeta(Base):
+    """Security, backup and moderation details of a media file.
+    
+    Kept out of ``media_files`` so listing and lookup scans read narrow rows.
+    """
+    __tablename__ = "media_file_meta"
+    
+    media_file_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Processing information
+    processing_error = Column(Text)
+    
+    # Security and compliance
+    encryption_key_id = Column(String(255))
+    virus_scan_status = Column(Enum(VirusScanStatus), default=VirusScanStatus.PENDING)
+    virus_scan_result = Column(JSONB)
+    
+    # Backup and archival
+    backup_path = Column(String(500))
+    backup_timestamp = Column(DateTime(timezone=True))
+    
+    # Content moderation
+    moderation_status = Column(Enum(ModerationStatus), default=ModerationStatus.PENDING)
+    moderation_score = Column(Float)  # 0.0 to 1.0
+    moderation_labels = Column(JSONB)  # AI-generated content labels
+    
+    # Relationships
+    media_file = relationship("MediaFile", back_populates="meta")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_media_meta_backup', 'backup_timestamp'),
+        Index('idx_media_meta_moderation_labels_gin', 'moderation_labels', postgresql_using='gin'),
+    )
+    
+    def __repr__(self):
+        return f"<MediaFileMeta(media_file_id={self.media_file_id}, virus_scan={self.virus_scan_status})>"
+
 class MediaShare(Base):
     """Media share model for sharing media files between users."""
     __tablename__ = "media_shares"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     media_file_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="CASCADE"), nullable=False, index=True)
-    owner_user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    owner_user_id = Column(UUID(as_uuid=True), nullable=False)
     shared_with_user_id = Column(UUID(as_uuid=True), index=True)  # NULL for public shares
     
     # Share configuration
     share_token = Column(String(255), unique=True, nullable=False, index=True)
-    share_type = Column(String(20), nullable=False)  # 'user', 'public', 'link'
+    share_type = Column(Enum(ShareType), nullable=False)
+    
+    # Permissions and state packed into one column; see the FLAG_* bits below
+    FLAG_CAN_VIEW = 1
+    FLAG_CAN_DOWNLOAD = 2
+    FLAG_CAN_SHARE = 4
+    FLAG_PASSWORD_PROTECTED = 8
+    FLAG_ACTIVE = 16
+    DEFAULT_FLAGS = FLAG_CAN_VIEW | FLAG_CAN_DOWNLOAD | FLAG_ACTIVE
     
-    # Permissions
-    can_view = Column(Boolean, default=True, nullable=False)
-    can_download = Column(Boolean, default=True, nullable=False)
-    can_share = Column(Boolean, default=False, nullable=False)
+    flags = Column(SmallInteger, default=DEFAULT_FLAGS, nullable=False)
+    
+    can_view = flag_property(FLAG_CAN_VIEW, DEFAULT_FLAGS)
+    can_download = flag_property(FLAG_CAN_DOWNLOAD, DEFAULT_FLAGS)
+    can_share = flag_property(FLAG_CAN_SHARE, DEFAULT_FLAGS)
+    password_protected = flag_property(FLAG_PASSWORD_PROTECTED, DEFAULT_FLAGS)
+    is_active = flag_property(FLAG_ACTIVE, DEFAULT_FLAGS)
     
     # Access restrictions
     max_downloads = Column(Integer)  # NULL for unlimited
     max_views = Column(Integer)      # NULL for unlimited
-    password_protected = Column(Boolean, default=False, nullable=False)
     password_hash = Column(String(255))
     
     # Tracking
-    download_count = Column(Integer, default=0, nullable=False)
-    view_count = Column(Integer, default=0, nullable=False)
     last_accessed = Column(DateTime(timezone=True))
     
     # Expiration
     expires_at = Column(DateTime(timezone=True))
-    is_active = Column(Boolean, default=True, nullable=False)
     
     # Metadata
     share_message = Column(Text)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Relationships
     media_file = relationship("MediaFile", back_populates="shares")
+    counters = relationship("MediaShareCounter", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
     
     # Indexes
     __table_args__ = (
-        Index('idx_share_media_active', 'media_file_id', 'is_active'),
+        # Active shares only (FLAG_ACTIVE)
+        Index('idx_share_media_active', 'media_file_id', postgresql_where=text("flags & 16 <> 0")),
         Index('idx_share_owner_shared', 'owner_user_id', 'shared_with_user_id'),
-        Index('idx_share_expires', 'expires_at', 'is_active'),
-        Index('idx_share_type_active', 'share_type', 'is_active'),
+        Index('idx_share_expires', 'expires_at', postgresql_where=text("flags & 16 <> 0")),
+        Index('idx_share_type_active', 'share_type', postgresql_where=text("flags & 16 <> 0")),
     )
     
     def __repr__(self):
-        return f"<MediaShare(id={self.id}, media_file_id={self.media_file_id}, type={self.share_type})>"
+        return f"<MediaShare(id={self.id}, media_file_id={self.media_file_id}, type={self.share_type.value})>"
 
 class MediaAccessLog(Base):
     """Media access log model for tracking file access."""
     __tablename__ = "media_access_logs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    media_file_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="CASCADE"), nullable=False, index=True)
-    user_id = Column(UUID(as_uuid=True), index=True)  # NULL for anonymous access
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    media_file_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True))  # NULL for anonymous access
     
     # Access details
-    access_type = Column(String(20), nullable=False, index=True)  # 'view', 'download', 'share', 'delete'
-    access_method = Column(String(20), nullable=False)  # 'direct', 'share_link', 'api'
+    access_type = Column(Enum(AccessType), nullable=False)
+    access_method = Column(Enum(AccessMethod), nullable=False)
     
     # Request information
-    ip_address = Column(String(45), nullable=False, index=True)
+    ip_address = Column(String(45), nullable=False)
     user_agent = Column(Text)
     referer = Column(String(500))
     
     # Response information
     response_status = Column(Integer, nullable=False)  # HTTP status code
-    bytes_transferred = Column(Integer, default=0)
+    bytes_transferred = Column(BigInteger, default=0)
     
     # Geolocation (optional)
     country = Column(String(100))
@@ -215,8 +348,8 @@ class MediaAccessLog(Base):
     # Share context (if accessed via share)
     share_id = Column(UUID(as_uuid=True), ForeignKey("media_shares.id", ondelete="SET NULL"))
     
-    # Timestamp
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Timestamp (partition key, hence part of the primary key)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     
     # Relationships
     media_file = relationship("MediaFile", back_populates="access_logs")
@@ -228,29 +361,32 @@ class MediaAccessLog(Base):
         Index('idx_access_user_timestamp', 'user_id', 'timestamp'),
         Index('idx_access_type_timestamp', 'access_type', 'timestamp'),
         Index('idx_access_ip_timestamp', 'ip_address', 'timestamp'),
+        # Append-only, time-ordered rows: BRIN covers range scans at a fraction of a btree's size
+        Index('idx_access_log_ts_brin', 'timestamp', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
     
     def __repr__(self):
-        return f"<MediaAccessLog(id={self.id}, media_file_id={self.media_file_id}, type={self.access_type})>"
+        return f"<MediaAccessLog(id={self.id}, media_file_id={self.media_file_id}, type={self.access_type.value})>"
 
 class MediaProcessingJob(Base):
     """Media processing job model for tracking media processing tasks."""
     __tablename__ = "media_processing_jobs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    media_file_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    media_file_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="CASCADE"), nullable=False)
     
     # Job information
-    job_type = Column(String(50), nullable=False, index=True)  # 'thumbnail', 'transcode', 'compress', 'watermark'
+    job_type = Column(Enum(JobType), nullable=False)
     job_name = Column(String(100), nullable=False)
-    job_parameters = Column(JSON, nullable=False)
+    job_parameters = Column(JSONB, nullable=False)
     
     # Processing status
-    status = Column(String(20), default='pending', nullable=False, index=True)  # 'pending', 'processing', 'completed', 'failed', 'cancelled'
-    progress_percentage = Column(Integer, default=0, nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    progress_percentage = Column(SmallInteger, default=0, nullable=False)
     
     # Priority and scheduling
-    priority = Column(Integer, default=5, nullable=False)  # 1-10, higher is more priority
+    priority = Column(SmallInteger, default=5, nullable=False)  # 1-10, higher is more priority
     scheduled_at = Column(DateTime(timezone=True))
     
     # Processing details
@@ -258,14 +394,14 @@ class MediaProcessingJob(Base):
     processing_node = Column(String(100))  # Processing server/node
     
     # Results
-    output_files = Column(JSON)  # List of generated output files
+    output_files = Column(JSONB)  # List of generated output files
     processing_time_seconds = Column(Float)
     
     # Error handling
     error_message = Column(Text)
-    error_details = Column(JSON)
-    retry_count = Column(Integer, default=0, nullable=False)
-    max_retries = Column(Integer, default=3, nullable=False)
+    error_details = Column(JSONB)
+    retry_count = Column(SmallInteger, default=0, nullable=False)
+    max_retries = Column(SmallInteger, default=3, nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -285,7 +421,7 @@ class MediaProcessingJob(Base):
     )
     
     def __repr__(self):
-        return f"<MediaProcessingJob(id={self.id}, type={self.job_type}, status={self.status})>"
+        return f"<MediaProcessingJob(id={self.id}, type={self.job_type.value}, status={self.status.value})>"
 
 class MediaCollection(Base):
     """Media collection model for organizing media files into collections."""
@@ -303,26 +439,24 @@ class MediaCollection(Base):
     is_featured = Column(Boolean, default=False, nullable=False)
     
     # Metadata
-    tags = Column(JSON)  # Array of tags
+    tags = Column(JSONB)  # Array of tags
     cover_media_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="SET NULL"))
     
-    # Statistics
-    media_count = Column(Integer, default=0, nullable=False)
-    total_size_bytes = Column(Integer, default=0, nullable=False)
-    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Relationships
     cover_media = relationship("MediaFile", foreign_keys=[cover_media_id])
     collection_items = relationship("MediaCollectionItem", back_populates="collection", cascade="all, delete-orphan")
+    stats = relationship("MediaCollectionStats", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
     
     # Indexes
     __table_args__ = (
         Index('idx_collection_user_public', 'user_id', 'is_public'),
         Index('idx_collection_featured', 'is_featured', 'created_at'),
         Index('idx_collection_name', 'name'),
+        Index('idx_collection_tags_gin', 'tags', postgresql_using='gin'),
     )
     
     def __repr__(self):
@@ -362,16 +496,16 @@ class MediaAnalytics(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
-    # Analytics period
-    analytics_date = Column(DateTime(timezone=True), nullable=False, index=True)
-    analytics_type = Column(String(20), nullable=False, index=True)  # 'daily', 'weekly', 'monthly'
+    # Analytics period (partition key, hence part of the primary key)
+    analytics_date = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    analytics_type = Column(Enum(AnalyticsType), nullable=False, index=True)
     
     # Scope
     user_id = Column(UUID(as_uuid=True), index=True)  # NULL for system-wide analytics
     
     # Upload statistics
     total_uploads = Column(Integer, default=0, nullable=False)
-    total_upload_size_bytes = Column(Integer, default=0, nullable=False)
+    total_upload_size_bytes = Column(BigInteger, default=0, nullable=False)
     image_uploads = Column(Integer, default=0, nullable=False)
     video_uploads = Column(Integer, default=0, nullable=False)
     audio_uploads = Column(Integer, default=0, nullable=False)
@@ -383,8 +517,8 @@ class MediaAnalytics(Base):
     unique_viewers = Column(Integer, default=0, nullable=False)
     
     # Storage statistics
-    total_storage_used_bytes = Column(Integer, default=0, nullable=False)
-    total_bandwidth_used_bytes = Column(Integer, default=0, nullable=False)
+    total_storage_used_bytes = Column(BigInteger, default=0, nullable=False)
+    total_bandwidth_used_bytes = Column(BigInteger, default=0, nullable=False)
     
     # Processing statistics
     processing_jobs_completed = Column(Integer, default=0, nullable=False)
@@ -397,16 +531,66 @@ class MediaAnalytics(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Indexes
     __table_args__ = (
         Index('idx_analytics_date_type', 'analytics_date', 'analytics_type'),
         Index('idx_analytics_user_date', 'user_id', 'analytics_date'),
+        Index('idx_analytics_date_brin', 'analytics_date', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        {'postgresql_partition_by': 'RANGE (analytics_date)'},
     )
     
     def __repr__(self):
-        return f"<MediaAnalytics(id={self.id}, date={self.analytics_date}, type={self.analytics_type}, user_id={self.user_id})>"
+        return f"<MediaAnalytics(id={self.id}, date={self.analytics_date}, type={self.analytics_type.value}, user_id={self.user_id})>"
+
+# Monthly partitions for media_access_logs and media_analytics.
+# create_media_partition() should be run ahead of each month (e.g. from
+# pg_cron) and drop_media_partitions() prunes months past retention; the
+# default partitions only catch rows that arrive before their month exists.
+# One statement per DDL: asyncpg prepares each statement and rejects
+# multi-statement strings.
+_MEDIA_PARTITION_FUNCTIONS = [DDL("""
+    CREATE OR REPLACE FUNCTION create_media_partition(parent text, month_start date) RETURNS void AS $$
+    DECLARE
+        start_ts date := date_trunc('month', month_start);
+        end_ts date := (date_trunc('month', month_start) + interval '1 month')::date;
+    BEGIN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %%I PARTITION OF %%I FOR VALUES FROM (%%L) TO (%%L)',
+            parent || '_' || to_char(start_ts, 'YYYY_MM'), parent, start_ts, end_ts
+        );
+    END;
+    $$ LANGUAGE plpgsql
+"""), DDL("""
+    CREATE OR REPLACE FUNCTION drop_media_partitions(parent text, retention interval) RETURNS void AS $$
+    DECLARE
+        part text;
+    BEGIN
+        FOR part IN
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = parent::regclass
+              AND c.relname ~ ('^' || parent || '_[0-9]{4}_[0-9]{2}$')
+              AND to_date(right(c.relname, 7), 'YYYY_MM') + interval '1 month' <= now() - retention
+        LOOP
+            EXECUTE format('ALTER TABLE %%I DETACH PARTITION %%I', parent, part);
+            EXECUTE format('DROP TABLE %%I', part);
+        END LOOP;
+    END;
+    $$ LANGUAGE plpgsql
+""")]
+
+def _media_partitions_ddl(table_name: str) -> List[DDL]:
+    return [
+        DDL(f"SELECT create_media_partition('{table_name}', current_date)"),
+        DDL(f"SELECT create_media_partition('{table_name}', (current_date + interval '1 month')::date)"),
+        DDL(f"CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT"),
+    ]
+
+for _table in (MediaAccessLog.__table__, MediaAnalytics.__table__):
+    for _ddl in _MEDIA_PARTITION_FUNCTIONS + _media_partitions_ddl(_table.name):
+        event.listen(_table, "after_create", _ddl)
 
 class MediaQuota(Base):
     """Media quota model for tracking user storage quotas."""
@@ -416,12 +600,12 @@ class MediaQuota(Base):
     user_id = Column(UUID(as_uuid=True), nullable=False, unique=True, index=True)
     
     # Quota limits (in bytes)
-    storage_quota_bytes = Column(Integer, nullable=False)
-    bandwidth_quota_bytes = Column(Integer, nullable=False)  # Monthly bandwidth
+    storage_quota_bytes = Column(BigInteger, nullable=False)
+    bandwidth_quota_bytes = Column(BigInteger, nullable=False)  # Monthly bandwidth
     
     # Current usage (in bytes)
-    storage_used_bytes = Column(Integer, default=0, nullable=False)
-    bandwidth_used_bytes = Column(Integer, default=0, nullable=False)
+    storage_used_bytes = Column(BigInteger, default=0, nullable=False)
+    bandwidth_used_bytes = Column(BigInteger, default=0, nullable=False)
     
     # File count limits
     max_files = Column(Integer)
@@ -436,7 +620,7 @@ class MediaQuota(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Indexes
     __table_args__ = (
@@ -445,4 +629,60 @@ class MediaQuota(Base):
     )
     
     def __repr__(self):
-        return f"<MediaQuota(id={self.id}, user_id={self.user_id}, storage_used={self.storage_used_bytes})>"
\ No newline at end of file
+        return f"<MediaQuota(id={self.id}, user_id={self.user_id}, storage_used={self.storage_used_bytes})>"
+
+# Hot counters live in narrow tables so bumping them never rewrites (and
+# re-indexes) the wide parent rows. Increments are buffered in Redis and
+# folded in by media_service.counters.flush_media_counters().
+
+class MediaFileCounter(Base):
+    """View/download counters for a media file."""
+    __tablename__ = "media_file_counters"
+    
+    media_file_id = Column(UUID(as_uuid=True), ForeignKey("media_files.id", ondelete="CASCADE"), primary_key=True)
+    view_count = Column(BigInteger, default=0, nullable=False)
+    download_count = Column(BigInteger, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<MediaFileCounter(media_file_id={self.media_file_id}, views={self.view_count}, downloads={self.download_count})>"
+
+class MediaShareCounter(Base):
+    """View/download counters for a media share."""
+    __tablename__ = "media_share_counters"
+    
+    share_id = Column(UUID(as_uuid=True), ForeignKey("media_shares.id", ondelete="CASCADE"), primary_key=True)
+    view_count = Column(BigInteger, default=0, nullable=False)
+    download_count = Column(BigInteger, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<MediaShareCounter(share_id={self.share_id}, views={self.view_count}, downloads={self.download_count})>"
+
+class MediaCollectionStats(Base):
+    """Item count and total size of a media collection."""
+    __tablename__ = "media_collection_stats"
+    
+    collection_id = Column(UUID(as_uuid=True), ForeignKey("media_collections.id", ondelete="CASCADE"), primary_key=True)
+    media_count = Column(Integer, default=0, nullable=False)
+    total_size_bytes = Column(BigInteger, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<MediaCollectionStats(collection_id={self.collection_id}, media_count={self.media_count})>"
+
+def upsert_counter_deltas(model, rows):
+    """Build an upsert that adds the counter deltas in ``rows`` to ``model``.
+    
+    Each row holds the primary key plus the deltas to apply; a missing
+    counter row is created with the deltas as its starting values.
+    """
+    stmt = pg_insert(model).values(rows)
+    table = model.__table__
+    key = [col.name for col in table.primary_key.columns]
+    updates = {name: table.c[name] + stmt.excluded[name] for name in rows[0] if name not in key}
+    return stmt.on_conflict_do_update(index_elements=key, set_=updates)
+
+# Owner-scoped file lookup used by every per-file endpoint. Built once so the
+# statement cache key is stable and requests only bind parameters.
+GET_USER_MEDIA_FILE = select(MediaFile).where(
+    MediaFile.id == bindparam("media_file_id"),
+    MediaFile.user_id == bindparam("user_id")
+)
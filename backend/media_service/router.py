@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
@@ -16,8 +16,9 @@ from .schemas import (
     MediaFileListResponse,
     MediaFileUpdate
 )
-from .models import MediaFile, MediaType
-from shared.kafka_client import publish_media_event
+from .models import MediaFile, MediaType, AccessType, AccessMethod, GET_USER_MEDIA_FILE
+from .counters import record_media_hit
+from shared.kafka_client import publish_media_event, publish_media_access_event
 from shared.config import get_settings
 
 settings = get_settings()
@@ -35,6 +36,21 @@ MAX_VIDEO_SIZE = 50 * 1024 * 1024  # 50MB
 MAX_AUDIO_SIZE = 20 * 1024 * 1024  # 20MB
 MAX_DOCUMENT_SIZE = 5 * 1024 * 1024  # 5MB
 
+def log_media_access(request: Request, media_file: MediaFile, user_id: UUID, access_type: AccessType, bytes_transferred: int = 0):
+    """Queue a MediaAccessLog event; sent in batches, never awaited by the request."""
+    publish_media_access_event({
+        "media_id": str(media_file.id),
+        "user_id": str(user_id),
+        "access_type": access_type.value,
+        "access_method": AccessMethod.API.value,
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent"),
+        "referer": request.headers.get("referer"),
+        "response_status": status.HTTP_200_OK,
+        "bytes_transferred": bytes_transferred,
+        "timestamp": datetime.utcnow().isoformat()
+    })
+
 def get_media_type(content_type: str) -> MediaType:
     """Determine media type from content type."""
     if content_type in ALLOWED_IMAGE_TYPES:
@@ -217,6 +233,7 @@ async def get_user_media_files(
     media_type_filter: Optional[MediaType] = None,
     emergency_only: bool = False,
     search: Optional[str] = None,
+    tag: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
@@ -235,6 +252,8 @@ async def get_user_media_files(
                 MediaFile.filename.ilike(search_term) |
                 MediaFile.description.ilike(search_term)
             )
+        if tag:
+            query = query.where(MediaFile.tags.contains([tag]))
         
         # Get total count
         count_query = select(func.count(MediaFile.id)).where(MediaFile.user_id == current_user.id)
@@ -248,6 +267,8 @@ async def get_user_media_files(
                 MediaFile.filename.ilike(search_term) |
                 MediaFile.description.ilike(search_term)
             )
+        if tag:
+            count_query = count_query.where(MediaFile.tags.contains([tag]))
         
         total_result = await db.execute(count_query)
         total = total_result.scalar()
@@ -290,16 +311,15 @@ async def get_user_media_files(
 @router.get("/{file_id}", response_model=MediaFileResponse)
 async def get_media_file(
     file_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
     """Get a specific media file by ID."""
     try:
         result = await db.execute(
-            select(MediaFile).where(
-                MediaFile.id == file_id,
-                MediaFile.user_id == current_user.id
-            )
+            GET_USER_MEDIA_FILE,
+            {"media_file_id": file_id, "user_id": current_user.id}
         )
         media_file = result.scalar_one_or_none()
         
@@ -309,6 +329,9 @@ async def get_media_file(
                 detail="Media file not found"
             )
         
+        log_media_access(request, media_file, current_user.id, AccessType.VIEW)
+        await record_media_hit("file", media_file.id, "view_count")
+        
         return MediaFileResponse(
             id=media_file.id,
             filename=media_file.filename,
@@ -334,16 +357,15 @@ async def get_media_file(
 @router.get("/{file_id}/download")
 async def download_media_file(
     file_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
     """Download a media file."""
     try:
         result = await db.execute(
-            select(MediaFile).where(
-                MediaFile.id == file_id,
-                MediaFile.user_id == current_user.id
-            )
+            GET_USER_MEDIA_FILE,
+            {"media_file_id": file_id, "user_id": current_user.id}
         )
         media_file = result.scalar_one_or_none()
         
@@ -368,6 +390,8 @@ async def download_media_file(
             "filename": media_file.filename,
             "timestamp": datetime.utcnow().isoformat()
         })
+        log_media_access(request, media_file, current_user.id, AccessType.DOWNLOAD, media_file.file_size)
+        await record_media_hit("file", media_file.id, "download_count")
         
         return FileResponse(
             path=media_file.file_path,
@@ -393,10 +417,8 @@ async def update_media_file(
     """Update media file metadata."""
     try:
         result = await db.execute(
-            select(MediaFile).where(
-                MediaFile.id == file_id,
-                MediaFile.user_id == current_user.id
-            )
+            GET_USER_MEDIA_FILE,
+            {"media_file_id": file_id, "user_id": current_user.id}
         )
         media_file = result.scalar_one_or_none()
         
@@ -458,10 +480,8 @@ async def delete_media_file(
     """Delete a media file."""
     try:
         result = await db.execute(
-            select(MediaFile).where(
-                MediaFile.id == file_id,
-                MediaFile.user_id == current_user.id
-            )
+            GET_USER_MEDIA_FILE,
+            {"media_file_id": file_id, "user_id": current_user.id}
         )
         media_file = result.scalar_one_or_none()
         
@@ -77,6 +77,7 @@ class Settings(BaseSettings):
         "GEOFENCE_EVENTS": "geofence-events",
         "MEDIA_UPLOADS": "media-uploads",
         "MEDIA_PROCESSING": "media-processing",
+        "MEDIA_ACCESS_LOGS": "media-access-logs",
         "PUSH_NOTIFICATIONS": "push-notifications",
         "SMS_NOTIFICATIONS": "sms-notifications",
         "EMAIL_NOTIFICATIONS": "email-notifications",
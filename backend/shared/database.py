@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.pool import StaticPool
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
@@ -8,6 +9,7 @@ import redis.asyncio as redis
 from typing import AsyncGenerator, Optional
 import logging
 
+from backend.database import AsyncSessionLocal, attach_updated_at_triggers
 from .config import settings
 
 logger = logging.getLogger(__name__)
@@ -21,9 +23,13 @@ engine = create_engine(
     echo=settings.DEBUG
 )
 
+# Prebuilt health-check statement, reused on every probe
+_HEALTH_STMT = text("SELECT 1")
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 metadata = MetaData()
+attach_updated_at_triggers(Base.metadata)
 
 # Global database connections
 postgres_engine = None
@@ -31,6 +37,13 @@ mongo_client: Optional[AsyncIOMotorClient] = None
 mongo_db = None
 redis_client: Optional[redis.Redis] = None
 
+def _create_redis_client() -> redis.Redis:
+    return redis.from_url(
+        settings.REDIS_URL,
+        encoding="utf-8",
+        decode_responses=True
+    )
+
 async def init_db():
     """Initialize all database connections."""
     global postgres_engine, mongo_client, mongo_db, redis_client
@@ -49,11 +62,7 @@ async def init_db():
         logger.info("MongoDB connection initialized")
         
         # Redis connection
-        redis_client = redis.from_url(
-            settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True
-        )
+        redis_client = _create_redis_client()
         
         # Test Redis connection
         await redis_client.ping()
@@ -92,6 +101,13 @@ def get_db() -> Session:
     finally:
         db.close()
 
+# Dependency for getting an async PostgreSQL session; shares the asyncpg pool
+# in backend.database so handlers never block the event loop on queries
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get async PostgreSQL database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Dependency for getting MongoDB database
 async def get_mongo_db():
     """Get MongoDB database instance."""
@@ -101,9 +117,14 @@ async def get_mongo_db():
 
 # Dependency for getting Redis client
 async def get_redis() -> redis.Redis:
-    """Get Redis client instance."""
+    """Get Redis client instance, creating it on first use.
+    
+    Services that only need Redis don't have to go through init_db, which
+    also requires MongoDB. The client connects lazily, so this never blocks.
+    """
+    global redis_client
     if redis_client is None:
-        raise RuntimeError("Redis not initialized")
+        redis_client = _create_redis_client()
     return redis_client
 
 # Database models base class
@@ -181,6 +202,18 @@ class RedisKeys:
     @staticmethod
     def geofence_cache(zone_id: str) -> str:
         return f"geofence:cache:{zone_id}"
+    
+    @staticmethod
+    def user_geofences(user_id: str) -> str:
+        return f"geofences:{user_id}"
+    
+    @staticmethod
+    def media_counter(kind: str, object_id: str, field: str) -> str:
+        return f"media:{kind}:{object_id}:{field}"
+    
+    @staticmethod
+    def media_counters_dirty(kind: str) -> str:
+        return f"media:{kind}:dirty"
 
 # Database health check
 async def check_database_health() -> dict:
@@ -194,7 +227,7 @@ async def check_database_health() -> dict:
     try:
         # Check PostgreSQL
         with SessionLocal() as db:
-            db.execute("SELECT 1")
+            db.execute(_HEALTH_STMT)
             health_status["postgres"] = True
     except Exception as e:
         logger.error(f"PostgreSQL health check failed: {e}")
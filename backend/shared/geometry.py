@@ -0,0 +1,7 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+def pack_coordinates(coordinates: Sequence[Tuple[float, float]]) -> bytes:
+    """Pack ``(lat, lng)`` pairs as 2*N little-endian float64 values: lat0, lng0, lat1, lng1, ..."""
+    return np.asarray(coordinates, dtype='<f8').tobytes()
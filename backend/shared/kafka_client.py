@@ -1,19 +1,22 @@
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
-from kafka import KafkaProducer, KafkaConsumer
-import json
+import orjson
 import asyncio
-from typing import Dict, Any, Optional, Callable, List
+from typing import TYPE_CHECKING, Dict, Any, Optional, Callable, List
 import logging
 from datetime import datetime
 import uuid
 
+from backend.kafka_config import KafkaConfig, kafka_config
 from .config import settings
 
+# aiokafka is imported on first producer/consumer creation to keep worker startup light
+if TYPE_CHECKING:
+    from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+
 logger = logging.getLogger(__name__)
 
 # Global Kafka clients
-producer: Optional[AIOKafkaProducer] = None
-consumers: Dict[str, AIOKafkaConsumer] = {}
+producer: Optional["AIOKafkaProducer"] = None
+consumers: Dict[str, "AIOKafkaConsumer"] = {}
 
 class KafkaMessage:
     """Kafka message wrapper with metadata."""
@@ -32,28 +35,32 @@ class KafkaMessage:
             "data": self.data
         }
     
-    def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+    def to_json(self) -> bytes:
+        return orjson.dumps(self.to_dict())
 
 class KafkaClient:
     """Kafka client wrapper for producing and consuming messages."""
     
     def __init__(self):
-        self.producer: Optional[AIOKafkaProducer] = None
-        self.consumers: Dict[str, AIOKafkaConsumer] = {}
+        self.producer: Optional["AIOKafkaProducer"] = None
+        self.consumers: Dict[str, "AIOKafkaConsumer"] = {}
         self.running_consumers: Dict[str, asyncio.Task] = {}
     
     async def start_producer(self):
         """Start Kafka producer."""
         try:
+            from aiokafka import AIOKafkaProducer
+            
             self.producer = AIOKafkaProducer(
                 bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                value_serializer=orjson.dumps,
                 key_serializer=lambda k: k.encode('utf-8') if k else None,
-                compression_type='gzip',
+                compression_type='lz4',
+                # Let concurrent publishes share a batch instead of one request each
+                linger_ms=5,
                 acks='all',
-                retries=3,
-                max_in_flight_requests_per_connection=1
+                # Idempotent sequencing keeps retried batches in order and deduplicated
+                enable_idempotence=True
             )
             await self.producer.start()
             logger.info("Kafka producer started successfully")
@@ -95,6 +102,41 @@ class KafkaClient:
             logger.error(f"Failed to publish message to topic '{topic}': {e}")
             return False
     
+    async def publish_messages(
+        self,
+        topic: str,
+        messages: List[Dict[str, Any]],
+        key_field: Optional[str] = None,
+        message_type: str = "event"
+    ) -> bool:
+        """Publish a batch of messages to a Kafka topic with a single flush.
+        
+        ``send`` only enqueues into the producer's batch buffer, so the broker
+        round-trip is paid once for the whole batch by ``flush``.
+        """
+        if not self.producer:
+            logger.error("Kafka producer not initialized")
+            return False
+        
+        if not messages:
+            return True
+        
+        try:
+            for message in messages:
+                await self.producer.send(
+                    topic=topic,
+                    value=KafkaMessage(message, message_type).to_dict(),
+                    key=message.get(key_field) if key_field else None
+                )
+            await self.producer.flush()
+            
+            logger.info(f"{len(messages)} messages published to topic '{topic}'")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to publish batch to topic '{topic}': {e}")
+            return False
+    
     async def create_consumer(
         self, 
         topics: List[str], 
@@ -105,12 +147,14 @@ class KafkaClient:
         consumer_id = f"{group_id}_{uuid.uuid4().hex[:8]}"
         
         try:
+            from aiokafka import AIOKafkaConsumer
+            
             consumer = AIOKafkaConsumer(
                 *topics,
                 bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
                 group_id=group_id,
                 auto_offset_reset=settings.KAFKA_AUTO_OFFSET_RESET,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+                value_deserializer=orjson.loads,
                 key_deserializer=lambda k: k.decode('utf-8') if k else None,
                 enable_auto_commit=True,
                 auto_commit_interval_ms=1000
@@ -134,7 +178,7 @@ class KafkaClient:
     
     async def _consume_messages(
         self, 
-        consumer: AIOKafkaConsumer, 
+        consumer: "AIOKafkaConsumer", 
         handler: Callable[[Dict[str, Any]], None],
         consumer_id: str
     ):
@@ -167,19 +211,148 @@ class KafkaClient:
             await self.stop_consumer(consumer_id)
         logger.info("All consumers stopped")
 
+class KafkaBatcher:
+    """Queue fire-and-forget events and ship them with the producer batch API.
+
+    Callers only ``enqueue``; a background task drains the queue every
+    ``flush_interval`` seconds or as soon as ``max_batch_items`` are waiting,
+    and sends each drain as ``create_batch``/``send_batch`` so a burst costs
+    one request per partition instead of one future per message. Batches go
+    out on the topic's profile producer in ``backend.kafka_config``. Messages
+    are unkeyed and batches rotate over the partitions, so use this only for
+    topics that need no per-key ordering.
+    """
+
+    def __init__(
+        self,
+        manager: KafkaConfig,
+        topic: str,
+        message_type: str = "event",
+        max_batch_items: int = 500,
+        flush_interval: float = 0.02,
+        max_queue_size: int = 10000
+    ):
+        self.manager = manager
+        self.topic = topic
+        self.message_type = message_type
+        self.max_batch_items = max_batch_items
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._next_partition = 0
+
+    def enqueue(self, message: Dict[str, Any]) -> bool:
+        """Queue a message without waiting; drops it if the queue is full."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Batch queue for topic '{self.topic}' is full, dropping message")
+            return False
+
+    async def start(self):
+        """Start the background drain task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Kafka batcher started for topic '{self.topic}'")
+
+    async def stop(self):
+        """Stop the drain task and flush whatever is still queued."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        if pending:
+            await self._flush(pending)
+        logger.info(f"Kafka batcher stopped for topic '{self.topic}'")
+
+    async def _run(self):
+        """Collect up to ``max_batch_items`` within ``flush_interval`` and flush."""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(items) < self.max_batch_items:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(items)
+            except Exception as e:
+                logger.error(f"Failed to flush batch to topic '{self.topic}': {e}")
+
+    async def _flush(self, items: List[Dict[str, Any]]):
+        """Send ``items`` as one or more producer batches."""
+        producer = self.manager.producer_for(self.topic)
+        if not producer:
+            logger.error("Kafka producer not initialized")
+            return
+
+        # Batches bypass the producer serializers, so encode here
+        batch = producer.create_batch()
+        for item in items:
+            value = KafkaMessage(item, self.message_type).to_json()
+            if batch.append(key=None, value=value, timestamp=None) is None:
+                await self._send_batch(producer, batch)
+                batch = producer.create_batch()
+                batch.append(key=None, value=value, timestamp=None)
+        await self._send_batch(producer, batch)
+
+        logger.debug(f"{len(items)} messages batched to topic '{self.topic}'")
+
+    async def _send_batch(self, producer: "AIOKafkaProducer", batch):
+        """Close ``batch`` and send it to the next partition in round-robin order."""
+        if batch.record_count() == 0:
+            return
+        batch.close()
+        partitions = await producer.partitions_for(self.topic)
+        if not partitions:
+            raise RuntimeError(f"No partitions available for topic '{self.topic}'")
+        partitions = sorted(partitions)
+        partition = partitions[self._next_partition % len(partitions)]
+        self._next_partition += 1
+        delivery = await producer.send_batch(batch, self.topic, partition=partition)
+        delivery.add_done_callback(self._on_delivery)
+
+    def _on_delivery(self, delivery: asyncio.Future):
+        """Log broker errors for a sent batch; the drain task doesn't wait for acks."""
+        if not delivery.cancelled() and delivery.exception() is not None:
+            logger.error(f"Failed to deliver batch to topic '{self.topic}': {delivery.exception()}")
+
 # Global Kafka client instance
 kafka_client = KafkaClient()
 
+# Batched pipeline for high-volume media access events
+media_access_batcher = KafkaBatcher(
+    kafka_config,
+    topic=settings.KAFKA_TOPICS["MEDIA_ACCESS_LOGS"],
+    message_type="media_access"
+)
+
 # Convenience functions for common operations
 async def init_kafka():
     """Initialize Kafka connections."""
     global kafka_client
     await kafka_client.start_producer()
+    await media_access_batcher.start()
     logger.info("Kafka initialized successfully")
 
 async def close_kafka():
     """Close Kafka connections."""
     global kafka_client
+    await media_access_batcher.stop()
     await kafka_client.stop_all_consumers()
     await kafka_client.stop_producer()
     logger.info("Kafka connections closed")
@@ -229,6 +402,28 @@ async def publish_notification(notification_data: Dict[str, Any], user_id: str,
         message_type=f"{notification_type}_notification"
     )
 
+async def publish_geofence_event(event_data: Dict[str, Any]):
+    """Publish geofence event to Kafka."""
+    return await kafka_client.publish_message(
+        topic=settings.KAFKA_TOPICS["GEOFENCE_EVENTS"],
+        message=event_data,
+        key=event_data.get("user_id"),
+        message_type="geofence_event"
+    )
+
+async def publish_geofence_events_batch(events: List[Dict[str, Any]]):
+    """Publish several geofence events to Kafka with one flush."""
+    return await kafka_client.publish_messages(
+        topic=settings.KAFKA_TOPICS["GEOFENCE_EVENTS"],
+        messages=events,
+        key_field="user_id",
+        message_type="geofence_event"
+    )
+
+def publish_media_access_event(access_data: Dict[str, Any]) -> bool:
+    """Queue a media access event for the next batched send."""
+    return media_access_batcher.enqueue(access_data)
+
 async def publish_system_event(event_data: Dict[str, Any], event_id: str = None):
     """Publish system event to Kafka."""
     return await kafka_client.publish_message(
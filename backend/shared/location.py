@@ -1,10 +1,33 @@
+import json
 import math
 import aiohttp
-from typing import Dict, Optional
+import numpy as np
+import shapely
+from async_lru import alru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from shared import database
 from shared.config import get_settings
 
 settings = get_settings()
 
+# Mean radius of Earth in meters
+EARTH_RADIUS_METERS = 6371000
+
+# Reverse-geocoding results are cached per ~11 m cell (4 decimal places)
+GEOCODE_CACHE_PRECISION = 4
+GEOCODE_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+# Shared HTTP session so geocoder calls reuse pooled keep-alive connections
+_http_session: Optional[aiohttp.ClientSession] = None
+
+def _get_http_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(headers={
+            "User-Agent": "PanicAlertSystem/1.0 (emergency-app)"
+        })
+    return _http_session
+
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate the distance between two points on Earth using the Haversine formula.
     
@@ -38,6 +61,23 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     
     return distance
 
+def haversine_distances(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Vectorized ``calculate_distance``; arguments broadcast like NumPy arrays.
+    
+    Args:
+        lat1, lon1: Latitude(s) and longitude(s) of the first point(s) in decimal degrees
+        lat2, lon2: Latitude(s) and longitude(s) of the second point(s) in decimal degrees
+        
+    Returns:
+        Array of distances in meters
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    
+    return EARTH_RADIUS_METERS * 2 * np.arcsin(np.sqrt(a))
+
 def is_point_in_circle(point_lat: float, point_lon: float, 
                       center_lat: float, center_lon: float, 
                       radius_meters: float) -> bool:
@@ -83,6 +123,9 @@ def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
 async def get_location_info(latitude: float, longitude: float) -> Optional[Dict]:
     """Get location information using reverse geocoding.
     
+    Results are cached in process and in Redis per rounded coordinate, so
+    nearby lookups don't reach the geocoder again.
+    
     Args:
         latitude: Latitude in decimal degrees
         longitude: Longitude in decimal degrees
@@ -91,56 +134,74 @@ async def get_location_info(latitude: float, longitude: float) -> Optional[Dict]
         Dictionary with location information or None if failed
     """
     try:
-        # Use OpenStreetMap Nominatim for reverse geocoding (free service)
-        url = "https://nominatim.openstreetmap.org/reverse"
-        params = {
-            "lat": latitude,
-            "lon": longitude,
-            "format": "json",
-            "addressdetails": 1,
-            "zoom": 18
-        }
-        
-        headers = {
-            "User-Agent": "PanicAlertSystem/1.0 (emergency-app)"
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=headers, timeout=5) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Extract useful information
-                    address_components = data.get("address", {})
-                    
-                    location_info = {
-                        "address": data.get("display_name", ""),
-                        "house_number": address_components.get("house_number", ""),
-                        "road": address_components.get("road", ""),
-                        "neighbourhood": address_components.get("neighbourhood", ""),
-                        "suburb": address_components.get("suburb", ""),
-                        "city": address_components.get("city", ""),
-                        "county": address_components.get("county", ""),
-                        "state": address_components.get("state", ""),
-                        "country": address_components.get("country", ""),
-                        "postcode": address_components.get("postcode", ""),
-                        "place_id": data.get("place_id"),
-                        "osm_type": data.get("osm_type"),
-                        "osm_id": data.get("osm_id"),
-                        "lat": data.get("lat"),
-                        "lon": data.get("lon"),
-                        "importance": data.get("importance"),
-                        "place_rank": data.get("place_rank")
-                    }
-                    
-                    return location_info
-                    
+        return await _cached_location_info(
+            round(latitude, GEOCODE_CACHE_PRECISION),
+            round(longitude, GEOCODE_CACHE_PRECISION)
+        )
     except Exception as e:
         # Log the error but don't raise it - location info is not critical
         print(f"Failed to get location info for {latitude}, {longitude}: {str(e)}")
         
     return None
 
+@alru_cache(maxsize=10000)
+async def _cached_location_info(latitude: float, longitude: float) -> Dict:
+    """Reverse-geocode a rounded coordinate, backed by Redis.
+    
+    Failures raise so that neither cache layer stores them.
+    """
+    cache_key = f"geocode:{latitude}:{longitude}"
+    if database.redis_client is not None:
+        cached = await database.redis_client.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+    
+    location_info = await _reverse_geocode(latitude, longitude)
+    
+    if database.redis_client is not None:
+        await database.redis_client.setex(cache_key, GEOCODE_CACHE_TTL_SECONDS, json.dumps(location_info))
+    
+    return location_info
+
+async def _reverse_geocode(latitude: float, longitude: float) -> Dict:
+    """Query OpenStreetMap Nominatim for a coordinate."""
+    # Use OpenStreetMap Nominatim for reverse geocoding (free service)
+    url = "https://nominatim.openstreetmap.org/reverse"
+    params = {
+        "lat": latitude,
+        "lon": longitude,
+        "format": "json",
+        "addressdetails": 1,
+        "zoom": 18
+    }
+    
+    async with _get_http_session().get(url, params=params, timeout=5) as response:
+        response.raise_for_status()
+        data = await response.json()
+    
+    # Extract useful information
+    address_components = data.get("address", {})
+    
+    return {
+        "address": data.get("display_name", ""),
+        "house_number": address_components.get("house_number", ""),
+        "road": address_components.get("road", ""),
+        "neighbourhood": address_components.get("neighbourhood", ""),
+        "suburb": address_components.get("suburb", ""),
+        "city": address_components.get("city", ""),
+        "county": address_components.get("county", ""),
+        "state": address_components.get("state", ""),
+        "country": address_components.get("country", ""),
+        "postcode": address_components.get("postcode", ""),
+        "place_id": data.get("place_id"),
+        "osm_type": data.get("osm_type"),
+        "osm_id": data.get("osm_id"),
+        "lat": data.get("lat"),
+        "lon": data.get("lon"),
+        "importance": data.get("importance"),
+        "place_rank": data.get("place_rank")
+    }
+
 async def get_nearby_places(latitude: float, longitude: float, 
                            radius_meters: int = 1000, 
                            place_type: str = "emergency") -> Optional[List[Dict]]:
@@ -189,50 +250,49 @@ async def get_nearby_places(latitude: float, longitude: float,
         
         query = queries.get(place_type, queries["emergency"])
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(overpass_url, data=query, timeout=15) as response:
-                if response.status == 200:
-                    data = await response.json()
+        async with _get_http_session().post(overpass_url, data=query, timeout=15) as response:
+            if response.status == 200:
+                data = await response.json()
+                
+                places = []
+                for element in data.get("elements", []):
+                    tags = element.get("tags", {})
                     
-                    places = []
-                    for element in data.get("elements", []):
-                        tags = element.get("tags", {})
+                    # Get coordinates
+                    if element.get("type") == "node":
+                        place_lat = element.get("lat")
+                        place_lon = element.get("lon")
+                    elif element.get("type") == "way" and element.get("center"):
+                        place_lat = element["center"].get("lat")
+                        place_lon = element["center"].get("lon")
+                    else:
+                        continue
+                    
+                    if place_lat and place_lon:
+                        distance = calculate_distance(latitude, longitude, place_lat, place_lon)
                         
-                        # Get coordinates
-                        if element.get("type") == "node":
-                            place_lat = element.get("lat")
-                            place_lon = element.get("lon")
-                        elif element.get("type") == "way" and element.get("center"):
-                            place_lat = element["center"].get("lat")
-                            place_lon = element["center"].get("lon")
-                        else:
-                            continue
+                        place_info = {
+                            "name": tags.get("name", "Unknown"),
+                            "amenity": tags.get("amenity", ""),
+                            "address": tags.get("addr:full", ""),
+                            "phone": tags.get("phone", ""),
+                            "website": tags.get("website", ""),
+                            "opening_hours": tags.get("opening_hours", ""),
+                            "emergency": tags.get("emergency", ""),
+                            "latitude": place_lat,
+                            "longitude": place_lon,
+                            "distance_meters": round(distance, 2),
+                            "osm_id": element.get("id"),
+                            "osm_type": element.get("type")
+                        }
                         
-                        if place_lat and place_lon:
-                            distance = calculate_distance(latitude, longitude, place_lat, place_lon)
-                            
-                            place_info = {
-                                "name": tags.get("name", "Unknown"),
-                                "amenity": tags.get("amenity", ""),
-                                "address": tags.get("addr:full", ""),
-                                "phone": tags.get("phone", ""),
-                                "website": tags.get("website", ""),
-                                "opening_hours": tags.get("opening_hours", ""),
-                                "emergency": tags.get("emergency", ""),
-                                "latitude": place_lat,
-                                "longitude": place_lon,
-                                "distance_meters": round(distance, 2),
-                                "osm_id": element.get("id"),
-                                "osm_type": element.get("type")
-                            }
-                            
-                            places.append(place_info)
-                    
-                    # Sort by distance
-                    places.sort(key=lambda x: x["distance_meters"])
-                    
-                    return places[:20]  # Return top 20 closest places
-                    
+                        places.append(place_info)
+                
+                # Sort by distance
+                places.sort(key=lambda x: x["distance_meters"])
+                
+                return places[:20]  # Return top 20 closest places
+                
     except Exception as e:
         print(f"Failed to get nearby places for {latitude}, {longitude}: {str(e)}")
         
@@ -290,5 +350,60 @@ def get_coordinate_precision_meters(latitude: float) -> Dict[str, float]:
     
     return precisions
 
-# Import required modules
-from typing import List
\ No newline at end of file
+class GeofenceMatcher:
+    """Batch point-in-geofence matcher over a fixed set of geofences.
+    
+    Circles are tested with one vectorized Haversine pass; polygons and
+    rectangles are loaded into a Shapely STRtree and queried for all points
+    at once, so a batch of fixes costs two C-level calls instead of one
+    Python call per (point, geofence) pair.
+    
+    Geofences are duck-typed: they need ``id``, ``shape``, ``geom`` (WKB),
+    ``center_latitude``, ``center_longitude`` and ``radius``.
+    """
+    
+    def __init__(self, geofences: Iterable[Any]):
+        circles, shapes = [], []
+        for geofence in geofences:
+            shape = getattr(geofence.shape, "value", geofence.shape)
+            (circles if shape == "circle" else shapes).append(geofence)
+        
+        self._circle_ids = [g.id for g in circles]
+        self._center_lats = np.array([g.center_latitude for g in circles], dtype=float)
+        self._center_lons = np.array([g.center_longitude for g in circles], dtype=float)
+        self._radii = np.array([g.radius for g in circles], dtype=float)
+        
+        self._shape_ids = [g.id for g in shapes]
+        self._tree = shapely.STRtree(shapely.from_wkb([g.geom for g in shapes])) if shapes else None
+    
+    def match(self, latitudes, longitudes) -> List[Tuple[int, Any]]:
+        """Match points against the geofences.
+        
+        Args:
+            latitudes: Sequence of latitudes in decimal degrees
+            longitudes: Sequence of longitudes in decimal degrees
+            
+        Returns:
+            List of ``(point_index, geofence_id)`` pairs for every containment
+        """
+        lats = np.asarray(latitudes, dtype=float)
+        lons = np.asarray(longitudes, dtype=float)
+        matches = []
+        
+        if self._circle_ids:
+            distances = haversine_distances(
+                lats[:, None], lons[:, None],
+                self._center_lats[None, :], self._center_lons[None, :]
+            )
+            point_idx, circle_idx = np.nonzero(distances <= self._radii)
+            matches.extend(
+                (int(p), self._circle_ids[c]) for p, c in zip(point_idx, circle_idx)
+            )
+        
+        if self._tree is not None:
+            point_idx, shape_idx = self._tree.query(shapely.points(lons, lats), predicate="within")
+            matches.extend(
+                (int(p), self._shape_ids[t]) for p, t in zip(point_idx, shape_idx)
+            )
+        
+        return matches
\ No newline at end of file
@@ -24,6 +24,7 @@ docker exec $KAFKA_CONTAINER kafka-topics --create --topic geofence-events --boo
 # Media and multimedia topics
 docker exec $KAFKA_CONTAINER kafka-topics --create --topic media-uploads --bootstrap-server $KAFKA_BROKER --partitions 2 --replication-factor 1
 docker exec $KAFKA_CONTAINER kafka-topics --create --topic media-processing --bootstrap-server $KAFKA_BROKER --partitions 2 --replication-factor 1
+docker exec $KAFKA_CONTAINER kafka-topics --create --topic media-access-logs --bootstrap-server $KAFKA_BROKER --partitions 3 --replication-factor 1
 
 # Notification topics
 docker exec $KAFKA_CONTAINER kafka-topics --create --topic push-notifications --bootstrap-server $KAFKA_BROKER --partitions 3 --replication-factor 1